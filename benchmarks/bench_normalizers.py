@@ -0,0 +1,156 @@
+"""Micro-benchmark for device normalization: per-row cost and peak memory.
+
+Compares the original hand-written per-row reshaping loop and the per-field
+extractor table that replaced it with the compiled normalizer in
+``nautobot_mcp_server.clients.normalizers``. Raw rows are decoded from JSON, as
+they would be from a Nautobot response, so each row owns its own strings.
+
+``retained_bytes_per_row`` is what the normalized records keep alive once the
+raw response has been released, which is what matters for cached results and
+the inventory snapshot.
+
+Usage::
+
+    PYTHONPATH=src python benchmarks/bench_normalizers.py --rows 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from nautobot_mcp_server.clients.normalizers import normalizer
+
+STATUSES = ["Active", "Planned", "Staged", "Offline"]
+ROLES = ["access", "distribution", "core", "edge", "firewall"]
+PLATFORMS = ["ios", "nxos", "eos", "junos"]
+MODELS = [("C9300-48P", "Cisco"), ("DCS-7050", "Arista"), ("MX204", "Juniper")]
+
+
+def raw_devices(rows: int) -> str:
+    devices = []
+    for i in range(rows):
+        model, manufacturer = MODELS[i % len(MODELS)]
+        devices.append(
+            {
+                "name": f"device-{i:06d}",
+                "status": {"name": STATUSES[i % len(STATUSES)]},
+                "role": {"name": ROLES[i % len(ROLES)]},
+                "device_type": {
+                    "model": model,
+                    "manufacturer": {"name": manufacturer},
+                },
+                "platform": {"name": PLATFORMS[i % len(PLATFORMS)]} if i % 7 else None,
+                "primary_ip4": (
+                    {"address": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}/24"}
+                    if i % 5
+                    else None
+                ),
+                "location": {"name": f"SITE{i % 200:03d}"},
+            }
+        )
+    return json.dumps(devices)
+
+
+def original(devices: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """The per-row loop previously repeated in each device query method."""
+    out = []
+    for device in devices:
+        device_data = {
+            "name": device["name"],
+            "status": (device["status"] or {}).get("name"),
+            "role": (device["role"] or {}).get("name"),
+            "device_type": {
+                "model": (device["device_type"] or {}).get("model"),
+                "manufacturer": (device["device_type"] or {})
+                .get("manufacturer", {})
+                .get("name"),
+            },
+            "platform": (device["platform"] or {}).get("name"),
+            "primary_ip4": (device["primary_ip4"] or {}).get("address"),
+            "location": (device["location"] or {}).get("name"),
+        }
+        out.append(device_data)
+    return out
+
+
+def _name(value: dict[str, Any] | None) -> Any:
+    return (value or {}).get("name")
+
+
+FIELD_TABLE: dict[str, Callable[[dict[str, Any]], Any]] = {
+    "name": lambda d: d["name"],
+    "status": lambda d: _name(d["status"]),
+    "role": lambda d: _name(d["role"]),
+    "device_type": lambda d: {
+        "model": (d["device_type"] or {}).get("model"),
+        "manufacturer": (d["device_type"] or {}).get("manufacturer", {}).get("name"),
+    },
+    "platform": lambda d: _name(d["platform"]),
+    "primary_ip4": lambda d: (d["primary_ip4"] or {}).get("address"),
+    "location": lambda d: _name(d["location"]),
+}
+
+
+def field_table(devices: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """One extractor call per field, as used for field projection."""
+    return [{name: FIELD_TABLE[name](d) for name in FIELD_TABLE} for d in devices]
+
+
+def measure(
+    normalize: Callable[[list[dict[str, Any]]], list[dict[str, Any]]],
+    payload: str,
+    repeat: int,
+) -> dict[str, float]:
+    devices = json.loads(payload)
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        normalize(devices)
+        best = min(best, time.perf_counter() - started)
+
+    rows = len(devices)
+    del devices
+    gc.collect()
+    tracemalloc.start()
+    devices = json.loads(payload)
+    result = normalize(devices)
+    del devices
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {
+        "us_per_row": round(best / rows * 1e6, 3),
+        "peak_mib": round(peak / 2**20, 2),
+        "retained_bytes_per_row": round(retained / rows, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = raw_devices(args.rows)
+    sample = json.loads(payload)[:100]
+    compiled = normalizer("devices").many
+    assert original(sample) == field_table(sample) == compiled(sample)
+
+    results = {
+        "original": measure(original, payload, args.repeat),
+        "field_table": measure(field_table, payload, args.repeat),
+        "compiled": measure(compiled, payload, args.repeat),
+    }
+    print(json.dumps({"rows": args.rows, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""Local stand-in for Nautobot's GraphQL endpoint, serving a synthetic inventory.
+
+Answers every document the server sends: the bundled ``.graphql`` files,
+field-projected variants and the aliased multi-location batches, with
+``limit``/``offset`` paging and the location, role, ``last_updated__gte`` and
+``time__gte`` filters. Each request is delayed by ``latency`` plus a uniform
+``jitter`` to model a remote Nautobot.
+
+Nested objects (status, role, device type, location, ...) are shared between
+records, so 500k devices fit in a few hundred MiB.
+
+``GET /stats`` returns upstream call counts by operation name and
+``POST /stats/reset`` clears them.
+
+Usage::
+
+    PYTHONPATH=src python benchmarks/fake_nautobot.py --devices 100000 \\
+        --prefixes 100000 --latency 0.02 --jitter 0.01 --port 8081
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import re
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from functools import lru_cache
+from ipaddress import IPv4Address
+from typing import Any
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from nautobot_mcp_server import serialization
+
+STATUSES = ["Active", "Planned", "Staged", "Offline"]
+ROLES = ["WAN", "Core", "Spine", "Leaf", "Branch Access", "Campus Access"]
+PLATFORMS = ["ios", "nxos", "eos", "junos"]
+MODELS = [("C9300-48P", "Cisco"), ("DCS-7050", "Arista"), ("MX204", "Juniper")]
+PREFIX_ROLES = ["loopback", "p2p", "management", "server", "user"]
+LAST_UPDATED = "2024-01-01T00:00:00Z"
+
+Record = dict[str, Any]
+
+
+def location_names(count: int) -> list[str]:
+    return [f"SITE{i:04d}" for i in range(count)]
+
+
+class Inventory:
+    """Synthetic devices and prefixes spread evenly over ``locations``."""
+
+    def __init__(self, devices: int, prefixes: int, locations: int, seed: int = 0):
+        rng = random.Random(seed)
+        self.locations = location_names(locations)
+        named = {name: {"name": name} for name in self.locations}
+        statuses = [{"name": name} for name in STATUSES]
+        roles = [{"name": name} for name in ROLES]
+        platforms = [{"name": name} for name in PLATFORMS]
+        models = [
+            {"model": model, "manufacturer": {"name": manufacturer}}
+            for model, manufacturer in MODELS
+        ]
+        prefix_roles = [{"name": name} for name in PREFIX_ROLES]
+
+        self.devices: list[Record] = []
+        self.devices_by_location: dict[str, list[Record]] = defaultdict(list)
+        self.devices_by_role: dict[tuple[str, str], list[Record]] = defaultdict(list)
+        for i in range(devices):
+            location = self.locations[i % locations]
+            role = roles[rng.randrange(len(roles))]
+            device = {
+                "id": f"00000000-0000-4000-8000-{i:012d}",
+                "name": f"{location.lower()}-{role['name'].lower().replace(' ', '-')}-{i}",
+                "status": statuses[0] if i % 10 else statuses[i % len(statuses)],
+                "role": role,
+                "device_type": models[i % len(models)],
+                "platform": platforms[i % len(platforms)] if i % 7 else None,
+                "primary_ip4": {"address": f"{IPv4Address(0x0A000000 + i)}/32"},
+                "location": named[location],
+                "last_updated": LAST_UPDATED,
+            }
+            self.devices.append(device)
+            self.devices_by_location[location].append(device)
+            self.devices_by_role[(location, role["name"])].append(device)
+
+        # A /16 container every 256 prefixes, /24s inside it
+        self.prefixes: list[Record] = []
+        self.prefixes_by_location: dict[str, list[Record]] = defaultdict(list)
+        for i in range(prefixes):
+            location = self.locations[(i // 256) % locations]
+            if i % 256 == 0:
+                network = f"{IPv4Address(0x0A000000 + (i << 8))}/16"
+            else:
+                network = f"{IPv4Address(0x0A000000 + (i << 8))}/24"
+            prefix = {
+                "id": f"00000000-0000-4000-9000-{i:012d}",
+                "prefix": network,
+                "status": statuses[0],
+                "role": prefix_roles[i % len(prefix_roles)],
+                "description": f"synthetic {i}" if i % 3 else None,
+                "locations": [named[location]],
+                "last_updated": LAST_UPDATED,
+            }
+            self.prefixes.append(prefix)
+            self.prefixes_by_location[location].append(prefix)
+
+        self.names = {
+            "locations": [named[name] for name in self.locations],
+            "roles": roles,
+        }
+
+    def select(self, field: str, args: dict[str, Any]) -> list[Record]:
+        """Objects of root ``field`` matching the filter arguments."""
+        if field == "devices":
+            locations = args.get("location")
+            roles = args.get("role")
+            if locations and roles:
+                return [
+                    device
+                    for location in locations
+                    for role in roles
+                    for device in self.devices_by_role.get((location, role), ())
+                ]
+            if locations:
+                return _concat(self.devices_by_location.get(n, ()) for n in locations)
+            if args.get("last_updated__gte"):
+                since = min(args["last_updated__gte"])
+                return [d for d in self.devices if d["last_updated"] >= since]
+            return self.devices
+        if field == "prefixes":
+            locations = args.get("locations")
+            if locations:
+                return _concat(self.prefixes_by_location.get(n, ()) for n in locations)
+            if args.get("last_updated__gte"):
+                since = min(args["last_updated__gte"])
+                return [p for p in self.prefixes if p["last_updated"] >= since]
+            return self.prefixes
+        if field in self.names:
+            return self.names[field]
+        if field == "object_changes":
+            return []
+        raise ValueError(f"Unsupported field {field!r}")
+
+
+def _concat(groups: Iterable[Iterable[Record]]) -> list[Record]:
+    return [record for group in groups for record in group]
+
+
+# Minimal GraphQL parsing: enough for the documents this server generates
+
+_TOKEN = re.compile(
+    r"\s*(?:(?P<punct>[{}()\[\]:!$,])|(?P<name>[_A-Za-z][_0-9A-Za-z]*)"
+    r'|(?P<string>"(?:[^"\\]|\\.)*")|(?P<number>-?\d+(?:\.\d+)?))'
+)
+
+Selection = tuple[tuple[str, str, dict[str, Any], "Selection | None"], ...]
+
+
+def _tokens(document: str) -> list[str]:
+    tokens, pos = [], 0
+    document = document.rstrip()
+    while pos < len(document):
+        match = _TOKEN.match(document, pos)
+        if match is None:
+            raise ValueError(f"Cannot parse GraphQL near {document[pos:pos + 20]!r}")
+        if match.group("punct") != ",":
+            tokens.append(match.group(match.lastgroup or ""))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, document: str):
+        self.tokens = _tokens(document)
+        self.pos = 0
+
+    def peek(self) -> str | None:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self, expected: str | None = None) -> str:
+        token = self.tokens[self.pos]
+        if expected is not None and token != expected:
+            raise ValueError(f"Expected {expected!r}, got {token!r}")
+        self.pos += 1
+        return token
+
+    def document(self) -> Selection:
+        if self.peek() == "query":
+            self.take()
+            if self.peek() not in ("(", "{"):
+                self.take()
+            if self.peek() == "(":
+                # Variable definitions carry nothing the fake needs
+                depth = 0
+                while True:
+                    token = self.take()
+                    depth += {"(": 1, ")": -1}.get(token, 0)
+                    if depth == 0:
+                        break
+        return self.selection()
+
+    def selection(self) -> Selection:
+        self.take("{")
+        fields = []
+        while self.peek() != "}":
+            alias = name = self.take()
+            if self.peek() == ":":
+                self.take()
+                name = self.take()
+            args: dict[str, Any] = {}
+            if self.peek() == "(":
+                self.take()
+                while self.peek() != ")":
+                    key = self.take()
+                    self.take(":")
+                    args[key] = self.value()
+                self.take(")")
+            sub = self.selection() if self.peek() == "{" else None
+            fields.append((alias, name, args, sub))
+        self.take("}")
+        return tuple(fields)
+
+    def value(self) -> Any:
+        token = self.take()
+        if token == "$":
+            return ("$", self.take())
+        if token == "[":
+            items = []
+            while self.peek() != "]":
+                items.append(self.value())
+            self.take("]")
+            return items
+        if token.startswith('"'):
+            return serialization.loads(token)
+        if token[0].isdigit() or token[0] == "-":
+            return float(token) if "." in token else int(token)
+        return {"true": True, "false": False, "null": None}.get(token, token)
+
+
+@lru_cache(maxsize=256)
+def parse(document: str) -> tuple[str, Selection]:
+    """``(operation name, root selection)`` for a query document."""
+    match = re.match(r"\s*query\s+([_A-Za-z][_0-9A-Za-z]*)", document)
+    return (match.group(1) if match else "anonymous"), _Parser(document).document()
+
+
+def _resolve(value: Any, variables: dict[str, Any]) -> Any:
+    if isinstance(value, tuple):
+        return variables.get(value[1])
+    if isinstance(value, list):
+        items = []
+        for item in value:
+            resolved = _resolve(item, variables)
+            # [$roles] with a list variable filters on its items
+            items.extend(resolved if isinstance(resolved, list) else [resolved])
+        return [item for item in items if item is not None]
+    return value
+
+
+def _project(value: Any, selection: Selection | None) -> Any:
+    if selection is None or value is None:
+        return value
+    if isinstance(value, list):
+        return [_project(item, selection) for item in value]
+    return {alias: _project(value.get(name), sub) for alias, name, _, sub in selection}
+
+
+def execute(
+    inventory: Inventory, document: str, variables: dict[str, Any]
+) -> dict[str, Any]:
+    _, selection = parse(document)
+    data = {}
+    for alias, field, raw_args, sub in selection:
+        args = {key: _resolve(value, variables) for key, value in raw_args.items()}
+        rows = inventory.select(field, args)
+        offset = args.get("offset") or 0
+        limit = args.get("limit")
+        rows = rows[offset : offset + limit if limit else None]
+        data[alias] = _project(rows, sub)
+    return {"data": data}
+
+
+def create_app(
+    inventory: Inventory, latency: float = 0.0, jitter: float = 0.0
+) -> Starlette:
+    calls: Counter[str] = Counter()
+
+    async def graphql(request: Request) -> Response:
+        body = serialization.loads(await request.body())
+        document = body["query"]
+        operation, _ = parse(document)
+        calls[operation] += 1
+        delay = latency + random.uniform(0, jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        try:
+            result = execute(inventory, document, body.get("variables") or {})
+        except ValueError as e:
+            result = {"errors": [{"message": str(e)}]}
+        return Response(serialization.dumps(result), media_type="application/json")
+
+    async def stats(request: Request) -> Response:
+        return JSONResponse({"calls": dict(calls), "total": sum(calls.values())})
+
+    async def reset(request: Request) -> Response:
+        calls.clear()
+        return JSONResponse({"calls": {}, "total": 0})
+
+    return Starlette(
+        routes=[
+            Route("/graphql/", graphql, methods=["POST"]),
+            Route("/stats", stats, methods=["GET"]),
+            Route("/stats/reset", reset, methods=["POST"]),
+        ]
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=10_000)
+    parser.add_argument("--prefixes", type=int, default=10_000)
+    parser.add_argument("--locations", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.01, help="seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    args = parser.parse_args()
+
+    inventory = Inventory(args.devices, args.prefixes, args.locations, args.seed)
+    app = create_app(inventory, args.latency, args.jitter)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,482 @@
+"""Load harness: drives the server against the fake Nautobot and reports JSON.
+
+Starts ``fake_nautobot.py`` and the MCP server as subprocesses, then for each
+transport (``rest`` = ``POST /tools/invoke``, ``mcp`` = streamable HTTP),
+scenario and concurrency level runs ``--requests`` tool calls from that many
+concurrent workers. Each result records p50/p95/p99 latency, requests/s,
+errors, the server's resident memory high-water mark (``VmHWM``, Linux only)
+and the Nautobot calls it made by operation name. With ``--workers`` the
+server runs that many worker processes and memory is reported per worker,
+both at startup and after each level. ``--warm-start`` persists the result
+cache to disk (``CACHE_DIR``), restarts the server after the run and repeats
+it, reporting the time to ready, the cache warm-up and the hit rates.
+
+Scenarios rotate through the locations, so the first pass over them misses
+the result cache; run with ``--server-env CACHE_ENABLED=false`` to measure
+uncached throughput. Extra ``--server-env`` settings are applied to the
+server, which makes A/B runs of a setting straightforward.
+
+Usage::
+
+    PYTHONPATH=src python benchmarks/load.py --devices 100000 --prefixes 100000 \\
+        --concurrency 1,16,64 --requests 500 --output bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from fake_nautobot import location_names
+
+HERE = Path(__file__).resolve().parent
+
+Args = Callable[[int, list[str]], dict[str, Any]]
+
+SCENARIOS: dict[str, tuple[str, Args]] = {
+    "devices": (
+        "get_devices_by_location",
+        lambda i, locs: {"location_name": locs[i % len(locs)]},
+    ),
+    "devices_by_role": (
+        "get_devices_by_location_and_role",
+        lambda i, locs: {"location_name": locs[i % len(locs)], "role_name": "WAN"},
+    ),
+    "devices_multi": (
+        "get_devices_by_locations",
+        lambda i, locs: {
+            "location_names": [locs[(i + k) % len(locs)] for k in range(3)]
+        },
+    ),
+    "prefixes": (
+        "get_prefixes_by_location_enhanced",
+        lambda i, locs: {"location_name": locs[i % len(locs)]},
+    ),
+    "lookup_ip": (
+        "lookup_ip_addresses",
+        lambda i, locs: {"ip_addresses": [f"10.{i % 200}.{i % 250}.7"]},
+    ),
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def _wait_ready(url: str, timeout: float = 600.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready in {timeout:.0f}s")
+
+
+@contextmanager
+def _process(
+    argv: list[str], ready_url: str, env: dict[str, str]
+) -> Iterator[subprocess.Popen[bytes]]:
+    proc = subprocess.Popen(argv, env=env, stdout=subprocess.DEVNULL)
+    try:
+        _wait_ready(ready_url)
+        yield proc
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def _memory_mib(pid: int) -> dict[str, float | None]:
+    """Resident memory and its high-water mark from ``/proc`` (Linux only)."""
+    values: dict[str, float | None] = {"rss_mib": None, "hwm_mib": None}
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as status:
+            for line in status:
+                key, _, value = line.partition(":")
+                if key in ("VmRSS", "VmHWM"):
+                    name = "rss_mib" if key == "VmRSS" else "hwm_mib"
+                    values[name] = round(int(value.split()[0]) / 1024, 1)
+    except OSError:
+        pass
+    return values
+
+
+def _children(pid: int) -> list[int]:
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children", encoding="ascii") as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def _server_memory(pid: int) -> dict[str, Any]:
+    """Memory of the server process plus, in multi-worker mode, each worker."""
+    memory: dict[str, Any] = _memory_mib(pid)
+    # uvicorn's supervisor starts the workers (and a resource tracker)
+    workers = [
+        _memory_mib(child)
+        for child in _children(pid)
+        if "multiprocessing.resource_tracker" not in _cmdline(child)
+    ]
+    if workers:
+        memory["workers"] = workers
+        memory["total_rss_mib"] = round(
+            sum(m["rss_mib"] or 0 for m in [memory, *workers]), 1
+        )
+    return memory
+
+
+def _cmdline(pid: int) -> str:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read().replace(b"\0", b" ").decode(errors="replace")
+    except OSError:
+        return ""
+
+
+CACHE_COUNTERS = (
+    "cache_hits_total",
+    "cache_misses_total",
+    "cache_shared_hits_total",
+    "cache_warm_entries",
+    "cache_warm_seconds",
+)
+
+
+async def _cache_counters(client: httpx.AsyncClient) -> dict[str, float]:
+    """Result cache counters scraped from the server's ``/metrics``."""
+    values = dict.fromkeys(CACHE_COUNTERS, 0.0)
+    try:
+        text = (await client.get("/metrics")).text
+    except httpx.HTTPError:
+        return values
+    for line in text.splitlines():
+        name, _, value = line.partition(" ")
+        name = name.removeprefix("nautobot_mcp_")
+        if name in values:
+            values[name] = float(value)
+    return values
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class RestCaller:
+    def __init__(self, base_url: str, headers: dict[str, str]):
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=120.0,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=None),
+        )
+
+    async def __call__(self, tool: str, args: dict[str, Any]) -> bool:
+        response = await self.client.post(
+            "/tools/invoke", json={"tool_name": tool, "args": args}
+        )
+        if response.status_code != 200:
+            return False
+        result = response.json().get("result")
+        return not (isinstance(result, dict) and result.get("success") is False)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+class McpCaller:
+    def __init__(self, url: str, headers: dict[str, str]):
+        from fastmcp import Client
+        from fastmcp.client.transports import StreamableHttpTransport
+
+        self.client = Client(StreamableHttpTransport(url, headers=headers))
+        self.opened = False
+
+    async def __call__(self, tool: str, args: dict[str, Any]) -> bool:
+        if not self.opened:
+            await self.client.__aenter__()
+            self.opened = True
+        result = await self.client.call_tool(tool, args, raise_on_error=False)
+        data = result.structured_content
+        return not result.is_error and not (
+            isinstance(data, dict) and data.get("success") is False
+        )
+
+    async def aclose(self) -> None:
+        if self.opened:
+            await self.client.__aexit__(None, None, None)
+
+
+async def run_level(
+    make_caller: Callable[[], Any],
+    tool: str,
+    args: Args,
+    locations: list[str],
+    concurrency: int,
+    requests: int,
+) -> dict[str, Any]:
+    """Run ``requests`` calls from ``concurrency`` workers, one caller each."""
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        caller = make_caller()
+        try:
+            for i in counter:
+                started = time.perf_counter()
+                try:
+                    ok = await caller(tool, args(i, locations))
+                except Exception:
+                    ok = False
+                latencies.append(time.perf_counter() - started)
+                errors += not ok
+        finally:
+            await caller.aclose()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    ms = [latency * 1000 for latency in latencies]
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(_percentile(ms, 50), 2),
+            "p95": round(_percentile(ms, 95), 2),
+            "p99": round(_percentile(ms, 99), 2),
+            "mean": round(statistics.fmean(ms), 2) if ms else 0.0,
+            "max": round(max(ms), 2) if ms else 0.0,
+        },
+    }
+
+
+async def run(
+    args: argparse.Namespace,
+    server_url: str,
+    fake_url: str,
+    server_pid: int,
+    phase: str = "cold",
+) -> list[dict[str, Any]]:
+    locations = location_names(args.locations)
+    headers = {"X-API-Key": args.api_key} if args.api_key else {}
+    results = []
+    async with (
+        httpx.AsyncClient(base_url=fake_url) as fake,
+        httpx.AsyncClient(base_url=server_url, headers=headers) as scraper,
+    ):
+        for transport in args.transports:
+            for scenario in args.scenarios:
+                tool, tool_args = SCENARIOS[scenario]
+                for concurrency in args.concurrency:
+                    if transport == "rest":
+
+                        def make_caller() -> Any:
+                            return RestCaller(server_url, headers)
+
+                    else:
+
+                        def make_caller() -> Any:
+                            return McpCaller(f"{server_url}/mcp", headers)
+
+                    await fake.post("/stats/reset")
+                    before = await _cache_counters(scraper)
+                    level = await run_level(
+                        make_caller,
+                        tool,
+                        tool_args,
+                        locations,
+                        concurrency,
+                        args.requests,
+                    )
+                    upstream = (await fake.get("/stats")).json()
+                    after = await _cache_counters(scraper)
+                    hits = after["cache_hits_total"] - before["cache_hits_total"]
+                    misses = after["cache_misses_total"] - before["cache_misses_total"]
+                    result = {
+                        "phase": phase,
+                        "transport": transport,
+                        "scenario": scenario,
+                        "tool": tool,
+                        "concurrency": concurrency,
+                        **level,
+                        "upstream_calls": upstream["total"],
+                        "upstream_by_operation": upstream["calls"],
+                        "cache_hit_rate": (
+                            round(hits / (hits + misses), 3) if hits + misses else None
+                        ),
+                        "cache_shared_hits": after["cache_shared_hits_total"]
+                        - before["cache_shared_hits_total"],
+                        "server_memory": _server_memory(server_pid),
+                    }
+                    results.append(result)
+                    print(
+                        f"{phase:4} {transport:4} {scenario:16} c={concurrency:<4} "
+                        f"rps={result['rps']:<8} p50={level['latency_ms']['p50']:<8} "
+                        f"p99={level['latency_ms']['p99']:<8} "
+                        f"errors={level['errors']} upstream={upstream['total']} "
+                        f"hit_rate={result['cache_hit_rate']}",
+                        file=sys.stderr,
+                    )
+    return results
+
+
+async def _scrape(server_url: str, api_key: str | None) -> dict[str, float]:
+    headers = {"X-API-Key": api_key} if api_key else {}
+    async with httpx.AsyncClient(base_url=server_url, headers=headers) as client:
+        return await _cache_counters(client)
+
+
+def _csv(cast: Callable[[str], Any]) -> Callable[[str], list[Any]]:
+    return lambda value: [cast(item) for item in value.split(",") if item]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=10_000)
+    parser.add_argument("--prefixes", type=int, default=10_000)
+    parser.add_argument("--locations", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.01, help="seconds")
+    parser.add_argument("--concurrency", type=_csv(int), default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="per level")
+    parser.add_argument(
+        "--transports", type=_csv(str), default=["rest", "mcp"], help="rest,mcp"
+    )
+    parser.add_argument(
+        "--scenarios",
+        type=_csv(str),
+        default=["devices", "prefixes"],
+        help=",".join(SCENARIOS),
+    )
+    parser.add_argument(
+        "--server-env",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="extra server setting, may be repeated",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="server worker processes (WORKERS)"
+    )
+    parser.add_argument(
+        "--warm-start",
+        action="store_true",
+        help="restart the server with its on-disk cache and run again",
+    )
+    parser.add_argument("--api-key", help="X-API-Key to send, if auth is enabled")
+    parser.add_argument("--output", help="write JSON results here (default stdout)")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - SCENARIOS.keys()
+    if unknown:
+        parser.error(f"unknown scenarios {sorted(unknown)}")
+
+    fake_port, server_port = _free_port(), _free_port()
+    fake_url = f"http://127.0.0.1:{fake_port}"
+    server_url = f"http://127.0.0.1:{server_port}"
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(HERE.parent / "src")])}
+    server_env = {
+        **env,
+        "HOST": "127.0.0.1",
+        "PORT": str(server_port),
+        "NAUTOBOT_URL": fake_url,
+        "LOG_LEVEL": "warning",
+        "WORKERS": str(args.workers),
+        **dict(item.split("=", 1) for item in args.server_env),
+    }
+    fake_argv = [
+        sys.executable,
+        str(HERE / "fake_nautobot.py"),
+        f"--devices={args.devices}",
+        f"--prefixes={args.prefixes}",
+        f"--locations={args.locations}",
+        f"--latency={args.latency}",
+        f"--jitter={args.jitter}",
+        f"--port={fake_port}",
+    ]
+    server_argv = [sys.executable, "-m", "nautobot_mcp_server.server"]
+    cache_dir = None
+    if args.warm_start and "CACHE_DIR" not in server_env:
+        cache_dir = tempfile.TemporaryDirectory(prefix="nautobot-mcp-bench-")
+        server_env["CACHE_DIR"] = cache_dir.name
+
+    warm_start: dict[str, Any] | None = None
+    with _process(fake_argv, f"{fake_url}/stats", env):
+        with _process(server_argv, f"{server_url}/healthz", server_env) as server:
+            if args.workers > 1:
+                # Every worker must be up before startup memory means anything
+                time.sleep(2)
+            startup_memory = _server_memory(server.pid)
+            results = asyncio.run(run(args, server_url, fake_url, server.pid))
+        if args.warm_start:
+            started = time.perf_counter()
+            with _process(server_argv, f"{server_url}/healthz", server_env) as server:
+                ready_s = time.perf_counter() - started
+                results += asyncio.run(
+                    run(args, server_url, fake_url, server.pid, phase="warm")
+                )
+                counters = asyncio.run(_scrape(server_url, args.api_key))
+            warm_start = {
+                "ready_s": round(ready_s, 3),
+                "warm_entries": counters["cache_warm_entries"],
+                "warm_seconds": counters["cache_warm_seconds"],
+            }
+    if cache_dir is not None:
+        cache_dir.cleanup()
+
+    report = {
+        "benchmark": "load",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "config": {
+            "devices": args.devices,
+            "prefixes": args.prefixes,
+            "locations": args.locations,
+            "latency_s": args.latency,
+            "jitter_s": args.jitter,
+            "requests_per_level": args.requests,
+            "server_env": args.server_env,
+            "workers": args.workers,
+        },
+        "startup_memory": startup_memory,
+        "warm_start": warm_start,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""Local resolution of location and role names, aliases and near misses.
+
+Names are matched case-insensitively ignoring spaces and punctuation, so
+"new york data-center" resolves like "New York Data Center". Canonical names
+come from Nautobot's location and role lists; aliases come from the built-in
+tables below plus ``location_aliases``/``role_aliases`` in settings. Unknown
+names are rejected with ranked suggestions instead of querying Nautobot.
+"""
+
+from __future__ import annotations
+
+import difflib
+import time
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import structlog
+
+from .clients import nautobot_graphql as nb
+from .settings import get_settings
+
+logger = structlog.get_logger(__name__)
+
+# Alias -> Nautobot name for the lab inventory. Organizations add their own
+# (or override these) with ``location_aliases``/``role_aliases``.
+DEFAULT_LOCATION_ALIASES: dict[str, str] = {
+    "New York Data Center": "NYDC",
+    "London Data Center": "LODC",
+    "Dallas Campus": "DACN",
+    "London Campus": "LOCN",
+    "Korea Campus": "KOCN",
+    "Brazil Campus": "BRCN",
+    "Mexico Campus": "MXCN",
+    "US Branch Network Branch 1": "USBN1",
+    "US Branch Network Branch 2": "USBN2",
+    "Mexico Branch Network Branch 1": "MXBN1",
+    "Mexico Branch Network Branch 2": "MXBN2",
+    "UK Branch Network Branch 1": "UKBN1",
+    "UK Branch Network Branch 2": "UKBN2",
+    "Brazil Branch Network Branch 1": "BRBN1",
+    "Brazil Branch Network Branch 2": "BRBN2",
+}
+
+DEFAULT_ROLE_ALIASES: dict[str, str] = {
+    "WAN Router": "WAN",
+    "WAN Routers": "WAN",
+    "Core Router": "Core",
+    "Core Routers": "Core",
+    "Spine Switch": "Spine",
+    "Spine Switches": "Spine",
+    "Leaf Switch": "Leaf",
+    "Leaf Switches": "Leaf",
+    "Branch Access Switch": "Branch Access",
+    "Branch Access Switches": "Branch Access",
+    "Campus Access Switch": "Campus Access",
+    "Campus Access Switches": "Campus Access",
+}
+
+# Kind -> (query, field) listing the canonical names in Nautobot
+_NAME_QUERIES = {
+    "location": (nb.LOCATION_NAMES_QUERY, "locations"),
+    "role": (nb.ROLE_NAMES_QUERY, "roles"),
+}
+
+# A miss reloads the name list at most this often, so objects created in
+# Nautobot since the last load are found without waiting for the TTL
+_MISS_RELOAD_INTERVAL = 30.0
+
+
+class UnknownNameError(ValueError):
+    """Raised for names that match no known object or alias."""
+
+    def __init__(self, kind: str, suggestions: dict[str, list[str]]):
+        self.kind = kind
+        self.suggestions = suggestions
+        parts = []
+        for name, matches in suggestions.items():
+            hint = f"; did you mean {', '.join(map(repr, matches))}?" if matches else ""
+            parts.append(f"Unknown {kind} '{name}'{hint}")
+        super().__init__(". ".join(parts))
+
+
+def _key(name: str) -> str:
+    return "".join(ch for ch in name.casefold() if ch.isalnum())
+
+
+class NameIndex:
+    """Canonical names and aliases for one kind, keyed by normalized spelling.
+
+    ``names`` is the authoritative list from Nautobot; when it is ``None`` (not
+    loaded) only aliases are applied and other names pass through unchanged.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        names: Iterable[str] | None,
+        aliases: Mapping[str, str],
+        loaded_at: float | None = None,
+    ):
+        self.kind = kind
+        self.known = names is not None
+        self.loaded_at = time.monotonic() if loaded_at is None else loaded_at
+        self._names: dict[str, str] = {_key(name): name for name in names or ()}
+        canonical = dict(self._names)
+        for alias, target in aliases.items():
+            if not self.known or _key(target) in canonical:
+                self._names.setdefault(_key(alias), canonical.get(_key(target), target))
+            elif _key(alias) in canonical:
+                # Nautobot uses the alias spelling; resolve the other way round
+                self._names.setdefault(_key(target), canonical[_key(alias)])
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def get(self, name: str) -> str | None:
+        """Canonical name for ``name``, or ``None`` if it is unknown."""
+        canonical = self._names.get(_key(name))
+        if canonical is None and not self.known:
+            return name
+        return canonical
+
+    def suggest(self, name: str, limit: int = 5) -> list[str]:
+        """Canonical names ranked by how closely they match ``name``."""
+        key = _key(name)
+        if not key:
+            return []
+        keys = list(self._names)
+        # Partial names first ("newyork" -> "newyorkdatacenter"), then typos
+        ranked = sorted((k for k in keys if key in k), key=len)
+        ranked += difflib.get_close_matches(key, keys, n=limit, cutoff=0.6)
+        suggestions = dict.fromkeys(self._names[k] for k in ranked)
+        return list(suggestions)[:limit]
+
+    def resolve(self, names: Iterable[str]) -> list[str]:
+        """Canonical names for ``names``, deduplicated in order.
+
+        Raises :class:`UnknownNameError` listing every unknown name.
+        """
+        resolved: dict[str, None] = {}
+        unknown: dict[str, list[str]] = {}
+        for name in names:
+            canonical = self.get(name)
+            if canonical is None:
+                unknown[name] = self.suggest(name)
+            else:
+                resolved[canonical] = None
+        if unknown:
+            raise UnknownNameError(self.kind, unknown)
+        return list(resolved)
+
+
+def _configured_aliases(kind: str) -> dict[str, str]:
+    settings = get_settings()
+    if kind == "location":
+        return {**DEFAULT_LOCATION_ALIASES, **settings.location_aliases}
+    return {**DEFAULT_ROLE_ALIASES, **settings.role_aliases}
+
+
+class NameResolver:
+    """Keeps a :class:`NameIndex` per kind, reloaded from Nautobot every ``ttl``."""
+
+    def __init__(self, enabled: bool | None = None, ttl: float | None = None):
+        settings = get_settings()
+        self.enabled = settings.name_resolution if enabled is None else enabled
+        self.ttl = settings.name_index_ttl if ttl is None else ttl
+        self._indexes: dict[str, NameIndex] = {}
+
+    def _cached(self, kind: str, fresh: bool) -> NameIndex | None:
+        index = self._indexes.get(kind)
+        if index is None or fresh:
+            return None
+        age = time.monotonic() - index.loaded_at
+        # Retry failed loads sooner than successful ones are refreshed
+        return (
+            index
+            if age < (self.ttl if index.known else _MISS_RELOAD_INTERVAL)
+            else None
+        )
+
+    def _build(
+        self, kind: str, names: list[str] | None, error: Any = None
+    ) -> NameIndex:
+        if error is not None:
+            logger.warning(
+                "Could not load names from Nautobot; only aliases will be resolved",
+                kind=kind,
+                error=str(error),
+            )
+        index = NameIndex(kind, names, _configured_aliases(kind))
+        self._indexes[kind] = index
+        return index
+
+    def index(self, kind: str, fresh: bool = False) -> NameIndex:
+        index = self._cached(kind, fresh)
+        if index is not None:
+            return index
+        query, field = _NAME_QUERIES[kind]
+        try:
+            names = [
+                row["name"]
+                for page in nb.client.iter_pages(query, {}, field, fresh=fresh)
+                for row in page
+            ]
+        except Exception as e:
+            return self._build(kind, None, e)
+        return self._build(kind, names)
+
+    async def index_async(self, kind: str, fresh: bool = False) -> NameIndex:
+        index = self._cached(kind, fresh)
+        if index is not None:
+            return index
+        query, field = _NAME_QUERIES[kind]
+        try:
+            names = [
+                row["name"]
+                async for page in nb.async_client.iter_pages(
+                    query, {}, field, fresh=fresh
+                )
+                for row in page
+            ]
+        except Exception as e:
+            return self._build(kind, None, e)
+        return self._build(kind, names)
+
+    def _retry_miss(self, index: NameIndex, names: list[str]) -> bool:
+        return (
+            index.known
+            and time.monotonic() - index.loaded_at >= _MISS_RELOAD_INTERVAL
+            and any(index.get(name) is None for name in names)
+        )
+
+    def resolve(self, kind: str, names: list[str], fresh: bool = False) -> list[str]:
+        """Canonical names for ``names``; raises :class:`UnknownNameError`."""
+        if not self.enabled:
+            return list(dict.fromkeys(names))
+        index = self.index(kind, fresh)
+        if self._retry_miss(index, names):
+            index = self.index(kind, fresh=True)
+        return index.resolve(names)
+
+    async def resolve_async(
+        self, kind: str, names: list[str], fresh: bool = False
+    ) -> list[str]:
+        """Async variant of :meth:`resolve` using the async client."""
+        if not self.enabled:
+            return list(dict.fromkeys(names))
+        index = await self.index_async(kind, fresh)
+        if self._retry_miss(index, names):
+            index = await self.index_async(kind, fresh=True)
+        return index.resolve(names)
+
+    def resolve_name(self, kind: str, name: str) -> str:
+        return self.resolve(kind, [name])[0]
+
+    async def resolve_name_async(self, kind: str, name: str) -> str:
+        return (await self.resolve_async(kind, [name]))[0]
+
+    def clear(self) -> None:
+        self._indexes.clear()
+
+
+def error_details(e: Exception) -> dict[str, Any]:
+    """Extra fields for a tool error response caused by ``e``."""
+    if isinstance(e, UnknownNameError):
+        return {"suggestions": e.suggestions}
+    return {}
+
+
+resolver = NameResolver()
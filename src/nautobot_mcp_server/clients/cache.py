@@ -0,0 +1,303 @@
+"""Bounded in-process TTL + LRU cache for GraphQL query results."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from .. import serialization
+from ..settings import Settings, get_settings
+from .shared_cache import SharedCache
+
+# Returned by memory tier lookups on a miss, before the shared tier is tried
+_MISS = object()
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "stale_until", "size", "expired")
+
+    def __init__(self, value: Any, expires_at: float, stale_until: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.size = size
+        self.expired = False
+
+
+class QueryCache:
+    """Thread-safe result cache keyed on the normalized (query, variables) pair.
+
+    Entries expire after a per-query TTL and are evicted least-recently-used
+    first once either ``max_entries`` or the approximate ``max_bytes`` budget is
+    exceeded. A ``max_entries`` of ``0`` disables the cache.
+
+    Expired entries are kept for a further ``stale_ttl`` seconds (still subject
+    to LRU eviction) so :meth:`get_stale` can serve them while Nautobot is
+    unavailable.
+
+    With a ``shared`` tier (see :mod:`.shared_cache`) misses fall through to
+    it and writes go to both, so worker processes share results. The
+    ``*_async`` methods do the shared tier's disk I/O in a worker thread so
+    the event loop is not blocked on SQLite.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl: float = 60.0,
+        ttls: dict[str, float] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        stale_ttl: float = 0.0,
+        shared: SharedCache | None = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        self.stale_ttl = stale_ttl
+        self.shared = shared
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_hits = 0
+        self.shared_hits = 0
+        self.warming = False
+        self.warm_entries = 0
+        self.warm_seconds = 0.0
+
+    @classmethod
+    def from_settings(cls, settings: Settings | None = None) -> QueryCache:
+        settings = settings or get_settings()
+        return cls(
+            max_entries=settings.cache_max_entries if settings.cache_enabled else 0,
+            max_bytes=settings.cache_max_bytes,
+            default_ttl=settings.cache_default_ttl,
+            ttls=settings.cache_ttls,
+            stale_ttl=settings.cache_stale_ttl,
+            shared=SharedCache.from_settings(settings),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def make_key(
+        query: str, variables: dict[str, Any] | None = None, namespace: str = ""
+    ) -> str:
+        """Build a cache key that ignores whitespace and variable ordering."""
+        normalized = " ".join(query.split())
+        vars_key = json.dumps(variables or {}, sort_keys=True, separators=(",", ":"))
+        return f"{namespace}\n{normalized}\n{vars_key}"
+
+    def ttl_for(self, query_name: str | None) -> float:
+        """Return the TTL for a query file name (e.g. ``devices_by_location``)."""
+        if query_name is not None and query_name in self.ttls:
+            return self.ttls[query_name]
+        return self.default_ttl
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value for ``key`` or ``None`` on a miss."""
+        value = self._get_memory(key)
+        if value is not _MISS:
+            return value
+        return self._count_shared(self._get_shared(key))
+
+    async def get_async(self, key: str) -> Any | None:
+        """:meth:`get` for the event loop: the shared tier is read in a thread."""
+        value = self._get_memory(key)
+        if value is not _MISS:
+            return value
+        if self.shared is None:
+            return self._count_shared(None)
+        return self._count_shared(await asyncio.to_thread(self._get_shared, key))
+
+    def _get_memory(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                now = self._clock()
+                if entry.expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.value
+                if not entry.expired:
+                    entry.expired = True
+                    self.expirations += 1
+                if entry.stale_until <= now:
+                    self._remove(key)
+        return _MISS
+
+    def _count_shared(self, value: Any | None) -> Any | None:
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.shared_hits += 1
+        return value
+
+    def _get_shared(self, key: str, stale: bool = False) -> Any | None:
+        if self.shared is None or not self.enabled:
+            return None
+        found = self.shared.get(key, stale)
+        if found is None:
+            return None
+        raw, ttl = found
+        value = serialization.loads(raw)
+        if ttl > 0:
+            # Keep it locally for the rest of its TTL
+            self._store(key, value, ttl, len(raw))
+        return value
+
+    def get_stale(self, key: str) -> Any | None:
+        """Return the value for ``key`` even if expired, within ``stale_ttl``."""
+        value = self._get_memory_stale(key)
+        if value is not _MISS:
+            return value
+        return self._count_stale(self._get_shared(key, stale=True))
+
+    async def get_stale_async(self, key: str) -> Any | None:
+        """:meth:`get_stale` with the shared tier read in a thread."""
+        value = self._get_memory_stale(key)
+        if value is not _MISS:
+            return value
+        if self.shared is None:
+            return None
+        stale = await asyncio.to_thread(self._get_shared, key, True)
+        return self._count_stale(stale)
+
+    def _get_memory_stale(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.stale_until > self._clock():
+                self.stale_hits += 1
+                return entry.value
+        return _MISS
+
+    def _count_stale(self, value: Any | None) -> Any | None:
+        if value is not None:
+            with self._lock:
+                self.stale_hits += 1
+        return value
+
+    def set(
+        self, key: str, value: Any, ttl: float, size: int, raw: bytes | None = None
+    ) -> None:
+        """Store ``value`` for ``ttl`` seconds; ``size`` is its approximate bytes.
+
+        ``raw`` is the value's JSON encoding for the shared tier, when at hand.
+        """
+        if not self.enabled or ttl <= 0:
+            return
+        if self.shared is not None:
+            self._set_shared(key, value, ttl, raw)
+        self._store(key, value, ttl, size)
+
+    async def set_async(
+        self, key: str, value: Any, ttl: float, size: int, raw: bytes | None = None
+    ) -> None:
+        """:meth:`set` for the event loop: the shared tier is written in a thread."""
+        if not self.enabled or ttl <= 0:
+            return
+        if self.shared is not None:
+            await asyncio.to_thread(self._set_shared, key, value, ttl, raw)
+        self._store(key, value, ttl, size)
+
+    def _set_shared(self, key: str, value: Any, ttl: float, raw: bytes | None) -> None:
+        assert self.shared is not None
+        self.shared.set(
+            key,
+            raw if raw is not None else serialization.dumps(value),
+            ttl,
+            self.stale_ttl,
+        )
+
+    def _store(
+        self, key: str, value: Any, ttl: float, size: int, replace: bool = True
+    ) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                if not replace:
+                    return
+                self._remove(key)
+            expires_at = self._clock() + ttl
+            self._entries[key] = _Entry(
+                value, expires_at, expires_at + self.stale_ttl, size
+            )
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def warm(self) -> int:
+        """Preload the longest-lived shared tier entries; return how many.
+
+        Loads until the memory budget is full. Entries stored meanwhile are
+        newer and are not replaced.
+        """
+        if self.shared is None or not self.enabled:
+            return 0
+        started = time.perf_counter()
+        loaded = size = 0
+        with self._lock:
+            self.warming = True
+        try:
+            for key, raw, ttl in self.shared.entries():
+                if loaded >= self.max_entries or size + len(raw) > self.max_bytes:
+                    break
+                self._store(key, serialization.loads(raw), ttl, len(raw), False)
+                loaded += 1
+                size += len(raw)
+        finally:
+            with self._lock:
+                self.warming = False
+                self.warm_entries = loaded
+                self.warm_seconds = time.perf_counter() - started
+        return loaded
+
+    def invalidate(self, predicate: Callable[[str], bool] | None = None) -> int:
+        """Drop entries whose key matches ``predicate`` (all when omitted)."""
+        if self.shared is not None:
+            self.shared.invalidate(predicate)
+        with self._lock:
+            keys = [k for k in self._entries if predicate is None or predicate(k)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "stale_hits": self.stale_hits,
+                "shared_hits": self.shared_hits,
+                "warming": int(self.warming),
+                "warm_entries": self.warm_entries,
+                "warm_seconds": round(self.warm_seconds, 6),
+            }
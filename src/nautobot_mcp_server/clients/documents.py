@@ -0,0 +1,110 @@
+"""Helpers for deriving GraphQL documents from the bundled ``.graphql`` templates."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+
+_IDENT = re.compile(r"[_A-Za-z][_0-9A-Za-z]*")
+
+
+def _skip_ws(text: str, pos: int) -> int:
+    while pos < len(text) and (text[pos].isspace() or text[pos] == ","):
+        pos += 1
+    return pos
+
+
+def _balanced(text: str, pos: int, open_char: str, close_char: str) -> int:
+    """Return the index just past the bracket group starting at ``pos``."""
+    depth = 0
+    for i in range(pos, len(text)):
+        if text[i] == open_char:
+            depth += 1
+        elif text[i] == close_char:
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    raise ValueError(f"Unbalanced '{open_char}' in GraphQL document")
+
+
+def _root_selection_span(document: str) -> tuple[str, int, int]:
+    pos = _skip_ws(document, document.index("{") + 1)
+    match = _IDENT.match(document, pos)
+    if match is None:
+        raise ValueError("GraphQL document has no root field")
+    field = match.group(0)
+    pos = _skip_ws(document, match.end())
+    if document.startswith("(", pos):
+        pos = _skip_ws(document, _balanced(document, pos, "(", ")"))
+    if not document.startswith("{", pos):
+        raise ValueError(f"Root field '{field}' has no selection set")
+    return field, pos, _balanced(document, pos, "{", "}")
+
+
+def root_selection(document: str) -> tuple[str, str]:
+    """Return ``(field, selection)`` for the first root field of a query.
+
+    ``selection`` is the field's selection set including its braces, e.g. for
+    ``query Q($n: String!) { devices(location: [$n]) { name } }`` this returns
+    ``("devices", "{ name }")``.
+    """
+    field, start, end = _root_selection_span(document)
+    return field, document[start:end]
+
+
+def selection_fields(selection: str) -> dict[str, str]:
+    """Split a selection set into ``{field: text}`` for its top-level fields.
+
+    ``text`` keeps the field's arguments and nested selection set.
+    """
+    body = selection.strip()[1:-1]
+    fields: dict[str, str] = {}
+    pos = _skip_ws(body, 0)
+    while pos < len(body):
+        match = _IDENT.match(body, pos)
+        if match is None:
+            raise ValueError(f"Unexpected {body[pos]!r} in selection set")
+        end = match.end()
+        nxt = _skip_ws(body, end)
+        if body.startswith("(", nxt):
+            end = _balanced(body, nxt, "(", ")")
+            nxt = _skip_ws(body, end)
+        if body.startswith("{", nxt):
+            end = _balanced(body, nxt, "{", "}")
+        fields[match.group(0)] = body[pos:end]
+        pos = _skip_ws(body, end)
+    return fields
+
+
+def project(document: str, fields: Iterable[str]) -> str:
+    """Return ``document`` with its root selection limited to ``fields``.
+
+    Fields keep their template order and nested selections; unknown fields
+    raise ``ValueError``.
+    """
+    _, start, end = _root_selection_span(document)
+    available = selection_fields(document[start:end])
+    wanted = set(fields)
+    unknown = wanted - available.keys()
+    if unknown:
+        raise ValueError(f"Unknown fields {sorted(unknown)}")
+    kept = [text for name, text in available.items() if name in wanted]
+    return document[:start] + "{ " + " ".join(kept) + " }" + document[end:]
+
+
+def aliased_query(
+    operation: str,
+    variable_defs: list[str],
+    fields: list[tuple[str, str, str]],
+    selection: str,
+) -> str:
+    """Build one query document selecting the same field under several aliases.
+
+    ``fields`` holds ``(alias, field, arguments)`` tuples; every alias shares the
+    given ``selection`` set.
+    """
+    lines = [f"query {operation}({', '.join(variable_defs)}) {{"]
+    for alias, field, arguments in fields:
+        lines.append(f"  {alias}: {field}({arguments}) {selection}")
+    lines.append("}")
+    return "\n".join(lines)
@@ -1,12 +1,34 @@
 """Nautobot GraphQL client for making queries."""
 
+import asyncio
+import contextvars
+import functools
+import time
+from collections.abc import AsyncIterator, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from importlib import resources
 from typing import Any
 
+import httpx
 import requests
 import structlog
+from requests.adapters import HTTPAdapter
 
-from ..settings import get_settings
+from .. import metrics, serialization, tracing
+from ..settings import Settings, get_settings
+from .cache import QueryCache
+from .documents import aliased_query, project, root_selection
+from .normalizers import FIELDS, normalizer
+from .resilience import (
+    AdaptiveLimiter,
+    AsyncAdaptiveLimiter,
+    CircuitBreaker,
+    CircuitOpenError,
+    OverloadedError,
+    RetryPolicy,
+    UpstreamUnavailableError,
+)
+from .singleflight import AsyncSingleFlight, SingleFlight
 
 logger = structlog.get_logger(__name__)
 
@@ -16,34 +38,322 @@ GRAPHQL_PATH = _settings.graphql_path
 TOKEN = _settings.nautobot_token
 
 HEADERS = {"Authorization": f"Token {TOKEN}"} if TOKEN else {}
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+# Query document -> query file name, used to look up per-query cache TTLs
+QUERY_NAMES: dict[str, str] = {}
 
 
 def _load_query(filename: str) -> str:
     with resources.files("nautobot_mcp_server.graphql").joinpath(filename).open(
         "r", encoding="utf-8"
     ) as f:
-        return f.read()
+        text = f.read()
+    QUERY_NAMES[text] = filename.removesuffix(".graphql")
+    return text
 
 
 PREFIXES_QUERY = _load_query("prefixes_by_location.graphql")
 DEVICES_QUERY = _load_query("devices_by_location.graphql")
 DEVICES_BY_LOCATION_AND_ROLE_QUERY = _load_query("devices_by_location_and_role.graphql")
+ALL_PREFIXES_QUERY = _load_query("all_prefixes.graphql")
+ALL_DEVICES_QUERY = _load_query("all_devices.graphql")
+LOCATION_NAMES_QUERY = _load_query("location_names.graphql")
+ROLE_NAMES_QUERY = _load_query("role_names.graphql")
+
+
+# Fields always returned so projected records stay identifiable
+_IDENTITY_FIELDS = {"devices": "name", "prefixes": "prefix"}
+
+
+def _field_selection(kind: str, fields: Iterable[str] | None) -> tuple[str, ...] | None:
+    """Canonical field tuple for a projection, or ``None`` for every field."""
+    if not fields:
+        return None
+    available = FIELDS[kind]
+    wanted = set(fields)
+    unknown = wanted - available.keys()
+    if unknown:
+        raise ValueError(
+            f"Unknown {kind} fields {sorted(unknown)}; choose from {list(available)}"
+        )
+    wanted.add(_IDENTITY_FIELDS[kind])
+    if wanted == available.keys():
+        return None
+    return tuple(name for name in available if name in wanted)
+
+
+@functools.cache
+def _projected_query(template: str, fields: tuple[str, ...] | None) -> str:
+    """``template`` with its selection set limited to ``fields``, built once."""
+    if fields is None:
+        return template
+    document = project(template, fields)
+    # Projected documents share the TTL of their template
+    QUERY_NAMES[document] = QUERY_NAMES[template]
+    return document
+
+
+def project_records(
+    kind: str, records: list[dict[str, Any]], fields: Iterable[str] | None
+) -> list[dict[str, Any]]:
+    """Limit already normalized records to ``fields``."""
+    selected = _field_selection(kind, fields)
+    if selected is None:
+        return records
+    return [{name: record.get(name) for name in selected} for record in records]
+
+
+@functools.cache
+def _batch_query(
+    kind: str, count: int, with_roles: bool, fields: tuple[str, ...] | None = None
+) -> str:
+    """Aliased query for ``count`` locations reusing the template selection set."""
+    if kind == "devices":
+        operation, template, location_arg = (
+            "DevicesByLocations",
+            DEVICES_QUERY,
+            "location",
+        )
+    else:
+        operation, template, location_arg = (
+            "PrefixesByLocations",
+            PREFIXES_QUERY,
+            "locations",
+        )
+    field, selection = root_selection(_projected_query(template, fields))
+    variable_defs = [f"$l{i}: String!" for i in range(count)]
+    role_arg = ""
+    if with_roles:
+        variable_defs.append("$roles: [String]")
+        role_arg = ", role: $roles"
+    aliases = [
+        (f"l{i}", field, f"{location_arg}: [$l{i}]{role_arg}") for i in range(count)
+    ]
+    document = aliased_query(operation, variable_defs, aliases, selection)
+    # Batched results share the TTL of the single-location query file
+    QUERY_NAMES[document] = QUERY_NAMES[template]
+    return document
+
+
+def _batch_requests(
+    kind: str,
+    location_names: list[str],
+    role_names: list[str] | None,
+    max_aliases: int,
+    fields: tuple[str, ...] | None = None,
+) -> list[tuple[list[str], str, dict[str, Any]]]:
+    """Split locations into chunks of at most ``max_aliases`` aliased queries."""
+    unique = list(dict.fromkeys(location_names))
+    size = max(max_aliases, 1)
+    requests_ = []
+    for start in range(0, len(unique), size):
+        chunk = unique[start : start + size]
+        variables: dict[str, Any] = {f"l{i}": name for i, name in enumerate(chunk)}
+        if role_names:
+            variables["roles"] = list(role_names)
+        query = _batch_query(kind, len(chunk), bool(role_names), fields)
+        requests_.append((chunk, query, variables))
+    return requests_
+
+
+def _unavailable(status: int | None) -> bool:
+    """Whether an HTTP status means Nautobot itself is struggling."""
+    return status is None or status >= 500 or status == 429
+
+
+def _serve_stale(stale: Any | None, span: Any, error: Exception) -> dict[str, Any]:
+    """Answer with ``stale``, an expired cache entry, or raise ``error``."""
+    if stale is None:
+        raise error
+    logger.warning(
+        "Nautobot unavailable; serving stale cached result", error=str(error)
+    )
+    span.set(cache="stale")
+    return stale  # type: ignore[no-any-return]
+
+
+def _record_health(client: Any, latency: float, healthy: bool | None) -> None:
+    """Feed one request's outcome to the client's limiter and breaker."""
+    client.limiter.release(None if healthy is None else latency, bool(healthy))
+    if healthy:
+        client.breaker.record_success()
+    elif healthy is False:
+        client.breaker.record_failure()
+
+
+def _hedge_delay(client: Any, name: str, deadline: float) -> float | None:
+    """Seconds to wait before hedging a request, or ``None`` for no hedge."""
+    if client.breaker.state != CircuitBreaker.CLOSED:
+        return None
+    delay: float | None = client.retry.hedge_delay(name)
+    if delay is None or delay >= client.retry.remaining(deadline):
+        return None
+    return delay
+
+
+def _has_room(limiter: Any) -> bool:
+    # Hedges never queue for a slot: under load they would only add to it
+    return bool(limiter.active < int(limiter.limit))
+
+
+def _overloaded(limiter: Any) -> OverloadedError:
+    return OverloadedError(
+        "GraphQL request failed: too many Nautobot requests in flight "
+        f"(limit {int(limiter.limit)})"
+    )
+
+
+def _circuit_open(breaker: CircuitBreaker) -> CircuitOpenError:
+    return CircuitOpenError(
+        "GraphQL request failed: Nautobot is unavailable "
+        f"(circuit open, next attempt in {breaker.retry_after():.0f}s)"
+    )
+
+
+def build_session(settings: Settings | None = None) -> requests.Session:
+    """Build a pooled keep-alive session for talking to Nautobot."""
+    settings = settings or get_settings()
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=settings.http_pool_connections,
+        pool_maxsize=settings.http_pool_maxsize,
+        pool_block=settings.http_pool_block,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not settings.http_keepalive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def build_async_http_client(settings: Settings | None = None) -> httpx.AsyncClient:
+    """Build a pooled keep-alive ``httpx.AsyncClient`` for talking to Nautobot."""
+    settings = settings or get_settings()
+    limits = httpx.Limits(
+        max_connections=settings.http_pool_maxsize
+        if settings.http_pool_block
+        else None,
+        max_keepalive_connections=(
+            settings.http_pool_maxsize if settings.http_keepalive else 0
+        ),
+    )
+    return httpx.AsyncClient(limits=limits, timeout=settings.upstream_attempt_timeout)
 
 
 class NautobotGraphQLClient:
     """Client for making GraphQL queries to Nautobot."""
 
-    def __init__(self, base_url: str | None = None, token: str | None = None):
+    def __init__(
+        self,
+        base_url: str | None = None,
+        token: str | None = None,
+        session: requests.Session | None = None,
+        cache: QueryCache | None = None,
+        breaker: CircuitBreaker | None = None,
+        retry: RetryPolicy | None = None,
+    ):
         """Initialize the client."""
         self.base_url = base_url or BASE_URL
         self.token = token or TOKEN
         self.headers = {"Authorization": f"Token {self.token}"} if self.token else {}
+        self.headers.update(JSON_HEADERS)
         self.graphql_url = f"{self.base_url}{GRAPHQL_PATH}"
+        self.session = session or build_session()
+        self.cache = cache if cache is not None else QueryCache.from_settings()
+        self.inflight = SingleFlight()
+        self.breaker = (
+            breaker if breaker is not None else CircuitBreaker.from_settings()
+        )
+        self.limiter = AdaptiveLimiter.from_settings()
+        self.retry = retry if retry is not None else RetryPolicy.from_settings()
+        settings = get_settings()
+        self.queue_timeout = settings.upstream_queue_timeout
+        self.page_size = settings.graphql_page_size
+        self.max_aliases = settings.graphql_max_aliases
+        self._hedge_pool: ThreadPoolExecutor | None = None
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False)
+            self._hedge_pool = None
+
+    def pool_stats(self) -> dict[str, int]:
+        """Return connection pool counters for the live host pools.
+
+        ``connections_opened`` counts new TCP (and TLS) connections, while
+        ``connections_reused`` counts requests served on an already open one.
+        """
+        stats = {
+            "pools": 0,
+            "requests": 0,
+            "connections_opened": 0,
+            "connections_reused": 0,
+        }
+        adapters = {id(a): a for a in self.session.adapters.values()}
+        for adapter in adapters.values():
+            pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+            if pools is None:
+                continue
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                stats["pools"] += 1
+                stats["requests"] += pool.num_requests
+                stats["connections_opened"] += pool.num_connections
+        stats["connections_reused"] = max(
+            stats["requests"] - stats["connections_opened"], 0
+        )
+        return stats
 
     def query(
-        self, query: str, variables: dict[str, Any] | None = None
+        self,
+        query: str,
+        variables: dict[str, Any] | None = None,
+        fresh: bool = False,
+    ) -> dict[str, Any]:
+        """Execute a GraphQL query.
+
+        Results are served from the result cache unless ``fresh`` is set, in which
+        case Nautobot is always queried and the cached entry refreshed. While
+        Nautobot is unavailable, non-``fresh`` queries fall back to expired
+        cache entries when there are any.
+        """
+        with tracing.span(
+            "nautobot.query", query=QUERY_NAMES.get(query, "other")
+        ) as span:
+            key = self.cache.make_key(query, variables, self.graphql_url)
+            if self.cache.enabled and not fresh:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    span.set(cache="hit")
+                    return cached  # type: ignore[no-any-return]
+
+            if not self.breaker.allow():
+                if fresh:
+                    raise _circuit_open(self.breaker)
+                return _serve_stale(
+                    self.cache.get_stale(key), span, _circuit_open(self.breaker)
+                )
+
+            span.set(cache="miss")
+            try:
+                # Concurrent identical queries share one upstream request
+                return self.inflight.do(
+                    key, lambda: self._execute(key, query, variables)
+                )
+            except UpstreamUnavailableError as e:
+                if fresh:
+                    raise
+                return _serve_stale(self.cache.get_stale(key), span, e)
+
+    def _execute(
+        self, key: str, query: str, variables: dict[str, Any] | None
     ) -> dict[str, Any]:
-        """Execute a GraphQL query."""
         payload: dict[str, Any] = {"query": query}
         if variables:
             payload["variables"] = variables
@@ -53,39 +363,779 @@ class NautobotGraphQLClient:
             query=query[:100] + "..." if len(query) > 100 else query,
         )
 
-        try:
-            response = requests.post(
-                self.graphql_url, json=payload, headers=self.headers, timeout=10
+        query_name = QUERY_NAMES.get(query)
+        name = query_name or "other"
+        deadline = self.retry.start()
+        attempt = 0
+        while True:
+            try:
+                data, raw = self._hedged(payload, name, deadline, attempt)
+                break
+            except UpstreamUnavailableError as e:
+                attempt += 1
+                delay = self.retry.next_delay(attempt, e, deadline)
+                if delay is None or not self.breaker.allow():
+                    raise
+                logger.warning(
+                    "Retrying GraphQL request",
+                    attempt=attempt,
+                    delay=round(delay, 3),
+                    error=str(e),
+                )
+                time.sleep(delay)
+
+        self.cache.set(key, data, self.cache.ttl_for(query_name), len(raw), raw)
+        return data
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._hedge_pool is None:
+            self._hedge_pool = ThreadPoolExecutor(
+                max_workers=2 * self.limiter.maximum,
+                thread_name_prefix="nautobot-hedge",
             )
-            response.raise_for_status()
-            data = response.json()
+        return self._hedge_pool
+
+    def _submit(self, *args: Any) -> Future[tuple[dict[str, Any], bytes]]:
+        # A context per request, so tracing captures follow both threads
+        call = functools.partial(contextvars.copy_context().run, self._attempt, *args)
+        return self._pool().submit(call)
+
+    def _hedged(
+        self, payload: dict[str, Any], name: str, deadline: float, attempt: int
+    ) -> tuple[dict[str, Any], bytes]:
+        """One attempt, duplicated if it outlasts the query's p95 latency."""
+        delay = _hedge_delay(self, name, deadline)
+        if delay is None:
+            return self._attempt(payload, name, deadline, attempt)
+
+        primary = self._submit(payload, name, deadline, attempt)
+        pending = {primary}
+        if not wait(pending, timeout=delay).done and _has_room(self.limiter):
+            self.retry.hedges += 1
+            pending.add(self._submit(payload, name, deadline, attempt, True))
+        error: BaseException | None = None
+        # Losers cannot be interrupted; they finish in the background
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                exc = future.exception()
+                if exc is None:
+                    if future is not primary:
+                        self.retry.hedge_wins += 1
+                    return future.result()
+                if not isinstance(exc, UpstreamUnavailableError):
+                    raise exc
+                error = error or exc
+        assert error is not None
+        raise error
+
+    def _attempt(
+        self,
+        payload: dict[str, Any],
+        name: str,
+        deadline: float,
+        attempt: int,
+        hedge: bool = False,
+    ) -> tuple[dict[str, Any], bytes]:
+        """Send one request; return the decoded response and its raw bytes."""
+        queue_timeout = min(self.queue_timeout, self.retry.remaining(deadline))
+        if not self.limiter.acquire(max(queue_timeout, 0)):
+            raise _overloaded(self.limiter)
+        timer = metrics.UpstreamTimer(name, "sync")
+        # None: no verdict on Nautobot's health (e.g. the call was cancelled)
+        outcome, size = "error", None
+        healthy: bool | None = None
+        started = time.perf_counter()
+        try:
+            with tracing.span(
+                "nautobot.post", query=name, attempt=attempt, hedge=hedge
+            ):
+                response = self.session.post(
+                    self.graphql_url,
+                    data=serialization.dumps(payload),
+                    headers=self.headers,
+                    timeout=self.retry.timeout(deadline),
+                )
+                response.raise_for_status()
+            size = len(response.content)
+            with tracing.span("json.decode", bytes=size):
+                # Decode the raw bytes; avoids building an intermediate str
+                data = serialization.loads(response.content)
 
             if "errors" in data:
                 logger.error("GraphQL errors", errors=data["errors"])
                 raise RuntimeError(f"GraphQL errors: {data['errors']}")
 
-            return data
+            outcome, healthy = "ok", True
+            self.retry.observe(name, time.perf_counter() - started)
+            return data, response.content
         except requests.exceptions.RequestException as e:
             logger.error("GraphQL request failed", error=str(e))
-            raise RuntimeError(f"GraphQL request failed: {e}") from e
+            status = e.response.status_code if e.response is not None else None
+            healthy = not _unavailable(status)
+            error = RuntimeError if healthy else UpstreamUnavailableError
+            raise error(f"GraphQL request failed: {e}") from e
+        except ValueError as e:
+            logger.error("Invalid GraphQL response", error=str(e))
+            healthy = False
+            raise UpstreamUnavailableError(
+                f"GraphQL request failed: invalid JSON: {e}"
+            ) from e
+        except UpstreamUnavailableError:
+            # The deadline ran out before the request was sent
+            raise
+        except RuntimeError:
+            # GraphQL errors come from a working Nautobot
+            healthy = True
+            raise
+        finally:
+            timer.done(outcome, size)
+            _record_health(self, time.perf_counter() - started, healthy)
+
+    def iter_pages(
+        self,
+        query: str,
+        variables: dict[str, Any],
+        field: str,
+        page_size: int | None = None,
+        fresh: bool = False,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Yield pages of ``data[field]`` using Nautobot's ``limit``/``offset``.
+
+        A ``page_size`` of ``0`` fetches the whole result in a single request.
+        """
+        size = self.page_size if page_size is None else page_size
+        if size <= 0:
+            yield self.query(query, variables, fresh=fresh)["data"][field]
+            return
+
+        offset = 0
+        while True:
+            page_vars = {**variables, "limit": size, "offset": offset}
+            page = self.query(query, page_vars, fresh=fresh)["data"][field]
+            yield page
+            if len(page) < size:
+                return
+            offset += size
+
+    def iter_prefixes_by_location(
+        self,
+        location_name: str,
+        page_size: int | None = None,
+        fresh: bool = False,
+        fields: Iterable[str] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield normalized prefixes for a location one page at a time."""
+        selected = _field_selection("prefixes", fields)
+        pages = self.iter_pages(
+            _projected_query(PREFIXES_QUERY, selected),
+            {"name": location_name},
+            "prefixes",
+            page_size,
+            fresh,
+        )
+        normalize = normalizer("prefixes", selected).many
+        for page in pages:
+            yield from normalize(page)
+
+    def iter_devices_by_location(
+        self,
+        location_name: str,
+        page_size: int | None = None,
+        fresh: bool = False,
+        fields: Iterable[str] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield normalized devices for a location one page at a time."""
+        selected = _field_selection("devices", fields)
+        pages = self.iter_pages(
+            _projected_query(DEVICES_QUERY, selected),
+            {"name": location_name},
+            "devices",
+            page_size,
+            fresh,
+        )
+        normalize = normalizer("devices", selected).many
+        for page in pages:
+            yield from normalize(page)
+
+    def iter_devices_by_location_and_role(
+        self,
+        location_name: str,
+        role_name: str,
+        page_size: int | None = None,
+        fresh: bool = False,
+        fields: Iterable[str] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield normalized devices for a location and role one page at a time."""
+        selected = _field_selection("devices", fields)
+        pages = self.iter_pages(
+            _projected_query(DEVICES_BY_LOCATION_AND_ROLE_QUERY, selected),
+            {"location": location_name, "role": role_name},
+            "devices",
+            page_size,
+            fresh,
+        )
+        normalize = normalizer("devices", selected).many
+        for page in pages:
+            yield from normalize(page)
 
-    def get_all_prefixes(self) -> list[dict[str, Any]]:
+    def iter_all_prefixes(
+        self, page_size: int | None = None, fresh: bool = False
+    ) -> Iterator[dict[str, Any]]:
+        """Yield every normalized prefix one page at a time."""
+        for page in self.iter_pages(
+            ALL_PREFIXES_QUERY, {}, "prefixes", page_size, fresh
+        ):
+            yield from normalizer("prefixes").many(page)
+
+    def iter_all_devices(
+        self, page_size: int | None = None, fresh: bool = False
+    ) -> Iterator[dict[str, Any]]:
+        """Yield every normalized device one page at a time."""
+        for page in self.iter_pages(ALL_DEVICES_QUERY, {}, "devices", page_size, fresh):
+            yield from normalizer("devices").many(page)
+
+    def get_all_prefixes(self, fresh: bool = False) -> list[dict[str, Any]]:
         """Get all prefixes."""
         try:
-            data = self.query(
-                "query { prefixes { prefix status { name } role { name } description } }"
+            prefixes = list(self.iter_all_prefixes(fresh=fresh))
+
+            logger.info("Retrieved all prefixes", count=len(prefixes))
+            return prefixes
+        except Exception as e:
+            logger.error("Failed to get all prefixes", error=str(e))
+            raise RuntimeError(f"GraphQL request failed: {e}") from e
+
+    def get_all_devices(self, fresh: bool = False) -> list[dict[str, Any]]:
+        """Get all devices."""
+        try:
+            devices = list(self.iter_all_devices(fresh=fresh))
+
+            logger.info("Retrieved all devices", count=len(devices))
+            return devices
+        except Exception as e:
+            logger.error("Failed to get all devices", error=str(e))
+            raise RuntimeError(f"GraphQL request failed: {e}") from e
+
+    def get_prefixes_by_location(
+        self,
+        location_name: str,
+        fresh: bool = False,
+        fields: Iterable[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Get all prefixes for a given location name."""
+        try:
+            prefixes = list(
+                self.iter_prefixes_by_location(
+                    location_name, fresh=fresh, fields=fields
+                )
+            )
+
+            logger.info(
+                "Retrieved prefixes by location",
+                location=location_name,
+                count=len(prefixes),
+            )
+            return prefixes
+        except Exception as e:
+            logger.error(
+                "Failed to get prefixes by location",
+                location=location_name,
+                error=str(e),
+            )
+            raise RuntimeError(f"GraphQL request failed: {e}") from e
+
+    def get_devices_by_location(
+        self,
+        location_name: str,
+        fresh: bool = False,
+        fields: Iterable[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Get all devices for a given location name."""
+        try:
+            devices = list(
+                self.iter_devices_by_location(location_name, fresh=fresh, fields=fields)
             )
-            prefixes_data = data["data"]["prefixes"]
 
-            prefixes = []
-            for prefix in prefixes_data:
-                prefix_data = {
-                    "prefix": prefix["prefix"],
-                    "status": (prefix["status"] or {}).get("name"),
-                    "role": (prefix["role"] or {}).get("name"),
-                    "description": prefix.get("description"),
-                }
-                prefixes.append(prefix_data)
+            logger.info(
+                "Retrieved devices by location",
+                location=location_name,
+                count=len(devices),
+            )
+            return devices
+        except Exception as e:
+            logger.error(
+                "Failed to get devices by location",
+                location=location_name,
+                error=str(e),
+            )
+            raise RuntimeError(f"GraphQL request failed: {e}") from e
+
+    def get_devices_by_location_and_role(
+        self,
+        location_name: str,
+        role_name: str,
+        fresh: bool = False,
+        fields: Iterable[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Get devices for a given location and role."""
+        try:
+            devices = list(
+                self.iter_devices_by_location_and_role(
+                    location_name, role_name, fresh=fresh, fields=fields
+                )
+            )
+
+            logger.info(
+                "Retrieved devices by location and role",
+                location=location_name,
+                role=role_name,
+                count=len(devices),
+            )
+            return devices
+        except Exception as e:
+            logger.error(
+                "Failed to get devices by location and role",
+                location=location_name,
+                role=role_name,
+                error=str(e),
+            )
+            raise RuntimeError(f"GraphQL request failed: {e}") from e
+
+    def get_prefixes_by_locations(
+        self,
+        location_names: list[str],
+        fresh: bool = False,
+        fields: Iterable[str] | None = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Get prefixes for several locations using aliased batch queries."""
+        try:
+            selected = _field_selection("prefixes", fields)
+            normalize = normalizer("prefixes", selected).many
+            prefixes: dict[str, list[dict[str, Any]]] = {}
+            for chunk, query, variables in _batch_requests(
+                "prefixes", location_names, None, self.max_aliases, selected
+            ):
+                data = self.query(query, variables, fresh=fresh)["data"]
+                for i, name in enumerate(chunk):
+                    prefixes[name] = normalize(data[f"l{i}"])
+
+            logger.info(
+                "Retrieved prefixes by locations",
+                locations=len(prefixes),
+                count=sum(len(v) for v in prefixes.values()),
+            )
+            return prefixes
+        except Exception as e:
+            logger.error(
+                "Failed to get prefixes by locations",
+                locations=location_names,
+                error=str(e),
+            )
+            raise RuntimeError(f"GraphQL request failed: {e}") from e
+
+    def get_devices_by_locations(
+        self,
+        location_names: list[str],
+        role_names: list[str] | None = None,
+        fresh: bool = False,
+        fields: Iterable[str] | None = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Get devices for several locations, optionally limited to roles."""
+        try:
+            selected = _field_selection("devices", fields)
+            normalize = normalizer("devices", selected).many
+            devices: dict[str, list[dict[str, Any]]] = {}
+            for chunk, query, variables in _batch_requests(
+                "devices", location_names, role_names, self.max_aliases, selected
+            ):
+                data = self.query(query, variables, fresh=fresh)["data"]
+                for i, name in enumerate(chunk):
+                    devices[name] = normalize(data[f"l{i}"])
+
+            logger.info(
+                "Retrieved devices by locations",
+                locations=len(devices),
+                roles=role_names,
+                count=sum(len(v) for v in devices.values()),
+            )
+            return devices
+        except Exception as e:
+            logger.error(
+                "Failed to get devices by locations",
+                locations=location_names,
+                roles=role_names,
+                error=str(e),
+            )
+            raise RuntimeError(f"GraphQL request failed: {e}") from e
+
+
+class AsyncNautobotGraphQLClient:
+    """Asyncio-native client for making GraphQL queries to Nautobot.
+
+    Mirrors :class:`NautobotGraphQLClient` so tools can await upstream I/O instead
+    of blocking the event loop.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        token: str | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        cache: QueryCache | None = None,
+        breaker: CircuitBreaker | None = None,
+        retry: RetryPolicy | None = None,
+    ):
+        """Initialize the client."""
+        self.base_url = base_url or BASE_URL
+        self.token = token or TOKEN
+        self.headers = {"Authorization": f"Token {self.token}"} if self.token else {}
+        self.headers.update(JSON_HEADERS)
+        self.graphql_url = f"{self.base_url}{GRAPHQL_PATH}"
+        self._http = http_client
+        self._owns_http = http_client is None
+        self._http_loop: asyncio.AbstractEventLoop | None = None
+        self.cache = cache if cache is not None else QueryCache.from_settings()
+        self.inflight = AsyncSingleFlight()
+        self.breaker = (
+            breaker if breaker is not None else CircuitBreaker.from_settings()
+        )
+        self.limiter = AsyncAdaptiveLimiter.from_settings()
+        self.retry = retry if retry is not None else RetryPolicy.from_settings()
+        settings = get_settings()
+        self.queue_timeout = settings.upstream_queue_timeout
+        self.page_size = settings.graphql_page_size
+        self.page_concurrency = max(settings.graphql_page_concurrency, 1)
+        self.max_aliases = settings.graphql_max_aliases
+
+    def _client(self) -> httpx.AsyncClient:
+        # httpx connections are bound to the loop that opened them, so an owned
+        # client is rebuilt if we are called from a different event loop.
+        loop = asyncio.get_running_loop()
+        if self._http is None or (self._owns_http and self._http_loop is not loop):
+            self._http = build_async_http_client()
+            self._http_loop = loop
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        if self._http is not None and self._owns_http:
+            await self._http.aclose()
+            self._http = None
+
+    async def query(
+        self,
+        query: str,
+        variables: dict[str, Any] | None = None,
+        fresh: bool = False,
+    ) -> dict[str, Any]:
+        """Execute a GraphQL query.
+
+        Results are served from the result cache unless ``fresh`` is set, in which
+        case Nautobot is always queried and the cached entry refreshed. While
+        Nautobot is unavailable, non-``fresh`` queries fall back to expired
+        cache entries when there are any.
+        """
+        with tracing.span(
+            "nautobot.query", query=QUERY_NAMES.get(query, "other")
+        ) as span:
+            key = self.cache.make_key(query, variables, self.graphql_url)
+            if self.cache.enabled and not fresh:
+                cached = await self.cache.get_async(key)
+                if cached is not None:
+                    span.set(cache="hit")
+                    return cached  # type: ignore[no-any-return]
+
+            if not self.breaker.allow():
+                if fresh:
+                    raise _circuit_open(self.breaker)
+                return _serve_stale(
+                    await self.cache.get_stale_async(key),
+                    span,
+                    _circuit_open(self.breaker),
+                )
+
+            span.set(cache="miss")
+            try:
+                # Concurrent identical queries share one upstream request
+                return await self.inflight.do(
+                    key, lambda: self._execute(key, query, variables)
+                )
+            except UpstreamUnavailableError as e:
+                if fresh:
+                    raise
+                return _serve_stale(await self.cache.get_stale_async(key), span, e)
+
+    async def _execute(
+        self, key: str, query: str, variables: dict[str, Any] | None
+    ) -> dict[str, Any]:
+        payload: dict[str, Any] = {"query": query}
+        if variables:
+            payload["variables"] = variables
+
+        logger.info(
+            "Executing GraphQL query",
+            query=query[:100] + "..." if len(query) > 100 else query,
+        )
+
+        query_name = QUERY_NAMES.get(query)
+        name = query_name or "other"
+        deadline = self.retry.start()
+        attempt = 0
+        while True:
+            try:
+                data, raw = await self._hedged(payload, name, deadline, attempt)
+                break
+            except UpstreamUnavailableError as e:
+                attempt += 1
+                delay = self.retry.next_delay(attempt, e, deadline)
+                if delay is None or not self.breaker.allow():
+                    raise
+                logger.warning(
+                    "Retrying GraphQL request",
+                    attempt=attempt,
+                    delay=round(delay, 3),
+                    error=str(e),
+                )
+                await asyncio.sleep(delay)
+
+        await self.cache.set_async(
+            key, data, self.cache.ttl_for(query_name), len(raw), raw
+        )
+        return data
+
+    async def _hedged(
+        self, payload: dict[str, Any], name: str, deadline: float, attempt: int
+    ) -> tuple[dict[str, Any], bytes]:
+        """One attempt, duplicated if it outlasts the query's p95 latency."""
+        delay = _hedge_delay(self, name, deadline)
+        if delay is None:
+            return await self._attempt(payload, name, deadline, attempt)
+
+        primary = asyncio.ensure_future(self._attempt(payload, name, deadline, attempt))
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if not done and _has_room(self.limiter):
+                self.retry.hedges += 1
+                pending.add(
+                    asyncio.ensure_future(
+                        self._attempt(payload, name, deadline, attempt, True)
+                    )
+                )
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                # Retrieve every outcome before picking, so none goes unobserved
+                outcomes = [(task, task.exception()) for task in done]
+                for task, exc in outcomes:
+                    if exc is None:
+                        if task is not primary:
+                            self.retry.hedge_wins += 1
+                        return task.result()
+                for _, exc in outcomes:
+                    if not isinstance(exc, UpstreamUnavailableError):
+                        raise exc  # type: ignore[misc]
+                    error = error or exc
+            assert error is not None
+            raise error
+        finally:
+            # The losing request is cancelled and frees its slot
+            for task in pending:
+                task.cancel()
+
+    async def _attempt(
+        self,
+        payload: dict[str, Any],
+        name: str,
+        deadline: float,
+        attempt: int,
+        hedge: bool = False,
+    ) -> tuple[dict[str, Any], bytes]:
+        """Send one request; return the decoded response and its raw bytes."""
+        queue_timeout = min(self.queue_timeout, self.retry.remaining(deadline))
+        if not await self.limiter.acquire(max(queue_timeout, 0)):
+            raise _overloaded(self.limiter)
+        timer = metrics.UpstreamTimer(name, "async")
+        # None: no verdict on Nautobot's health (e.g. the call was cancelled)
+        outcome, size = "error", None
+        healthy: bool | None = None
+        started = time.perf_counter()
+        try:
+            with tracing.span(
+                "nautobot.post", query=name, attempt=attempt, hedge=hedge
+            ):
+                response = await self._client().post(
+                    self.graphql_url,
+                    content=serialization.dumps(payload),
+                    headers=self.headers,
+                    timeout=self.retry.timeout(deadline),
+                )
+                response.raise_for_status()
+            size = len(response.content)
+            with tracing.span("json.decode", bytes=size):
+                data = serialization.loads(response.content)
+
+            if "errors" in data:
+                logger.error("GraphQL errors", errors=data["errors"])
+                raise RuntimeError(f"GraphQL errors: {data['errors']}")
+
+            outcome, healthy = "ok", True
+            self.retry.observe(name, time.perf_counter() - started)
+            return data, response.content
+        except httpx.HTTPError as e:
+            logger.error("GraphQL request failed", error=str(e))
+            status = (
+                e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+            )
+            healthy = not _unavailable(status)
+            error = RuntimeError if healthy else UpstreamUnavailableError
+            raise error(f"GraphQL request failed: {e}") from e
+        except ValueError as e:
+            logger.error("Invalid GraphQL response", error=str(e))
+            healthy = False
+            raise UpstreamUnavailableError(
+                f"GraphQL request failed: invalid JSON: {e}"
+            ) from e
+        except UpstreamUnavailableError:
+            # The deadline ran out before the request was sent
+            raise
+        except RuntimeError:
+            # GraphQL errors come from a working Nautobot
+            healthy = True
+            raise
+        finally:
+            timer.done(outcome, size)
+            _record_health(self, time.perf_counter() - started, healthy)
+
+    async def iter_pages(
+        self,
+        query: str,
+        variables: dict[str, Any],
+        field: str,
+        page_size: int | None = None,
+        fresh: bool = False,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Yield pages of ``data[field]`` using Nautobot's ``limit``/``offset``.
+
+        The first page is fetched alone; if it is full, following pages are
+        fetched ``page_concurrency`` at a time and yielded in order.
+        """
+        size = self.page_size if page_size is None else page_size
+        if size <= 0:
+            yield (await self.query(query, variables, fresh=fresh))["data"][field]
+            return
+
+        first = {**variables, "limit": size, "offset": 0}
+        page = (await self.query(query, first, fresh=fresh))["data"][field]
+        yield page
+        offset = size
+        while len(page) == size:
+            window = await asyncio.gather(
+                *(
+                    self.query(
+                        query,
+                        {**variables, "limit": size, "offset": offset + i * size},
+                        fresh=fresh,
+                    )
+                    for i in range(self.page_concurrency)
+                )
+            )
+            offset += size * len(window)
+            for data in window:
+                page = data["data"][field]
+                yield page
+                if len(page) < size:
+                    return
+
+    async def iter_prefixes_by_location(
+        self,
+        location_name: str,
+        page_size: int | None = None,
+        fresh: bool = False,
+        fields: Iterable[str] | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield normalized prefixes for a location one page at a time."""
+        selected = _field_selection("prefixes", fields)
+        pages = self.iter_pages(
+            _projected_query(PREFIXES_QUERY, selected),
+            {"name": location_name},
+            "prefixes",
+            page_size,
+            fresh,
+        )
+        normalize = normalizer("prefixes", selected).many
+        async for page in pages:
+            for record in normalize(page):
+                yield record
+
+    async def iter_devices_by_location(
+        self,
+        location_name: str,
+        page_size: int | None = None,
+        fresh: bool = False,
+        fields: Iterable[str] | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield normalized devices for a location one page at a time."""
+        selected = _field_selection("devices", fields)
+        pages = self.iter_pages(
+            _projected_query(DEVICES_QUERY, selected),
+            {"name": location_name},
+            "devices",
+            page_size,
+            fresh,
+        )
+        normalize = normalizer("devices", selected).many
+        async for page in pages:
+            for record in normalize(page):
+                yield record
+
+    async def iter_devices_by_location_and_role(
+        self,
+        location_name: str,
+        role_name: str,
+        page_size: int | None = None,
+        fresh: bool = False,
+        fields: Iterable[str] | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield normalized devices for a location and role one page at a time."""
+        selected = _field_selection("devices", fields)
+        pages = self.iter_pages(
+            _projected_query(DEVICES_BY_LOCATION_AND_ROLE_QUERY, selected),
+            {"location": location_name, "role": role_name},
+            "devices",
+            page_size,
+            fresh,
+        )
+        normalize = normalizer("devices", selected).many
+        async for page in pages:
+            for record in normalize(page):
+                yield record
+
+    async def iter_all_prefixes(
+        self, page_size: int | None = None, fresh: bool = False
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield every normalized prefix one page at a time."""
+        pages = self.iter_pages(ALL_PREFIXES_QUERY, {}, "prefixes", page_size, fresh)
+        async for page in pages:
+            for record in normalizer("prefixes").many(page):
+                yield record
+
+    async def iter_all_devices(
+        self, page_size: int | None = None, fresh: bool = False
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield every normalized device one page at a time."""
+        pages = self.iter_pages(ALL_DEVICES_QUERY, {}, "devices", page_size, fresh)
+        async for page in pages:
+            for record in normalizer("devices").many(page):
+                yield record
+
+    async def get_all_prefixes(self, fresh: bool = False) -> list[dict[str, Any]]:
+        """Get all prefixes."""
+        try:
+            prefixes = [p async for p in self.iter_all_prefixes(fresh=fresh)]
 
             logger.info("Retrieved all prefixes", count=len(prefixes))
             return prefixes
@@ -93,27 +1143,31 @@ class NautobotGraphQLClient:
             logger.error("Failed to get all prefixes", error=str(e))
             raise RuntimeError(f"GraphQL request failed: {e}") from e
 
-    def get_prefixes_by_location(self, location_name: str) -> list[dict[str, Any]]:
+    async def get_all_devices(self, fresh: bool = False) -> list[dict[str, Any]]:
+        """Get all devices."""
+        try:
+            devices = [d async for d in self.iter_all_devices(fresh=fresh)]
+
+            logger.info("Retrieved all devices", count=len(devices))
+            return devices
+        except Exception as e:
+            logger.error("Failed to get all devices", error=str(e))
+            raise RuntimeError(f"GraphQL request failed: {e}") from e
+
+    async def get_prefixes_by_location(
+        self,
+        location_name: str,
+        fresh: bool = False,
+        fields: Iterable[str] | None = None,
+    ) -> list[dict[str, Any]]:
         """Get all prefixes for a given location name."""
         try:
-            data = self.query(PREFIXES_QUERY, {"name": location_name})
-            prefixes_data = data["data"]["prefixes"]
-
-            prefixes = []
-            for prefix in prefixes_data:
-                # Get location names from the locations array
-                location_names = [
-                    loc["name"] for loc in (prefix.get("locations") or [])
-                ]
-
-                prefix_data = {
-                    "prefix": prefix["prefix"],
-                    "status": (prefix["status"] or {}).get("name"),
-                    "role": (prefix["role"] or {}).get("name"),
-                    "description": prefix.get("description"),
-                    "locations": location_names,
-                }
-                prefixes.append(prefix_data)
+            prefixes = [
+                p
+                async for p in self.iter_prefixes_by_location(
+                    location_name, fresh=fresh, fields=fields
+                )
+            ]
 
             logger.info(
                 "Retrieved prefixes by location",
@@ -129,29 +1183,20 @@ class NautobotGraphQLClient:
             )
             raise RuntimeError(f"GraphQL request failed: {e}") from e
 
-    def get_devices_by_location(self, location_name: str) -> list[dict[str, Any]]:
+    async def get_devices_by_location(
+        self,
+        location_name: str,
+        fresh: bool = False,
+        fields: Iterable[str] | None = None,
+    ) -> list[dict[str, Any]]:
         """Get all devices for a given location name."""
         try:
-            data = self.query(DEVICES_QUERY, {"name": location_name})
-            devices_data = data["data"]["devices"]
-
-            devices = []
-            for device in devices_data:
-                device_data = {
-                    "name": device["name"],
-                    "status": (device["status"] or {}).get("name"),
-                    "role": (device["role"] or {}).get("name"),
-                    "device_type": {
-                        "model": (device["device_type"] or {}).get("model"),
-                        "manufacturer": (device["device_type"] or {})
-                        .get("manufacturer", {})
-                        .get("name"),
-                    },
-                    "platform": (device["platform"] or {}).get("name"),
-                    "primary_ip4": (device["primary_ip4"] or {}).get("address"),
-                    "location": (device["location"] or {}).get("name"),
-                }
-                devices.append(device_data)
+            devices = [
+                d
+                async for d in self.iter_devices_by_location(
+                    location_name, fresh=fresh, fields=fields
+                )
+            ]
 
             logger.info(
                 "Retrieved devices by location",
@@ -167,34 +1212,21 @@ class NautobotGraphQLClient:
             )
             raise RuntimeError(f"GraphQL request failed: {e}") from e
 
-    def get_devices_by_location_and_role(
-        self, location_name: str, role_name: str
+    async def get_devices_by_location_and_role(
+        self,
+        location_name: str,
+        role_name: str,
+        fresh: bool = False,
+        fields: Iterable[str] | None = None,
     ) -> list[dict[str, Any]]:
         """Get devices for a given location and role."""
         try:
-            data = self.query(
-                DEVICES_BY_LOCATION_AND_ROLE_QUERY,
-                {"location": location_name, "role": role_name},
-            )
-            devices_data = data["data"]["devices"]
-
-            devices = []
-            for device in devices_data:
-                device_data = {
-                    "name": device["name"],
-                    "status": (device["status"] or {}).get("name"),
-                    "role": (device["role"] or {}).get("name"),
-                    "device_type": {
-                        "model": (device["device_type"] or {}).get("model"),
-                        "manufacturer": (device["device_type"] or {})
-                        .get("manufacturer", {})
-                        .get("name"),
-                    },
-                    "platform": (device["platform"] or {}).get("name"),
-                    "primary_ip4": (device["primary_ip4"] or {}).get("address"),
-                    "location": (device["location"] or {}).get("name"),
-                }
-                devices.append(device_data)
+            devices = [
+                d
+                async for d in self.iter_devices_by_location_and_role(
+                    location_name, role_name, fresh=fresh, fields=fields
+                )
+            ]
 
             logger.info(
                 "Retrieved devices by location and role",
@@ -212,6 +1244,82 @@ class NautobotGraphQLClient:
             )
             raise RuntimeError(f"GraphQL request failed: {e}") from e
 
+    async def get_prefixes_by_locations(
+        self,
+        location_names: list[str],
+        fresh: bool = False,
+        fields: Iterable[str] | None = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Get prefixes for several locations using aliased batch queries."""
+        try:
+            selected = _field_selection("prefixes", fields)
+            normalize = normalizer("prefixes", selected).many
+            batches = _batch_requests(
+                "prefixes", location_names, None, self.max_aliases, selected
+            )
+            results = await asyncio.gather(
+                *(self.query(q, v, fresh=fresh) for _, q, v in batches)
+            )
+            prefixes: dict[str, list[dict[str, Any]]] = {}
+            for (chunk, _, _), result in zip(batches, results, strict=True):
+                for i, name in enumerate(chunk):
+                    prefixes[name] = normalize(result["data"][f"l{i}"])
+
+            logger.info(
+                "Retrieved prefixes by locations",
+                locations=len(prefixes),
+                count=sum(len(v) for v in prefixes.values()),
+            )
+            return prefixes
+        except Exception as e:
+            logger.error(
+                "Failed to get prefixes by locations",
+                locations=location_names,
+                error=str(e),
+            )
+            raise RuntimeError(f"GraphQL request failed: {e}") from e
+
+    async def get_devices_by_locations(
+        self,
+        location_names: list[str],
+        role_names: list[str] | None = None,
+        fresh: bool = False,
+        fields: Iterable[str] | None = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Get devices for several locations, optionally limited to roles."""
+        try:
+            selected = _field_selection("devices", fields)
+            normalize = normalizer("devices", selected).many
+            batches = _batch_requests(
+                "devices", location_names, role_names, self.max_aliases, selected
+            )
+            results = await asyncio.gather(
+                *(self.query(q, v, fresh=fresh) for _, q, v in batches)
+            )
+            devices: dict[str, list[dict[str, Any]]] = {}
+            for (chunk, _, _), result in zip(batches, results, strict=True):
+                for i, name in enumerate(chunk):
+                    devices[name] = normalize(result["data"][f"l{i}"])
+
+            logger.info(
+                "Retrieved devices by locations",
+                locations=len(devices),
+                roles=role_names,
+                count=sum(len(v) for v in devices.values()),
+            )
+            return devices
+        except Exception as e:
+            logger.error(
+                "Failed to get devices by locations",
+                locations=location_names,
+                roles=role_names,
+                error=str(e),
+            )
+            raise RuntimeError(f"GraphQL request failed: {e}") from e
+
 
-# Global client instance
-client = NautobotGraphQLClient()
+# Global client instances share one result cache
+query_cache = QueryCache.from_settings(_settings)
+breaker = CircuitBreaker.from_settings(_settings)
+client = NautobotGraphQLClient(cache=query_cache, breaker=breaker)
+async_client = AsyncNautobotGraphQLClient(cache=query_cache, breaker=breaker)
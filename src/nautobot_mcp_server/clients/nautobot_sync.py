@@ -0,0 +1,132 @@
+"""Full and incremental inventory fetches used to keep local copies current."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+import structlog
+
+from .nautobot_graphql import (
+    ALL_DEVICES_QUERY,
+    ALL_PREFIXES_QUERY,
+    NautobotGraphQLClient,
+    _load_query,
+)
+from .normalizers import normalizer
+
+logger = structlog.get_logger(__name__)
+
+DEVICES_CHANGED_SINCE_QUERY = _load_query("devices_changed_since.graphql")
+PREFIXES_CHANGED_SINCE_QUERY = _load_query("prefixes_changed_since.graphql")
+DELETED_OBJECTS_SINCE_QUERY = _load_query("deleted_objects_since.graphql")
+
+# Object change types that can remove rows from the local inventory
+_TRACKED_TYPES = {("dcim", "device"), ("ipam", "prefix")}
+
+
+@dataclass
+class InventoryDelta:
+    """Objects created, updated or deleted in Nautobot since a watermark."""
+
+    since: float
+    devices: dict[str, dict[str, Any]] = field(default_factory=dict)
+    prefixes: dict[str, dict[str, Any]] = field(default_factory=dict)
+    deleted: set[str] = field(default_factory=set)
+
+    @property
+    def size(self) -> int:
+        return len(self.devices) + len(self.prefixes) + len(self.deleted)
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, UTC).isoformat()
+
+
+def fetch_inventory(
+    client: NautobotGraphQLClient, fresh: bool = True
+) -> tuple[dict[str, dict[str, Any]], dict[str, dict[str, Any]]]:
+    """Fetch every device and prefix keyed by Nautobot object id.
+
+    Without ``fresh`` pages may come from ``client``'s result cache.
+    """
+    device, prefix = normalizer("devices"), normalizer("prefixes")
+    devices = {
+        raw["id"]: device(raw)
+        for page in client.iter_pages(ALL_DEVICES_QUERY, {}, "devices", fresh=fresh)
+        for raw in page
+    }
+    prefixes = {
+        raw["id"]: prefix(raw)
+        for page in client.iter_pages(ALL_PREFIXES_QUERY, {}, "prefixes", fresh=fresh)
+        for raw in page
+    }
+    return devices, prefixes
+
+
+def fetch_inventory_delta(
+    client: NautobotGraphQLClient, since: float
+) -> InventoryDelta:
+    """Fetch objects changed since ``since`` using ``last_updated`` and the changelog.
+
+    Changes to related objects (e.g. renaming a role) do not bump the device's
+    ``last_updated``; periodic full resyncs pick those up.
+    """
+    variables = {"since": _isoformat(since)}
+    delta = InventoryDelta(since=since)
+    device, prefix = normalizer("devices"), normalizer("prefixes")
+    for page in client.iter_pages(
+        DEVICES_CHANGED_SINCE_QUERY, variables, "devices", fresh=True
+    ):
+        for raw in page:
+            delta.devices[raw["id"]] = device(raw)
+    for page in client.iter_pages(
+        PREFIXES_CHANGED_SINCE_QUERY, variables, "prefixes", fresh=True
+    ):
+        for raw in page:
+            delta.prefixes[raw["id"]] = prefix(raw)
+    for page in client.iter_pages(
+        DELETED_OBJECTS_SINCE_QUERY, variables, "object_changes", fresh=True
+    ):
+        for change in page:
+            content_type = change.get("changed_object_type") or {}
+            key = (content_type.get("app_label"), content_type.get("model"))
+            if key in _TRACKED_TYPES:
+                delta.deleted.add(change["changed_object_id"])
+
+    logger.info(
+        "Fetched inventory delta",
+        since=variables["since"],
+        devices=len(delta.devices),
+        prefixes=len(delta.prefixes),
+        deleted=len(delta.deleted),
+    )
+    return delta
+
+
+@dataclass
+class SyncStats:
+    """Counters describing how the local inventory is being kept in sync."""
+
+    full_syncs: int = 0
+    delta_syncs: int = 0
+    failures: int = 0
+    last_delta_size: int = 0
+    last_sync_at: float | None = None
+    fallbacks: dict[str, int] = field(default_factory=dict)
+
+    def record_fallback(self, reason: str) -> None:
+        self.fallbacks[reason] = self.fallbacks.get(reason, 0) + 1
+
+    def as_dict(self) -> dict[str, Any]:
+        lag = time.time() - self.last_sync_at if self.last_sync_at else None
+        return {
+            "full_syncs": self.full_syncs,
+            "delta_syncs": self.delta_syncs,
+            "failures": self.failures,
+            "last_delta_size": self.last_delta_size,
+            "sync_lag_seconds": round(lag, 3) if lag is not None else None,
+            "full_resync_fallbacks": dict(self.fallbacks),
+        }
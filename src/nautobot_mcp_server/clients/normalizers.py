@@ -0,0 +1,142 @@
+"""Compiled normalizers turning raw GraphQL objects into tool records.
+
+Each object type declares its output fields once as paths into the raw
+GraphQL object. For every query shape (object type plus projected fields) a
+normalizer is generated as Python source and compiled a single time, so the
+per-row work is one dict display with inlined null checks instead of a chain
+of ``(x or {}).get(...)`` calls and per-field function dispatch.
+
+Records stay plain dicts: the JSON backends, the columnar encoder and the
+snapshot indexes all consume them directly, with no conversion pass before
+they go into a response envelope. Low-cardinality values (status, role,
+platform, location, ...) are interned, so large result sets share one string
+object per distinct value instead of holding a copy per row.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from functools import cache
+from itertools import count
+from typing import Any
+
+from .. import tracing
+
+Record = dict[str, Any]
+
+
+class Path:
+    """Where an output field's value lives in the raw GraphQL object.
+
+    ``keys`` are followed from the raw object; a ``null`` anywhere along the
+    way yields ``None``. With ``each`` the value is a list of objects and the
+    result is ``each`` taken from every element.
+    """
+
+    __slots__ = ("keys", "intern", "optional", "each")
+
+    def __init__(
+        self,
+        *keys: str,
+        intern: bool = False,
+        optional: bool = False,
+        each: str | None = None,
+    ):
+        self.keys = keys
+        self.intern = intern
+        self.optional = optional
+        self.each = each
+
+
+Spec = dict[str, "Path | Spec"]
+
+# Output field names match the top-level fields of the query templates, which
+# lets callers request a subset and get a minimal selection set.
+DEVICE_FIELDS: Spec = {
+    "name": Path("name"),
+    "status": Path("status", "name", intern=True),
+    "role": Path("role", "name", intern=True),
+    "device_type": {
+        "model": Path("device_type", "model", intern=True),
+        "manufacturer": Path("device_type", "manufacturer", "name", intern=True),
+    },
+    "platform": Path("platform", "name", intern=True),
+    "primary_ip4": Path("primary_ip4", "address"),
+    "location": Path("location", "name", intern=True),
+}
+
+PREFIX_FIELDS: Spec = {
+    "prefix": Path("prefix"),
+    "status": Path("status", "name", intern=True),
+    "role": Path("role", "name", intern=True),
+    "description": Path("description", optional=True),
+    # Get location names from the locations array
+    "locations": Path("locations", optional=True, each="name", intern=True),
+}
+
+FIELDS: dict[str, Spec] = {"devices": DEVICE_FIELDS, "prefixes": PREFIX_FIELDS}
+
+
+def _path_expr(path: Path, names: Iterator[str]) -> str:
+    first, *rest = path.keys
+    expr = f"raw.get({first!r})" if path.optional else f"raw[{first!r}]"
+    for key in rest:
+        var = next(names)
+        expr = f"({var}[{key!r}] if ({var} := {expr}) is not None else None)"
+    if path.each is not None:
+        item = f"_intern(x[{path.each!r}])" if path.intern else f"x[{path.each!r}]"
+        return f"[{item} for x in ({expr} or ())]"
+    if path.intern:
+        var = next(names)
+        expr = f"(_intern({var}) if ({var} := {expr}) is not None else None)"
+    return expr
+
+
+def _record_expr(spec: Spec, fields: Iterable[str], names: Iterator[str]) -> str:
+    items = []
+    for name in fields:
+        field = spec[name]
+        if isinstance(field, Path):
+            expr = _path_expr(field, names)
+        else:
+            expr = _record_expr(field, field, names)
+        items.append(f"{name!r}: {expr}")
+    return "{" + ", ".join(items) + "}"
+
+
+class Normalizer:
+    """Normalizes raw objects of one query shape; build with :func:`normalizer`."""
+
+    __slots__ = ("kind", "fields", "source", "one", "_many")
+
+    def __init__(self, kind: str, fields: tuple[str, ...]):
+        self.kind = kind
+        self.fields = fields
+        names = (f"_v{i}" for i in count())
+        record = _record_expr(FIELDS[kind], fields, names)
+        # Walrus targets inside the comprehension bind in the function scope,
+        # which is fine as every row assigns them before reading them.
+        self.source = (
+            f"def one(raw, _intern=_intern):\n    return {record}\n\n"
+            f"def many(rows, _intern=_intern):\n"
+            f"    return [{record} for raw in rows]\n"
+        )
+        namespace: dict[str, Any] = {"_intern": sys.intern}
+        exec(compile(self.source, f"<normalizer {kind}>", "exec"), namespace)
+        self.one: Callable[[Record], Record] = namespace["one"]
+        self._many: Callable[[list[Record]], list[Record]] = namespace["many"]
+
+    def many(self, rows: list[Record]) -> list[Record]:
+        """Normalize a page of raw objects."""
+        with tracing.span("normalize", kind=self.kind, rows=len(rows)):
+            return self._many(rows)
+
+    def __call__(self, raw: Record) -> Record:
+        return self.one(raw)
+
+
+@cache
+def normalizer(kind: str, fields: tuple[str, ...] | None = None) -> Normalizer:
+    """The normalizer for ``kind`` limited to ``fields`` (``None`` for all)."""
+    return Normalizer(kind, tuple(FIELDS[kind]) if fields is None else fields)
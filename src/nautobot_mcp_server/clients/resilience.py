@@ -0,0 +1,395 @@
+"""Adaptive concurrency limits and a circuit breaker for Nautobot requests.
+
+The limiters bound how many GraphQL requests are in flight and adjust that
+bound AIMD-style: it grows by about one per round trip while requests succeed
+within ``upstream_latency_target`` and halves when they fail or are slow, so
+the server backs off while Nautobot is busy with its own jobs.
+
+The breaker opens after ``breaker_failure_threshold`` consecutive upstream
+failures. While it is open requests fail fast (or are answered from stale
+cache entries) instead of waiting on a struggling Nautobot; after
+``breaker_reset_timeout`` seconds a single probe request is let through, and
+its outcome closes or re-opens the breaker.
+
+:class:`RetryPolicy` retries requests that failed for upstream reasons with
+full-jitter exponential backoff, all within a total ``upstream_deadline``, and
+can hedge: when a request has not answered within the recent p95 latency of
+its query, a duplicate is sent and whichever answers first is used. Every
+query this server sends is a read, so repeating one is safe.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+import structlog
+
+from ..settings import Settings, get_settings
+
+logger = structlog.get_logger(__name__)
+
+
+class UpstreamUnavailableError(RuntimeError):
+    """Nautobot could not serve the request: unreachable, 5xx, 429 or overload."""
+
+
+class CircuitOpenError(UpstreamUnavailableError):
+    """Raised without contacting Nautobot while the circuit breaker is open."""
+
+
+class OverloadedError(UpstreamUnavailableError):
+    """No request slot became free in time; retrying would only add load."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker shared by the sync and async clients.
+
+    A ``failure_threshold`` of ``0`` disables it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_started: float | None = None
+        self.opens = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings | None = None) -> CircuitBreaker:
+        settings = settings or get_settings()
+        return cls(settings.breaker_failure_threshold, settings.breaker_reset_timeout)
+
+    def allow(self) -> bool:
+        """Whether a request may be sent to Nautobot now."""
+        if self.failure_threshold <= 0:
+            return True
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            now = self._clock()
+            if self.state == self.OPEN and now - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_started = None
+            # One probe at a time; a probe that never reported is replaced
+            if self.state == self.HALF_OPEN and (
+                self._probe_started is None
+                or now - self._probe_started >= self.reset_timeout
+            ):
+                self._probe_started = now
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            if self.state != self.CLOSED:
+                logger.info("Nautobot recovered; closing circuit breaker")
+                self.state = self.CLOSED
+                self._probe_started = None
+
+    def record_failure(self) -> None:
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.failures >= self.failure_threshold
+            ):
+                logger.warning(
+                    "Nautobot unavailable; opening circuit breaker",
+                    failures=self.failures,
+                    reset_timeout=self.reset_timeout,
+                )
+                self.state = self.OPEN
+                self.opened_at = self._clock()
+                self._probe_started = None
+                self.opens += 1
+
+    def retry_after(self) -> float:
+        """Seconds until the next probe is allowed (``0`` when closed)."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(self.reset_timeout - (self._clock() - self.opened_at), 0.0)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "open": int(self.state != self.CLOSED),
+                "consecutive_failures": self.failures,
+                "opens": self.opens,
+                "rejected": self.rejected,
+            }
+
+
+class _AIMD:
+    """Additive-increase/multiplicative-decrease concurrency limit."""
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        latency_target: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.minimum = max(minimum, 1)
+        self.maximum = max(maximum, self.minimum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.latency_target = latency_target
+        self._clock = clock
+        self._last_decrease = float("-inf")
+        self.active = 0
+        self.rejected = 0
+        self.decreases = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings | None = None) -> Any:
+        settings = settings or get_settings()
+        return cls(
+            settings.upstream_concurrency_initial,
+            settings.upstream_concurrency_min,
+            settings.upstream_concurrency_max,
+            settings.upstream_latency_target,
+        )
+
+    def _has_room(self) -> bool:
+        return self.active < int(self.limit)
+
+    def _adjust(self, latency: float | None, ok: bool) -> None:
+        if latency is None:
+            return
+        if ok and latency <= self.latency_target:
+            # Only grow while the limit is actually what holds requests back
+            if self.active >= int(self.limit):
+                self.limit = min(self.limit + 1 / self.limit, float(self.maximum))
+            return
+        # One decrease per latency window, so a burst of failures from the
+        # same overload episode does not collapse the limit to the minimum
+        now = self._clock()
+        if now - self._last_decrease >= self.latency_target:
+            self._last_decrease = now
+            self.limit = max(self.limit / 2, float(self.minimum))
+            self.decreases += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "limit": round(self.limit, 2),
+            "active": self.active,
+            "rejected": self.rejected,
+            "decreases": self.decreases,
+        }
+
+
+class AdaptiveLimiter(_AIMD):
+    """Thread-safe AIMD limiter for the sync client."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout: float) -> bool:
+        """Take a slot, waiting up to ``timeout`` seconds; ``False`` if none."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while not self._has_room():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    if self._has_room():
+                        break
+                    self.rejected += 1
+                    return False
+            self.active += 1
+            return True
+
+    def release(self, latency: float | None, ok: bool) -> None:
+        """Free a slot; ``latency`` of ``None`` gives no signal to the limit."""
+        with self._cond:
+            self._adjust(latency, ok)
+            self.active -= 1
+            self._cond.notify_all()
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            return super().stats()
+
+
+class AsyncAdaptiveLimiter(_AIMD):
+    """AIMD limiter for the async client, usable from any event loop."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    async def acquire(self, timeout: float) -> bool:
+        """Take a slot, waiting up to ``timeout`` seconds; ``False`` if none."""
+        if self._has_room() and not self._waiters:
+            self.active += 1
+            return True
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            async with asyncio.timeout(timeout):
+                await waiter
+            return True
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # Granted as we timed out or were cancelled; hand the slot on
+                self.active -= 1
+                self._wake()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(e, TimeoutError):
+                self.rejected += 1
+                return False
+            raise
+
+    def release(self, latency: float | None, ok: bool) -> None:
+        """Free a slot; ``latency`` of ``None`` gives no signal to the limit."""
+        self._adjust(latency, ok)
+        self.active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._has_room():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.active += 1
+                waiter.set_result(None)
+
+
+class RetryPolicy:
+    """Retry, deadline and hedging parameters plus recent latencies per query.
+
+    ``retries`` is the number of extra attempts after the first. A hedge is
+    only sent once ``min_samples`` latencies have been seen for the query.
+    """
+
+    def __init__(
+        self,
+        retries: int = 2,
+        attempt_timeout: float = 10.0,
+        deadline: float = 30.0,
+        backoff_base: float = 0.1,
+        backoff_max: float = 2.0,
+        hedge: bool = False,
+        hedge_min_delay: float = 0.05,
+        window: int = 200,
+        min_samples: int = 20,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.retries = max(retries, 0)
+        self.attempt_timeout = attempt_timeout
+        self.deadline = deadline
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+        self.window = window
+        self.min_samples = min_samples
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._latencies: dict[str, deque[float]] = {}
+        self.retried = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.deadline_exceeded = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings | None = None) -> RetryPolicy:
+        settings = settings or get_settings()
+        return cls(
+            retries=settings.upstream_retries,
+            attempt_timeout=settings.upstream_attempt_timeout,
+            deadline=settings.upstream_deadline,
+            backoff_base=settings.upstream_backoff_base,
+            backoff_max=settings.upstream_backoff_max,
+            hedge=settings.upstream_hedge,
+            hedge_min_delay=settings.upstream_hedge_min_delay,
+        )
+
+    def start(self) -> float:
+        """The deadline for a request starting now."""
+        return self._clock() + self.deadline
+
+    def remaining(self, deadline: float) -> float:
+        return deadline - self._clock()
+
+    def timeout(self, deadline: float) -> float:
+        """Timeout for one attempt: the per-attempt limit or what is left."""
+        remaining = self.remaining(deadline)
+        if remaining <= 0:
+            self.deadline_exceeded += 1
+            raise UpstreamUnavailableError(
+                f"GraphQL request failed: deadline of {self.deadline:g}s exceeded"
+            )
+        return min(self.attempt_timeout, remaining)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number ``attempt`` (from 1)."""
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    def next_delay(
+        self, attempt: int, error: Exception, deadline: float
+    ) -> float | None:
+        """Seconds to sleep before retry ``attempt``, or ``None`` to give up."""
+        if attempt > self.retries or isinstance(
+            error, OverloadedError | CircuitOpenError
+        ):
+            return None
+        delay = self.backoff(attempt)
+        if self.remaining(deadline) <= delay:
+            self.deadline_exceeded += 1
+            return None
+        self.retried += 1
+        return delay
+
+    def observe(self, name: str, latency: float) -> None:
+        """Record the latency of a successful request."""
+        with self._lock:
+            window = self._latencies.get(name)
+            if window is None:
+                window = self._latencies[name] = deque(maxlen=self.window)
+            window.append(latency)
+
+    def hedge_delay(self, name: str) -> float | None:
+        """p95 latency of ``name`` (at least ``hedge_min_delay``), or ``None``."""
+        if not self.hedge:
+            return None
+        with self._lock:
+            window = self._latencies.get(name)
+            if window is None or len(window) < self.min_samples:
+                return None
+            ordered = sorted(window)
+        p95 = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+        return max(p95, self.hedge_min_delay)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "retries": self.retried,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "deadline_exceeded": self.deadline_exceeded,
+        }
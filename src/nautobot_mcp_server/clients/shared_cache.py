@@ -0,0 +1,290 @@
+"""SQLite result cache tier shared by worker processes and kept across restarts.
+
+Each worker keeps its in-memory :class:`~.cache.QueryCache` and falls back to
+this tier on a miss, so a result fetched from Nautobot by one worker serves
+all of them. The database runs in WAL mode: readers do not block the writer,
+and every process and thread uses its own connection.
+
+With ``CACHE_DIR`` the file outlives the process: a restarted server answers
+from it straight away, and :meth:`SharedCache.entries` lets the memory tier
+preload the freshest results. Once the file grows past ``max_bytes`` the
+entries closest to the end of their stale window are dropped first.
+
+Leases (:meth:`SharedCache.acquire`) let one worker run background jobs
+such as the hot location prefetch while the others read its results.
+
+Expiry times are wall-clock (monotonic clocks are per process) and values are
+the JSON bytes received from Nautobot, so nothing is re-encoded on a write.
+Errors from the database are logged and treated as misses; the shared tier
+never fails a query.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from ..settings import Settings, get_settings
+
+logger = structlog.get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key_hash BLOB PRIMARY KEY,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    stale_until REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+_LEASES = """
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+# Bumped when the table layout or the meaning of stored values changes;
+# a file with another version is emptied instead of misread
+_SCHEMA_VERSION = 1
+
+# Expired rows are purged, and the size recounted, every this many writes
+_PURGE_EVERY = 256
+
+FILENAME = "results.sqlite"
+
+
+class SharedCache:
+    """TTL cache of raw query results in a SQLite file."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        clock: Callable[[], float] = time.time,
+        timeout: float = 5.0,
+        max_bytes: int = 0,
+    ):
+        self.path = str(path)
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.evictions = 0
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        db = self._db()
+        # One write transaction, so workers starting together neither drop
+        # each other's tables nor see a half-upgraded file
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            if db.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+                db.execute("DROP TABLE IF EXISTS results")
+                db.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            db.execute(_SCHEMA)
+            db.execute(_LEASES)
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+        # Approximate size of the file's entries, recounted now and then
+        self._bytes = self._total_bytes()
+
+    @classmethod
+    def from_settings(cls, settings: Settings | None = None) -> SharedCache | None:
+        """The configured shared tier, or ``None`` when there is none.
+
+        ``cache_shared_path`` wins over a file in ``cache_dir``.
+        """
+        settings = settings or get_settings()
+        if not settings.cache_enabled:
+            return None
+        path = settings.cache_shared_path
+        if not path and settings.cache_dir:
+            path = str(Path(settings.cache_dir) / FILENAME)
+        if not path:
+            return None
+        return cls(path, max_bytes=settings.cache_disk_max_bytes)
+
+    def _db(self) -> sqlite3.Connection:
+        db: sqlite3.Connection | None = getattr(self._local, "db", None)
+        if db is None:
+            # Autocommit: every statement is its own short transaction
+            db = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    @staticmethod
+    def _hash(key: str) -> bytes:
+        return hashlib.sha256(key.encode("utf-8")).digest()
+
+    def get(self, key: str, stale: bool = False) -> tuple[bytes, float] | None:
+        """Raw value for ``key`` and its remaining TTL, or ``None`` on a miss.
+
+        With ``stale`` an expired value is returned while within its stale
+        window (its remaining TTL is then ``0``).
+        """
+        try:
+            row = (
+                self._db()
+                .execute(
+                    "SELECT value, expires_at, stale_until FROM results"
+                    " WHERE key_hash = ?",
+                    (self._hash(key),),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            self._failed("read", e)
+            return None
+        now = self._clock()
+        if row is None or not (row[1] > now or (stale and row[2] > now)):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return bytes(row[0]), max(row[1] - now, 0.0)
+
+    def set(self, key: str, value: bytes, ttl: float, stale_ttl: float = 0.0) -> None:
+        """Store ``value`` for ``ttl`` seconds plus ``stale_ttl`` as stale."""
+        expires_at = self._clock() + ttl
+        try:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    self._hash(key),
+                    key,
+                    value,
+                    len(value),
+                    expires_at,
+                    expires_at + stale_ttl,
+                ),
+            )
+            with self._lock:
+                self._writes += 1
+                self._bytes += len(value)
+                recount = self._writes % _PURGE_EVERY == 0 or (
+                    self.max_bytes > 0 and self._bytes > self.max_bytes
+                )
+            if recount:
+                self._trim(db)
+        except sqlite3.Error as e:
+            self._failed("write", e)
+
+    def _trim(self, db: sqlite3.Connection) -> None:
+        """Purge expired rows, then evict down to ``max_bytes``."""
+        db.execute("DELETE FROM results WHERE stale_until <= ?", (self._clock(),))
+        if self.max_bytes > 0 and self._total_bytes() > self.max_bytes:
+            # Keep the rows that stay usable longest while they fit the budget
+            evicted = db.execute(
+                "DELETE FROM results WHERE key_hash IN ("
+                " SELECT key_hash FROM ("
+                "  SELECT key_hash,"
+                "   SUM(size) OVER (ORDER BY stale_until DESC, key_hash) AS kept"
+                "  FROM results)"
+                " WHERE kept > ?)",
+                (self.max_bytes,),
+            ).rowcount
+            with self._lock:
+                self.evictions += evicted
+        with self._lock:
+            self._bytes = self._total_bytes()
+
+    def _total_bytes(self) -> int:
+        row = self._db().execute("SELECT COALESCE(SUM(size), 0) FROM results")
+        return int(row.fetchone()[0])
+
+    def entries(self) -> Iterator[tuple[str, bytes, float]]:
+        """Unexpired ``(key, raw value, remaining TTL)``, longest-lived first."""
+        now = self._clock()
+        try:
+            rows = self._db().execute(
+                "SELECT key, value, expires_at FROM results WHERE expires_at > ?"
+                " ORDER BY expires_at DESC",
+                (now,),
+            )
+            for key, value, expires_at in rows:
+                yield key, bytes(value), expires_at - now
+        except sqlite3.Error as e:
+            self._failed("read", e)
+
+    def invalidate(self, predicate: Callable[[str], bool] | None = None) -> int:
+        """Drop entries whose key matches ``predicate`` (all when omitted)."""
+        try:
+            db = self._db()
+            if predicate is None:
+                return db.execute("DELETE FROM results").rowcount
+            db.create_function("matches", 1, predicate, deterministic=True)
+            return db.execute("DELETE FROM results WHERE matches(key)").rowcount
+        except sqlite3.Error as e:
+            self._failed("invalidate", e)
+            return 0
+
+    def acquire(self, name: str, owner: str, ttl: float) -> bool:
+        """Take or renew lease ``name`` for ``ttl`` seconds.
+
+        ``False`` while another owner holds an unexpired lease. Database
+        errors grant the lease, so a broken file duplicates work rather than
+        stopping it.
+        """
+        now = self._clock()
+        try:
+            db = self._db()
+            db.execute(
+                "INSERT INTO leases VALUES (?, ?, ?) ON CONFLICT(name) DO UPDATE"
+                " SET owner = excluded.owner, expires_at = excluded.expires_at"
+                " WHERE leases.owner = excluded.owner OR leases.expires_at <= ?",
+                (name, owner, now + ttl, now),
+            )
+            row = db.execute(
+                "SELECT owner FROM leases WHERE name = ?", (name,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            self._failed("lease", e)
+            return True
+        return row is not None and row[0] == owner
+
+    def release(self, name: str, owner: str) -> None:
+        """Give up lease ``name`` if ``owner`` holds it."""
+        try:
+            self._db().execute(
+                "DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner)
+            )
+        except sqlite3.Error as e:
+            self._failed("lease", e)
+
+    def _failed(self, operation: str, e: sqlite3.Error) -> None:
+        self.errors += 1
+        logger.warning("Shared cache error", operation=operation, error=str(e))
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+    def stats(self) -> dict[str, Any]:
+        """Counters and the tracked size; runs no query, so scrapes stay cheap."""
+        return {
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
@@ -0,0 +1,136 @@
+"""Optional compact encodings for tool results."""
+
+from __future__ import annotations
+
+from typing import Any
+
+COLUMNAR = "columnar"
+
+Record = dict[str, Any]
+
+
+def _columns(rows: list[Record], prefix: str = "") -> list[tuple[str, list[Any]]]:
+    """Split records into ``(name, values)`` columns, nested dicts as dotted names.
+
+    Works column by column so the per-cell work stays in list comprehensions.
+    """
+    keys = dict.fromkeys(rows[0]) if rows else {}
+    keys.update(dict.fromkeys(set().union(*rows)))
+    columns: list[tuple[str, list[Any]]] = []
+    for key in keys:
+        values = [row.get(key) for row in rows]
+        if any(isinstance(v, dict) for v in values):
+            children = [v if isinstance(v, dict) else {} for v in values]
+            columns.extend(_columns(children, f"{prefix}{key}."))
+        else:
+            columns.append((f"{prefix}{key}", values))
+    return columns
+
+
+def _unflatten(record: Record) -> Record:
+    out: Record = {}
+    for key, value in record.items():
+        target = out
+        *parents, leaf = key.split(".")
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[leaf] = value
+    return out
+
+
+def _dictionary_encode(values: list[Any]) -> tuple[list[str], list[Any]] | None:
+    """Replace strings (or lists of strings) with indexes into a dictionary.
+
+    Returns ``None`` if the column holds other types or its strings rarely
+    repeat, in which case a dictionary would not make the output smaller.
+    """
+    try:
+        distinct = dict.fromkeys(values)
+    except TypeError:
+        return _dictionary_encode_lists(values)
+    distinct.pop(None, None)
+    total = len(values) - values.count(None)
+    if not distinct or len(distinct) * 2 > total:
+        return None
+    if not all(isinstance(v, str) for v in distinct):
+        return None
+    codes: dict[Any, Any] = {v: i for i, v in enumerate(distinct)}
+    codes[None] = None
+    return list(distinct), list(map(codes.__getitem__, values))
+
+
+def _dictionary_encode_lists(
+    values: list[Any],
+) -> tuple[list[str], list[Any]] | None:
+    index: dict[str, int] = {}
+    codes: list[Any] = []
+    total = 0
+    for value in values:
+        if value is None:
+            codes.append(None)
+        elif isinstance(value, list) and all(isinstance(v, str) for v in value):
+            total += len(value)
+            codes.append([index.setdefault(v, len(index)) for v in value])
+        else:
+            return None
+    if not index or len(index) * 2 > total:
+        return None
+    return list(index), codes
+
+
+def to_columnar(rows: list[Record]) -> dict[str, Any]:
+    """Encode records as column names plus row arrays.
+
+    Nested objects become dotted columns and repetitive string columns are
+    dictionary-encoded: their cells hold indexes into ``dictionaries[column]``.
+    """
+    columns = _columns(rows)
+    dictionaries: dict[str, list[str]] = {}
+    encoded: list[list[Any]] = []
+    for name, values in columns:
+        dictionary = _dictionary_encode(values)
+        if dictionary is not None:
+            dictionaries[name], values = dictionary
+        encoded.append(values)
+    return {
+        "format": COLUMNAR,
+        "columns": [name for name, _ in columns],
+        "dictionaries": dictionaries,
+        "rows": list(map(list, zip(*encoded, strict=True))),
+    }
+
+
+def from_columnar(table: dict[str, Any]) -> list[Record]:
+    """Decode a :func:`to_columnar` table back into records."""
+    columns = table["columns"]
+    dictionaries = table.get("dictionaries", {})
+    lookups = [dictionaries.get(name) for name in columns]
+    records = []
+    for row in table["rows"]:
+        record = {}
+        for name, lookup, value in zip(columns, lookups, row, strict=True):
+            if lookup is not None and value is not None:
+                value = (
+                    [lookup[v] for v in value]
+                    if isinstance(value, list)
+                    else lookup[value]
+                )
+            record[name] = value
+        records.append(_unflatten(record))
+    return records
+
+
+def encode_result(result: dict[str, Any], format: str | None) -> dict[str, Any]:
+    """Re-encode a successful tool result's ``data`` in the requested format.
+
+    ``data`` may be a list of records or a mapping of names to record lists (as
+    returned by the batch tools). Unknown formats leave the result unchanged.
+    """
+    if format != COLUMNAR or not result.get("success"):
+        return result
+    data = result.get("data")
+    if isinstance(data, list):
+        result["data"] = to_columnar(data)
+    elif isinstance(data, dict):
+        result["data"] = {name: to_columnar(rows) for name, rows in data.items()}
+    return result
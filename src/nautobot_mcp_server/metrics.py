@@ -0,0 +1,264 @@
+"""Prometheus metrics for tool calls, Nautobot round trips and internal state.
+
+Histograms and counters are updated on the hot paths; caches, connection
+pools, single-flight groups and the snapshot are read only when ``/metrics``
+is scraped, through stats callables registered with :func:`register_stats`.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+import mcp.types as mcp_types
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from fastmcp.tools.tool import ToolResult
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    ProcessCollector,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
+
+from .settings import get_settings
+
+PREFIX = "nautobot_mcp"
+
+# A private registry keeps the output to this server's metrics and lets tests
+# import the module repeatedly without duplicate registration errors.
+registry = CollectorRegistry()
+ProcessCollector(registry=registry)
+
+enabled = get_settings().metrics_enabled
+
+_BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+_ROWS_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+
+TOOL_CALLS = Counter(
+    f"{PREFIX}_tool_calls_total",
+    "Tool invocations by outcome (ok, error result, exception, or busy)",
+    ["tool", "transport", "outcome"],
+    registry=registry,
+)
+TOOL_DURATION = Histogram(
+    f"{PREFIX}_tool_duration_seconds",
+    "Tool invocation latency",
+    ["tool", "transport"],
+    registry=registry,
+)
+TOOL_RESPONSE_BYTES = Histogram(
+    f"{PREFIX}_tool_response_bytes",
+    "Encoded tool response size (text length for MCP calls)",
+    ["tool", "transport"],
+    buckets=_BYTES_BUCKETS,
+    registry=registry,
+)
+TOOL_RESULT_ROWS = Histogram(
+    f"{PREFIX}_tool_result_rows",
+    "Records returned per tool call",
+    ["tool", "transport"],
+    buckets=_ROWS_BUCKETS,
+    registry=registry,
+)
+TOOLS_IN_FLIGHT = Gauge(
+    f"{PREFIX}_tools_in_flight",
+    "Tool calls currently executing",
+    ["transport"],
+    registry=registry,
+)
+TOOL_QUEUE_WAIT = Histogram(
+    f"{PREFIX}_tool_queue_wait_seconds",
+    "Time tool calls waited for a concurrency slot (queued calls only)",
+    ["tool"],
+    registry=registry,
+)
+
+UPSTREAM_REQUESTS = Counter(
+    f"{PREFIX}_upstream_requests_total",
+    "Nautobot GraphQL requests by query and outcome",
+    ["query", "client", "outcome"],
+    registry=registry,
+)
+UPSTREAM_DURATION = Histogram(
+    f"{PREFIX}_upstream_duration_seconds",
+    "Nautobot GraphQL round-trip latency",
+    ["query", "client"],
+    registry=registry,
+)
+UPSTREAM_RESPONSE_BYTES = Histogram(
+    f"{PREFIX}_upstream_response_bytes",
+    "Nautobot GraphQL response size",
+    ["query", "client"],
+    buckets=_BYTES_BUCKETS,
+    registry=registry,
+)
+UPSTREAM_IN_FLIGHT = Gauge(
+    f"{PREFIX}_upstream_in_flight",
+    "Nautobot GraphQL requests currently in flight",
+    ["client"],
+    registry=registry,
+)
+
+
+class ToolTimer:
+    """Times one tool call; call :meth:`done` with its response envelope."""
+
+    __slots__ = ("tool", "transport", "started")
+
+    def __init__(self, tool: str, transport: str):
+        self.tool = tool
+        self.transport = transport
+        self.started = time.perf_counter()
+        if enabled:
+            TOOLS_IN_FLIGHT.labels(transport).inc()
+
+    def done(
+        self,
+        result: Any = None,
+        size: int | None = None,
+        failed: bool = False,
+        outcome: str | None = None,
+    ) -> None:
+        if not enabled:
+            return
+        tool, transport = self.tool, self.transport
+        TOOLS_IN_FLIGHT.labels(transport).dec()
+        if outcome is not None:
+            pass
+        elif failed:
+            outcome = "exception"
+        elif isinstance(result, dict) and result.get("success") is False:
+            outcome = "error"
+        else:
+            outcome = "ok"
+        TOOL_CALLS.labels(tool, transport, outcome).inc()
+        TOOL_DURATION.labels(tool, transport).observe(
+            time.perf_counter() - self.started
+        )
+        if size is not None:
+            TOOL_RESPONSE_BYTES.labels(tool, transport).observe(size)
+        if isinstance(result, dict) and isinstance(result.get("count"), int):
+            TOOL_RESULT_ROWS.labels(tool, transport).observe(result["count"])
+
+
+class ToolMetricsMiddleware(Middleware):
+    """Records tool calls made over the MCP transport."""
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[mcp_types.CallToolRequestParams],
+        call_next: CallNext[mcp_types.CallToolRequestParams, ToolResult],
+    ) -> ToolResult:
+        timer = ToolTimer(context.message.name, "mcp")
+        try:
+            result = await call_next(context)
+        except Exception:
+            timer.done(failed=True)
+            raise
+        # Text length stands in for the encoded size; MCP encodes it later
+        size = sum(len(getattr(block, "text", "")) for block in result.content)
+        timer.done(result.structured_content, size)
+        return result
+
+
+def observe_queue_wait(tool: str, seconds: float) -> None:
+    if enabled:
+        TOOL_QUEUE_WAIT.labels(tool).observe(seconds)
+
+
+class UpstreamTimer:
+    """Times one upstream request; call :meth:`done` with the outcome."""
+
+    __slots__ = ("query", "client", "started")
+
+    def __init__(self, query: str, client: str):
+        self.query = query
+        self.client = client
+        self.started = time.perf_counter()
+        if enabled:
+            UPSTREAM_IN_FLIGHT.labels(client).inc()
+
+    def done(self, outcome: str, size: int | None = None) -> None:
+        if not enabled:
+            return
+        UPSTREAM_IN_FLIGHT.labels(self.client).dec()
+        UPSTREAM_REQUESTS.labels(self.query, self.client, outcome).inc()
+        UPSTREAM_DURATION.labels(self.query, self.client).observe(
+            time.perf_counter() - self.started
+        )
+        if size is not None:
+            UPSTREAM_RESPONSE_BYTES.labels(self.query, self.client).observe(size)
+
+
+StatsSource = tuple[Callable[[], dict[str, Any]], frozenset[str], dict[str, str]]
+
+
+class StatsCollector(Collector):
+    """Exposes registered ``stats()`` dicts as gauges and counters on scrape.
+
+    Each numeric entry ``key`` of source ``name`` becomes the metric
+    ``nautobot_mcp_<name>_<key>``; keys listed as counters get a ``_total``
+    suffix. Sources sharing a name must use the same label names.
+    """
+
+    def __init__(self) -> None:
+        self.sources: dict[tuple[str, tuple[tuple[str, str], ...]], StatsSource] = {}
+
+    def register(
+        self,
+        name: str,
+        stats: Callable[[], dict[str, Any]],
+        counters: Iterable[str] = (),
+        labels: dict[str, str] | None = None,
+    ) -> None:
+        labels = dict(labels or {})
+        self.sources[(name, tuple(sorted(labels.items())))] = (
+            stats,
+            frozenset(counters),
+            labels,
+        )
+
+    def collect(self) -> Iterator[Metric]:
+        families: dict[str, GaugeMetricFamily | CounterMetricFamily] = {}
+        for (name, _), (stats, counters, labels) in list(self.sources.items()):
+            try:
+                values = stats()
+            except Exception:
+                continue
+            for key, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, int | float):
+                    continue
+                metric = f"{PREFIX}_{name}_{key}"
+                family = families.get(metric)
+                if family is None:
+                    kind = CounterMetricFamily if key in counters else GaugeMetricFamily
+                    family = families[metric] = kind(
+                        metric, f"{name} {key}", labels=list(labels)
+                    )
+                family.add_metric(list(labels.values()), value)
+        yield from families.values()
+
+
+collector = StatsCollector()
+registry.register(collector)
+
+
+def register_stats(
+    name: str,
+    stats: Callable[[], dict[str, Any]],
+    counters: Iterable[str] = (),
+    labels: dict[str, str] | None = None,
+) -> None:
+    """Expose ``stats()`` under ``nautobot_mcp_<name>_*`` on every scrape."""
+    collector.register(name, stats, counters, labels)
+
+
+def render() -> tuple[bytes, str]:
+    """Metrics in the Prometheus text format and its content type."""
+    return generate_latest(registry), CONTENT_TYPE_LATEST
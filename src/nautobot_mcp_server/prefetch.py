@@ -0,0 +1,233 @@
+"""Background prefetch of hot locations into the result cache.
+
+Agents mostly ask about a handful of sites. The prefetcher runs the queries
+behind ``get_devices_by_location``, ``get_devices_by_location_and_role`` and
+``get_prefixes_by_location_enhanced`` for the configured ``prefetch_locations`` (and
+``prefetch_roles``) at startup, then again every ``prefetch_interval``
+seconds, so those questions are answered from the cache instead of waiting
+on Nautobot.
+
+At most ``prefetch_concurrency`` queries run at once and each waits a random
+delay of up to ``prefetch_jitter`` seconds first, so a round does not land on
+Nautobot all at once. The first round is served from the cache where it can
+(after a warm restart nothing is fetched); later rounds always refresh from
+Nautobot so entries are renewed before their TTL runs out. Keep the interval
+below the ``CACHE_TTLS`` of those queries.
+
+With a shared cache tier (multi-worker mode or ``CACHE_DIR``) one process
+holds the ``prefetch`` lease and runs the rounds; the others serve its
+results from the shared tier and take over if its lease lapses.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any
+
+import structlog
+
+from . import aliases
+from .clients import nautobot_graphql as nb
+from .clients.shared_cache import SharedCache
+from .settings import get_settings
+
+logger = structlog.get_logger(__name__)
+
+WARMING = "warming"
+READY = "ready"
+
+LEASE = "prefetch"
+
+
+class Prefetcher:
+    """Periodically loads the results for hot locations into the cache."""
+
+    def __init__(
+        self,
+        locations: list[str] | None = None,
+        roles: list[str] | None = None,
+        interval: float | None = None,
+        concurrency: int | None = None,
+        jitter: float | None = None,
+        shared: SharedCache | None = None,
+    ):
+        settings = get_settings()
+        self.locations = settings.prefetch_locations if locations is None else locations
+        self.roles = settings.prefetch_roles if roles is None else roles
+        self.interval = settings.prefetch_interval if interval is None else interval
+        self.concurrency = max(
+            settings.prefetch_concurrency if concurrency is None else concurrency, 1
+        )
+        self.jitter = settings.prefetch_jitter if jitter is None else jitter
+        self.shared = nb.query_cache.shared if shared is None else shared
+        # A round must start before the lease lapses, or another worker takes over
+        self.lease_ttl = max(self.interval * 3, 60.0)
+        self.leader: bool | None = None
+        self.rounds = 0
+        self.fetches = 0
+        self.failures = 0
+        self.last_round_seconds: float | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.locations)
+
+    @property
+    def status(self) -> str:
+        """``warming`` until the first round has finished, then ``ready``.
+
+        Workers that do not hold the lease are ready once they know it.
+        """
+        if self.rounds or not self.enabled or self.leader is False:
+            return READY
+        return WARMING
+
+    @property
+    def owner(self) -> str:
+        return str(os.getpid())
+
+    def lead(self) -> bool:
+        """Whether this process should run the next round."""
+        if self.shared is not None:
+            self.leader = self.shared.acquire(LEASE, self.owner, self.lease_ttl)
+        else:
+            self.leader = True
+        return self.leader
+
+    def jobs(self, fresh: bool) -> list[tuple[str, Callable[[], Any]]]:
+        """``(description, call)`` for every query of a round.
+
+        Names are resolved like tool arguments, so aliases work; unknown
+        names are logged and skipped.
+        """
+        jobs: list[tuple[str, Callable[[], Any]]] = []
+        roles = self._resolve("role", self.roles)
+        for location in self._resolve("location", self.locations):
+            jobs.append(
+                (
+                    f"devices {location}",
+                    partial(nb.client.get_devices_by_location, location, fresh=fresh),
+                )
+            )
+            jobs.append(
+                (
+                    f"prefixes {location}",
+                    partial(nb.client.get_prefixes_by_location, location, fresh=fresh),
+                )
+            )
+            for role in roles:
+                jobs.append(
+                    (
+                        f"devices {location}/{role}",
+                        partial(
+                            nb.client.get_devices_by_location_and_role,
+                            location,
+                            role,
+                            fresh=fresh,
+                        ),
+                    )
+                )
+        return jobs
+
+    def _resolve(self, kind: str, names: list[str]) -> list[str]:
+        resolved = []
+        for name in names:
+            try:
+                resolved.append(aliases.resolver.resolve_name(kind, name))
+            except aliases.UnknownNameError as e:
+                logger.warning("Skipping unknown prefetch name", error=str(e))
+        return list(dict.fromkeys(resolved))
+
+    def run_once(self, fresh: bool = False) -> int:
+        """Run one round; return how many queries succeeded.
+
+        A round counts as done even when queries fail, so a Nautobot outage
+        does not hold the server in ``warming``.
+        """
+        started = time.perf_counter()
+        outcomes: list[bool] = []
+        try:
+            jobs = self.jobs(fresh)
+            with ThreadPoolExecutor(
+                max_workers=self.concurrency, thread_name_prefix="prefetch"
+            ) as pool:
+                outcomes = list(pool.map(self._fetch, jobs))
+        finally:
+            ok = sum(outcomes)
+            self.fetches += ok
+            self.failures += len(outcomes) - ok
+            self.rounds += 1
+            self.last_round_seconds = time.perf_counter() - started
+        logger.info(
+            "Prefetched hot locations",
+            queries=len(outcomes),
+            failed=len(outcomes) - ok,
+            seconds=round(self.last_round_seconds, 3),
+        )
+        return ok
+
+    def _fetch(self, job: tuple[str, Callable[[], Any]]) -> bool:
+        description, call = job
+        # Spread the round out; a stop request cuts the wait short
+        if self.jitter > 0 and self._stop.wait(random.uniform(0, self.jitter)):
+            return False
+        try:
+            call()
+        except Exception as e:
+            logger.warning("Prefetch failed", query=description, error=str(e))
+            return False
+        return True
+
+    def start(self) -> None:
+        """Start the background prefetch thread when locations are configured."""
+        if self._thread is not None or not self.enabled:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="prefetch", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self.leader and self.shared is not None:
+            self.shared.release(LEASE, self.owner)
+
+    def _run(self) -> None:
+        # A new leader's first round reads the shared tier its predecessor filled
+        fresh = False
+        while not self._stop.is_set():
+            if self.lead():
+                try:
+                    self.run_once(fresh=fresh)
+                except Exception as e:
+                    self.failures += 1
+                    logger.error("Prefetch round failed", error=str(e))
+                fresh = True
+            else:
+                fresh = False
+            self._stop.wait(self.interval)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "status": self.status,
+            "ready": int(self.status == READY),
+            "leader": None if self.leader is None else int(self.leader),
+            "locations": len(self.locations),
+            "rounds": self.rounds,
+            "fetches": self.fetches,
+            "failures": self.failures,
+            "last_round_seconds": self.last_round_seconds,
+        }
+
+
+prefetcher = Prefetcher()
@@ -0,0 +1,300 @@
+"""Patricia trie over IPv4/IPv6 prefixes for longest-prefix-match lookups."""
+
+from __future__ import annotations
+
+import ipaddress
+import socket
+import threading
+import time
+from collections.abc import Hashable, Iterable, Iterator
+from typing import Any
+
+from .settings import get_settings
+
+Record = dict[str, Any]
+
+
+class _Node:
+    """A trie node; ``records`` is ``None`` for branch-only nodes."""
+
+    __slots__ = ("key", "length", "children", "records")
+
+    def __init__(self, key: int, length: int, records: list[Record] | None = None):
+        self.key = key
+        self.length = length
+        self.children: list[_Node | None] = [None, None]
+        self.records = records
+
+
+class _Trie:
+    """Path-compressed binary trie for one address family.
+
+    Keys are network addresses as integers; a node at ``length`` covers every
+    address whose top ``length`` bits equal its key. Lookups walk at most one
+    node per distinct prefix length on the path (<= 33 or 129 nodes).
+    """
+
+    def __init__(self, bits: int):
+        self.bits = bits
+        self.root = _Node(0, 0)
+        self.size = 0
+
+    def _bit(self, key: int, position: int) -> int:
+        return (key >> (self.bits - 1 - position)) & 1
+
+    def _common(self, a: int, b: int, limit: int) -> int:
+        return min(limit, self.bits - (a ^ b).bit_length())
+
+    def _matches(self, node: _Node, key: int) -> bool:
+        return (node.key ^ key) >> (self.bits - node.length) == 0
+
+    def covers(self, node: _Node, key: int, length: int) -> bool:
+        return node.length <= length and self._matches(node, key)
+
+    def insert(
+        self,
+        key: int,
+        length: int,
+        record: Record,
+        start: _Node | None = None,
+        trail: list[_Node] | None = None,
+    ) -> None:
+        """Insert a record, descending from ``start`` (which must cover the key).
+
+        Nodes visited or created below ``start`` are appended to ``trail``.
+        """
+        # Bit helpers are inlined here; building large tables is insert-bound
+        bits = self.bits
+        node = self.root if start is None else start
+        if trail is None:
+            trail = []
+        while True:
+            if node.length == length:
+                if node.records is None:
+                    node.records = []
+                    self.size += 1
+                node.records.append(record)
+                return
+            bit = (key >> (bits - 1 - node.length)) & 1
+            child = node.children[bit]
+            if child is None:
+                new = node.children[bit] = _Node(key, length, [record])
+                trail.append(new)
+                self.size += 1
+                return
+            common = bits - (child.key ^ key).bit_length()
+            if common >= child.length and length >= child.length:
+                node = child
+                trail.append(node)
+                continue
+            if common >= length:
+                # The new prefix sits between ``node`` and ``child``
+                new = _Node(key, length, [record])
+                new.children[(child.key >> (bits - 1 - length)) & 1] = child
+                node.children[bit] = new
+                trail.append(new)
+                self.size += 1
+                return
+            common = min(common, child.length)
+            branch = _Node(key >> (bits - common) << (bits - common), common)
+            new = _Node(key, length, [record])
+            branch.children[(child.key >> (bits - 1 - common)) & 1] = child
+            branch.children[(key >> (bits - 1 - common)) & 1] = new
+            node.children[bit] = branch
+            trail += (branch, new)
+            self.size += 1
+            return
+
+    def extend(self, items: Iterable[tuple[int, int, Record]]) -> None:
+        """Insert ``(key, length, record)`` items sorted by key then length.
+
+        Sorted input lets each insert start from the deepest node on the
+        previous insert's path that still covers it, so bulk loads avoid
+        walking down from the root every time.
+        """
+        path: list[_Node] = []
+        for key, length, record in items:
+            while path and not self.covers(path[-1], key, length):
+                path.pop()
+            self.insert(key, length, record, path[-1] if path else None, path)
+
+    def path(self, key: int, length: int) -> Iterator[_Node]:
+        """Yield nodes holding records that cover ``key/length``, shortest first."""
+        node: _Node | None = self.root
+        while node is not None and node.length <= length:
+            if not self._matches(node, key):
+                return
+            if node.records is not None:
+                yield node
+            if node.length == self.bits:
+                return
+            node = node.children[self._bit(key, node.length)]
+
+    def longest_match(self, key: int) -> _Node | None:
+        best = None
+        for node in self.path(key, self.bits):
+            best = node
+        return best
+
+    def subtree(self, key: int, length: int) -> Iterator[_Node]:
+        """Yield nodes holding records within ``key/length``, in address order."""
+        node: _Node | None = self.root
+        while node is not None and node.length < length:
+            if not self._matches(node, key):
+                return
+            node = node.children[self._bit(key, node.length)]
+        if node is None or self._common(node.key, key, length) < length:
+            return
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.records is not None:
+                yield current
+            for child in reversed(current.children):
+                if child is not None:
+                    stack.append(child)
+
+
+def _network(value: str) -> ipaddress.IPv4Network | ipaddress.IPv6Network:
+    return ipaddress.ip_network(value.strip(), strict=False)
+
+
+_V4 = (4, socket.AF_INET, 32)
+
+
+def _parse(value: str) -> tuple[int, int, int]:
+    """Return ``(version, network int, prefix length)`` for a CIDR string.
+
+    Cheaper than building ``ip_network`` objects when loading large tables.
+    """
+    address, _, length = value.strip().partition("/")
+    version, family, bits = (6, socket.AF_INET6, 128) if ":" in address else _V4
+    try:
+        packed = socket.inet_pton(family, address)
+    except OSError as e:
+        raise ValueError(f"Invalid address in {value!r}") from e
+    prefixlen = int(length) if length else bits
+    if not 0 <= prefixlen <= bits:
+        raise ValueError(f"Invalid prefix length in {value!r}")
+    host_bits = bits - prefixlen
+    return version, int.from_bytes(packed, "big") >> host_bits << host_bits, prefixlen
+
+
+class PrefixIndex:
+    """Prefix records indexed by CIDR for LPM, covering and covered queries.
+
+    Records are the normalized prefix dicts returned by the GraphQL client (or
+    held in the inventory snapshot); each must have a ``prefix`` field.
+    """
+
+    def __init__(self, prefixes: Iterable[Record]):
+        self._tries = {4: _Trie(32), 6: _Trie(128)}
+        self.skipped = 0
+        items: dict[int, list[tuple[int, int, Record]]] = {4: [], 6: []}
+        for record in prefixes:
+            try:
+                version, key, length = _parse(record["prefix"])
+            except (AttributeError, KeyError, TypeError, ValueError):
+                self.skipped += 1
+                continue
+            items[version].append((key, length, record))
+        for version, family in items.items():
+            family.sort(key=lambda item: (item[0], item[1]))
+            self._tries[version].extend(family)
+
+    def __len__(self) -> int:
+        return sum(trie.size for trie in self._tries.values())
+
+    def lookup(self, address: str) -> list[Record]:
+        """Return the records of the longest prefix containing ``address``.
+
+        Raises ``ValueError`` if ``address`` is not a valid IP address.
+        """
+        ip = ipaddress.ip_address(address.strip())
+        node = self._tries[ip.version].longest_match(int(ip))
+        return list(node.records) if node is not None and node.records else []
+
+    def lookup_many(self, addresses: Iterable[str]) -> dict[str, list[Record] | None]:
+        """Look up several addresses; invalid addresses map to ``None``."""
+        results: dict[str, list[Record] | None] = {}
+        for address in addresses:
+            try:
+                results[address] = self.lookup(address)
+            except ValueError:
+                results[address] = None
+        return results
+
+    def get(self, prefix: str) -> list[Record]:
+        """Records for exactly ``prefix``."""
+        network = _network(prefix)
+        trie = self._tries[network.version]
+        key = int(network.network_address)
+        return [
+            r
+            for node in trie.path(key, network.prefixlen)
+            if node.length == network.prefixlen
+            for r in node.records or ()
+        ]
+
+    def covering(self, prefix: str, include_self: bool = True) -> list[Record]:
+        """Records for every prefix containing ``prefix``, shortest first."""
+        network = _network(prefix)
+        trie = self._tries[network.version]
+        key = int(network.network_address)
+        return [
+            r
+            for node in trie.path(key, network.prefixlen)
+            if include_self or node.length < network.prefixlen
+            for r in node.records or ()
+        ]
+
+    def covered(
+        self, prefix: str, limit: int | None = None, include_self: bool = True
+    ) -> list[Record]:
+        """Records for every prefix inside ``prefix``, in address order."""
+        network = _network(prefix)
+        trie = self._tries[network.version]
+        results: list[Record] = []
+        for node in trie.subtree(int(network.network_address), network.prefixlen):
+            if not include_self and node.length == network.prefixlen:
+                continue
+            for record in node.records or ():
+                if limit is not None and len(results) >= limit:
+                    return results
+                results.append(record)
+        return results
+
+
+class IndexCache:
+    """Holds the most recently built index and the source it was built from."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._source: Hashable = None
+        self._index: PrefixIndex | None = None
+        self._built_at = 0.0
+
+    def get(self, source: Hashable) -> PrefixIndex | None:
+        """Return the cached index if it was built from ``source`` within ``ttl``."""
+        with self._lock:
+            if (
+                self._index is not None
+                and self._source == source
+                and time.monotonic() - self._built_at < self.ttl
+            ):
+                return self._index
+            return None
+
+    def put(self, source: Hashable, index: PrefixIndex) -> PrefixIndex:
+        with self._lock:
+            self._source, self._index = source, index
+            self._built_at = time.monotonic()
+        return index
+
+    def clear(self) -> None:
+        with self._lock:
+            self._source, self._index = None, None
+
+
+index_cache = IndexCache(get_settings().prefix_index_ttl)
@@ -0,0 +1,225 @@
+"""Admission control for tool execution.
+
+Every tool call takes a slot from its tool's limit and from the global limit
+before it runs. Calls that cannot get a slot wait in a bounded queue; when the
+queue is full, or a call has waited ``tool_queue_timeout`` seconds, it is
+rejected with :class:`BusyError` so clients get a fast 429 instead of a pile-up.
+Sync tools run on a dedicated thread pool of ``tool_threads`` workers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any
+
+import mcp.types as mcp_types
+from fastmcp.exceptions import ToolError
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from fastmcp.tools.tool import ToolResult
+
+from . import metrics, tracing
+from .settings import get_settings
+
+
+class BusyError(Exception):
+    """Raised when a tool call is rejected because the server is saturated."""
+
+    def __init__(self, tool: str, reason: str, retry_after: float):
+        self.tool = tool
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(f"Server busy ({reason}); retry '{tool}' later")
+
+
+class _Limiter:
+    """FIFO counting semaphore usable from any event loop.
+
+    Waiters get a future from the running loop, so a module-level instance is
+    not tied to the loop it was first used on. A released slot is handed
+    straight to the next waiter. ``limit <= 0`` means unlimited.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    def try_acquire(self) -> bool:
+        if self.limit <= 0 or (self.active < self.limit and not self._waiters):
+            self.active += 1
+            return True
+        return False
+
+    async def acquire(self) -> None:
+        if self.try_acquire():
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over as we were cancelled; pass it on
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class ToolScheduler:
+    """Global and per-tool concurrency limits with a bounded wait queue."""
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        per_tool: int | None = None,
+        limits: dict[str, int] | None = None,
+        queue_size: int | None = None,
+        queue_timeout: float | None = None,
+        threads: int | None = None,
+    ):
+        settings = get_settings()
+        self.max_concurrency = (
+            settings.tool_max_concurrency
+            if max_concurrency is None
+            else max_concurrency
+        )
+        self.per_tool = (
+            settings.tool_max_concurrency_per_tool if per_tool is None else per_tool
+        )
+        self.limits = settings.tool_concurrency_limits if limits is None else limits
+        self.queue_size = settings.tool_queue_size if queue_size is None else queue_size
+        self.queue_timeout = (
+            settings.tool_queue_timeout if queue_timeout is None else queue_timeout
+        )
+        self.threads = settings.tool_threads if threads is None else threads
+        self._global = _Limiter(self.max_concurrency)
+        self._tools: dict[str, _Limiter] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        self.waiting = 0
+        self.max_waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+
+    def _tool(self, tool: str) -> _Limiter:
+        limiter = self._tools.get(tool)
+        if limiter is None:
+            limiter = self._tools[tool] = _Limiter(self.limits.get(tool, self.per_tool))
+        return limiter
+
+    def _reject(self, tool: str, reason: str) -> BusyError:
+        self.rejected += 1
+        if reason == "timeout":
+            self.timeouts += 1
+        # Suggest waiting roughly as long as a queued call would have
+        return BusyError(tool, reason, max(self.queue_timeout, 1.0))
+
+    async def _acquire(self, tool: str, limiter: _Limiter) -> None:
+        if limiter.try_acquire():
+            if self._global.try_acquire():
+                return
+            limiter.release()
+        if self.waiting >= self.queue_size:
+            raise self._reject(tool, "queue full")
+
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        started = time.perf_counter()
+        try:
+            with tracing.span("tool.queue", tool=tool):
+                async with asyncio.timeout(self.queue_timeout or None):
+                    await limiter.acquire()
+                    try:
+                        await self._global.acquire()
+                    except BaseException:
+                        limiter.release()
+                        raise
+        except TimeoutError:
+            raise self._reject(tool, "timeout") from None
+        finally:
+            self.waiting -= 1
+            waited = time.perf_counter() - started
+            self.wait_seconds += waited
+            metrics.observe_queue_wait(tool, waited)
+
+    @asynccontextmanager
+    async def slot(self, tool: str) -> AsyncIterator[None]:
+        """Hold a global and a per-tool slot; raises :class:`BusyError`."""
+        limiter = self._tool(tool)
+        await self._acquire(tool, limiter)
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self._global.release()
+            limiter.release()
+
+    def _run_sync(self, fn: Callable[..., Any], args: dict[str, Any]) -> Any:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.threads, thread_name_prefix="tool"
+            )
+        # Copy the context so tracing captures follow the call into the pool
+        call = functools.partial(contextvars.copy_context().run, fn, **args)
+        return asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    async def run(self, tool: str, fn: Callable[..., Any], args: dict[str, Any]) -> Any:
+        """Run ``fn(**args)`` in a slot; sync tools use the thread pool."""
+        async with self.slot(tool):
+            if inspect.iscoroutinefunction(fn):
+                return await fn(**args)
+            return await self._run_sync(fn, args)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "active": self._global.active,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "queue_size": self.queue_size,
+            "max_concurrency": self.max_concurrency,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "wait_seconds": round(self.wait_seconds, 6),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+class SchedulerMiddleware(Middleware):
+    """Applies the scheduler's limits to tool calls made over MCP."""
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[mcp_types.CallToolRequestParams],
+        call_next: CallNext[mcp_types.CallToolRequestParams, ToolResult],
+    ) -> ToolResult:
+        try:
+            async with scheduler.slot(context.message.name):
+                return await call_next(context)
+        except BusyError as e:
+            raise ToolError(str(e)) from e
+
+
+scheduler = ToolScheduler()
@@ -0,0 +1,71 @@
+"""JSON encoding/decoding with an optional fast native backend.
+
+``orjson`` is used when installed (``pip install mcp-nautobot[fast]``) and the
+stdlib ``json`` module otherwise. Both backends decode bytes directly and
+encode straight to compact UTF-8 bytes.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+from starlette.responses import JSONResponse
+
+from .settings import get_settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+
+def _json_loads(data: bytes | str) -> Any:
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    # Same output options as starlette's JSONResponse
+    return json.dumps(
+        obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _orjson_dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)  # type: ignore[no-any-return]
+
+
+BACKENDS: dict[str, tuple[Callable[[bytes | str], Any], Callable[[Any], bytes]]] = {
+    "json": (_json_loads, _json_dumps),
+}
+if orjson is not None:
+    BACKENDS["orjson"] = (orjson.loads, _orjson_dumps)
+
+backend = ""
+loads: Callable[[bytes | str], Any] = _json_loads
+dumps: Callable[[Any], bytes] = _json_dumps
+
+
+def use(name: str) -> str:
+    """Select the JSON backend; ``auto`` picks the fastest one installed."""
+    global backend, loads, dumps
+    if name == "auto":
+        name = "orjson" if "orjson" in BACKENDS else "json"
+    if name not in BACKENDS:
+        raise ValueError(
+            f"JSON backend '{name}' is not available; choose from {list(BACKENDS)}"
+        )
+    backend = name
+    loads, dumps = BACKENDS[name]
+    return name
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered with the selected backend."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+use(get_settings().json_backend)
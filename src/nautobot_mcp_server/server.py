@@ -1,18 +1,43 @@
 """FastMCP server for Nautobot integration."""
 
+import asyncio
+import inspect
+import json
+import os
+import tempfile
+import threading
+from collections.abc import AsyncIterator
+from contextlib import AbstractContextManager, nullcontext, suppress
 from typing import Any
 
 import structlog
+import uvicorn
 from fastapi import Depends, HTTPException, status
 from fastapi.security import APIKeyHeader
+from fastmcp.exceptions import NotFoundError
 from fastmcp.server import FastMCP
 from fastmcp.tools import Tool
+from starlette.applications import Starlette
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.responses import Response, StreamingResponse
 
+from . import metrics, serialization, snapshot, streaming, tracing
+from .clients import nautobot_graphql as nb
+from .prefetch import prefetcher
+from .scheduler import BusyError, SchedulerMiddleware, scheduler
+from .serialization import FastJSONResponse
 from .settings import get_settings
-from .tools.devices import get_devices_by_location, get_devices_by_location_and_role
-from .tools.prefixes import get_prefixes_by_location
+from .tools.devices import (
+    get_devices_by_location_and_role_async,
+    get_devices_by_location_async,
+    get_devices_by_locations_async,
+)
+from .tools.prefixes import (
+    get_prefix_hierarchy_async,
+    get_prefixes_by_location_async,
+    get_prefixes_by_locations_async,
+    lookup_ip_addresses_async,
+)
 
 # Configure structured logging
 structlog.configure(
@@ -25,7 +50,7 @@ structlog.configure(
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer(),
+        tracing.traced_processor(structlog.processors.JSONRenderer(), "log.render"),
     ],
     context_class=dict,
     logger_factory=structlog.stdlib.LoggerFactory(),
@@ -41,6 +66,10 @@ server = FastMCP(
     instructions="FastMCP server exposing Nautobot GraphQL API as MCP tools",
     version="0.1.0",
 )
+server.add_middleware(metrics.ToolMetricsMiddleware())
+server.add_middleware(tracing.ToolTracingMiddleware())
+server.add_middleware(SchedulerMiddleware())
+
 # Security dependencies (API Key)
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
@@ -62,44 +91,143 @@ def require_auth(
 
 
 # Create tools from existing functions
-def get_prefixes_tool(location_name: str, format: str = "json") -> dict[str, Any]:
+async def get_prefixes_tool(
+    location_name: str,
+    format: str = "json",
+    fresh: bool = False,
+    fields: list[str] | None = None,
+) -> dict[str, Any]:
     """Get prefixes by location name with multiple output formats.
 
     Args:
         location_name: The name of the location (e.g., "HQ-Dallas", "LAB-Austin")
-        format: Output format - "json", "table", "dataframe", or "csv"
+        format: "columnar" for column/row tables; other values return JSON records
+        fresh: Bypass the result cache and read from Nautobot
+        fields: Optional prefix fields to return
 
     Returns:
         Dictionary containing prefixes data in the requested format
     """
-    return get_prefixes_by_location(location_name, format)
+    return await get_prefixes_by_location_async(location_name, format, fresh, fields)
 
 
-def get_devices_by_location_tool(location_name: str) -> dict[str, Any]:
+async def get_devices_by_location_tool(
+    location_name: str,
+    fresh: bool = False,
+    fields: list[str] | None = None,
+    format: str = "json",
+) -> dict[str, Any]:
     """Get devices by location name.
 
     Args:
         location_name: The name of the location (e.g., "NY Data Center", "Campus A")
+        fresh: Bypass the result cache and read from Nautobot
+        fields: Optional device fields to return
+        format: "columnar" for column/row tables; otherwise JSON records
 
     Returns:
         Dictionary containing device data in JSON format
     """
-    return get_devices_by_location(location_name)
+    return await get_devices_by_location_async(location_name, fresh, fields, format)
 
 
-def get_devices_by_location_and_role_tool(
-    location_name: str, role_name: str
+async def get_devices_by_location_and_role_tool(
+    location_name: str,
+    role_name: str,
+    fresh: bool = False,
+    fields: list[str] | None = None,
+    format: str = "json",
 ) -> dict[str, Any]:
     """Get devices by location and role.
 
     Args:
         location_name: The name of the location (e.g., "NY Data Center", "Campus A")
         role_name: The name of the device role (e.g., "WAN Router", "Access Switch")
+        fresh: Bypass the result cache and read from Nautobot
+        fields: Optional device fields to return
+        format: "columnar" for column/row tables; otherwise JSON records
 
     Returns:
         Dictionary containing device data in JSON format
     """
-    return get_devices_by_location_and_role(location_name, role_name)
+    return await get_devices_by_location_and_role_async(
+        location_name, role_name, fresh, fields, format
+    )
+
+
+async def get_devices_by_locations_tool(
+    location_names: list[str],
+    role_names: list[str] | None = None,
+    fresh: bool = False,
+    fields: list[str] | None = None,
+    format: str = "json",
+) -> dict[str, Any]:
+    """Get devices for several locations, optionally limited to roles.
+
+    Args:
+        location_names: Names of the locations (e.g., ["Dallas Campus", "London Campus"])
+        role_names: Optional device role names (e.g., ["WAN"])
+        fresh: Bypass the result cache and read from Nautobot
+        fields: Optional device fields to return
+        format: "columnar" for column/row tables; otherwise JSON records
+
+    Returns:
+        Dictionary mapping each location to its devices
+    """
+    return await get_devices_by_locations_async(
+        location_names, role_names, fresh, fields, format
+    )
+
+
+async def get_prefixes_by_locations_tool(
+    location_names: list[str],
+    fresh: bool = False,
+    fields: list[str] | None = None,
+    format: str = "json",
+) -> dict[str, Any]:
+    """Get prefixes for several locations.
+
+    Args:
+        location_names: Names of the locations (e.g., ["NYDC", "LODC"])
+        fresh: Bypass the result cache and read from Nautobot
+        fields: Optional prefix fields to return
+        format: "columnar" for column/row tables; otherwise JSON records
+
+    Returns:
+        Dictionary mapping each location to its prefixes
+    """
+    return await get_prefixes_by_locations_async(location_names, fresh, fields, format)
+
+
+async def lookup_ip_addresses_tool(
+    ip_addresses: list[str], fresh: bool = False
+) -> dict[str, Any]:
+    """Find the most specific prefix containing each IP address.
+
+    Args:
+        ip_addresses: IPv4 or IPv6 addresses (e.g., ["10.42.7.19", "2001:db8::1"])
+        fresh: Rebuild the prefix index from Nautobot
+
+    Returns:
+        Dictionary mapping each address to its longest matching prefix
+    """
+    return await lookup_ip_addresses_async(ip_addresses, fresh)
+
+
+async def get_prefix_hierarchy_tool(
+    prefix: str, limit: int = 1000, fresh: bool = False
+) -> dict[str, Any]:
+    """Get the prefixes containing and contained in a prefix.
+
+    Args:
+        prefix: CIDR prefix (e.g., "10.42.0.0/16")
+        limit: Maximum number of covered prefixes to return
+        fresh: Rebuild the prefix index from Nautobot
+
+    Returns:
+        Dictionary with the exact, covering and covered prefixes
+    """
+    return await get_prefix_hierarchy_async(prefix, limit, fresh)
 
 
 # Create Tool instances
@@ -109,11 +237,10 @@ prefixes_tool = Tool.from_function(
     description="""Get prefixes by location. Returns raw JSON only (LLM handles formatting/analysis).
 
         Args:
-            location_name: Name of the location. Supports both full names and abbreviations:
-                - Data Centers: "NYDC" or "New York Data Center", "LODC" or "London Data Center"
-                - Campuses: "DACN" or "Dallas Campus", "LOCN" or "London Campus", "KOCN" or "Korea Campus", "BRCN" or "Brazil Campus", "MXCN" or "Mexico Campus"
-                - Branch Offices: "USBN1" or "US Branch Network Branch 1", "USBN2", "MXBN1" or "Mexico Branch Network Branch 1", "MXBN2", "UKBN1" or "UK Branch Network Branch 1", "UKBN2", "BRBN1" or "Brazil Branch Network Branch 1", "BRBN2"
-            format: Ignored. Always returns JSON.
+            location_name: Location name or alias, e.g. "NYDC" or "New York Data Center". Unknown names fail with suggestions.
+            format: Optional. "columnar" returns data as {format, columns, dictionaries, rows}: column names once, one array per row, nested fields as dotted columns (e.g. "device_type.model"), and for columns listed in dictionaries each cell is an index into that column's value list. Much smaller for large results. Any other value returns a list of JSON objects.
+            fresh: Set true to bypass the result cache and force a read from Nautobot.
+            fields: Optional list of prefix fields to return to keep responses small: prefix, status, role, description, locations. "prefix" is always included.
 
         Returns:
             JSON object with fields: success, message, count, data (list of prefixes)
@@ -126,10 +253,10 @@ devices_by_location_tool = Tool.from_function(
     description="""Get devices by location. Returns raw JSON only (LLM handles formatting/analysis).
 
         Args:
-            location_name: Name of the location. Supports both full names and abbreviations:
-                - Data Centers: "NYDC" or "New York Data Center", "LODC" or "London Data Center"
-                - Campuses: "DACN" or "Dallas Campus", "LOCN" or "London Campus", "KOCN" or "Korea Campus", "BRCN" or "Brazil Campus", "MXCN" or "Mexico Campus"
-                - Branch Offices: "USBN1" or "US Branch Network Branch 1", "USBN2", "MXBN1" or "Mexico Branch Network Branch 1", "MXBN2", "UKBN1" or "UK Branch Network Branch 1", "UKBN2", "BRBN1" or "Brazil Branch Network Branch 1", "BRBN2"
+            location_name: Location name or alias, e.g. "NYDC" or "New York Data Center". Unknown names fail with suggestions.
+            fresh: Set true to bypass the result cache and force a read from Nautobot.
+            fields: Optional list of device fields to return to keep responses small: name, status, role, device_type, platform, primary_ip4, location. "name" is always included.
+            format: Optional. "columnar" returns data as {format, columns, dictionaries, rows}: column names once, one array per row, nested fields as dotted columns (e.g. "device_type.model"), and for columns listed in dictionaries each cell is an index into that column's value list. Much smaller for large results. Any other value returns a list of JSON objects.
 
         Returns:
             JSON object with fields: success, message, count, data (list of devices with name, status, role, device_type, platform, primary_ip4, location, description)
@@ -142,39 +269,101 @@ devices_by_location_and_role_tool = Tool.from_function(
     description="""Get devices by location and role. Returns raw JSON only (LLM handles formatting/analysis).
 
         Args:
-            location_name: Name of the location. Supports both full names and abbreviations:
-                - Data Centers: "NYDC" or "New York Data Center", "LODC" or "London Data Center"
-                - Campuses: "DACN" or "Dallas Campus", "LOCN" or "London Campus", "KOCN" or "Korea Campus", "BRCN" or "Brazil Campus", "MXCN" or "Mexico Campus"
-                - Branch Offices: "USBN1" or "US Branch Network Branch 1", "USBN2", "MXBN1" or "Mexico Branch Network Branch 1", "MXBN2", "UKBN1" or "UK Branch Network Branch 1", "UKBN2", "BRBN1" or "Brazil Branch Network Branch 1", "BRBN2"
-            role_name: Name of the device role. Available roles include:
-                - "WAN" (WAN Routers)
-                - "Core" (Core Routers)
-                - "Spine" (Spine Switches in data centers)
-                - "Leaf" (Leaf Switches in data centers)
-                - "Branch Access" (Branch Access Switches)
-                - "Campus Access" (Campus Access Switches)
+            location_name: Location name or alias, e.g. "NYDC" or "New York Data Center". Unknown names fail with suggestions.
+            role_name: Device role name or alias, e.g. "WAN", "Core", "Spine", "Leaf", "Branch Access", "Campus Access".
+            fresh: Set true to bypass the result cache and force a read from Nautobot.
+            fields: Optional list of device fields to return to keep responses small: name, status, role, device_type, platform, primary_ip4, location. "name" is always included.
+            format: Optional. "columnar" returns data as {format, columns, dictionaries, rows}: column names once, one array per row, nested fields as dotted columns (e.g. "device_type.model"), and for columns listed in dictionaries each cell is an index into that column's value list. Much smaller for large results. Any other value returns a list of JSON objects.
 
         Returns:
             JSON object with fields: success, message, count, data (list of devices with name, status, role, device_type, platform, primary_ip4, location, description)
         """,
 )
 
+devices_by_locations_tool = Tool.from_function(
+    fn=get_devices_by_locations_tool,
+    name="get_devices_by_locations",
+    description="""Get devices for several locations in one call, optionally limited to roles. Prefer this over repeated get_devices_by_location_and_role calls when comparing sites.
+
+        Args:
+            location_names: List of location names or abbreviations (same values as get_devices_by_location).
+            role_names: Optional list of device role names (same values as get_devices_by_location_and_role).
+            fresh: Set true to bypass the result cache and force a read from Nautobot.
+            fields: Optional list of device fields to return to keep responses small: name, status, role, device_type, platform, primary_ip4, location. "name" is always included.
+            format: Optional. "columnar" returns data as {format, columns, dictionaries, rows}: column names once, one array per row, nested fields as dotted columns (e.g. "device_type.model"), and for columns listed in dictionaries each cell is an index into that column's value list. Much smaller for large results. Any other value returns a list of JSON objects.
+
+        Returns:
+            JSON object with fields: success, message, count, data (object mapping each location to its list of devices)
+        """,
+)
+
+prefixes_by_locations_tool = Tool.from_function(
+    fn=get_prefixes_by_locations_tool,
+    name="get_prefixes_by_locations",
+    description="""Get prefixes for several locations in one call. Prefer this over repeated get_prefixes_by_location_enhanced calls when comparing sites.
+
+        Args:
+            location_names: List of location names or abbreviations (same values as get_prefixes_by_location_enhanced).
+            fresh: Set true to bypass the result cache and force a read from Nautobot.
+            fields: Optional list of prefix fields to return to keep responses small: prefix, status, role, description, locations. "prefix" is always included.
+            format: Optional. "columnar" returns data as {format, columns, dictionaries, rows}: column names once, one array per row, nested fields as dotted columns (e.g. "device_type.model"), and for columns listed in dictionaries each cell is an index into that column's value list. Much smaller for large results. Any other value returns a list of JSON objects.
+
+        Returns:
+            JSON object with fields: success, message, count, data (object mapping each location to its list of prefixes)
+        """,
+)
+
+ip_lookup_tool = Tool.from_function(
+    fn=lookup_ip_addresses_tool,
+    name="lookup_ip_addresses",
+    description="""Find which prefix (and so which location and role) each IP address belongs to, using longest-prefix match over all IPv4 and IPv6 prefixes. Accepts many addresses in one call.
+
+        Args:
+            ip_addresses: List of IP addresses (e.g., ["10.42.7.19", "2001:db8::1"]).
+            fresh: Set true to rebuild the prefix index from Nautobot.
+
+        Returns:
+            JSON object with fields: success, message, count (addresses matched), data (object mapping each address to a list of matching prefixes with prefix, status, role, description, locations; empty when nothing matches), invalid (addresses that could not be parsed, if any)
+        """,
+)
+
+prefix_hierarchy_tool = Tool.from_function(
+    fn=get_prefix_hierarchy_tool,
+    name="get_prefix_hierarchy",
+    description="""Get the parent (covering) and child (covered) prefixes of a CIDR prefix.
+
+        Args:
+            prefix: CIDR prefix (e.g., "10.42.0.0/16").
+            limit: Maximum number of covered prefixes to return (default 1000).
+            fresh: Set true to rebuild the prefix index from Nautobot.
+
+        Returns:
+            JSON object with fields: success, message, count, data (prefix: exact matches, covering: containing prefixes from shortest to longest, covered: contained prefixes in address order), truncated (present when covered was cut at limit)
+        """,
+)
+
 # Add tools to the server
 server.add_tool(prefixes_tool)
 server.add_tool(devices_by_location_tool)
 server.add_tool(devices_by_location_and_role_tool)
+server.add_tool(devices_by_locations_tool)
+server.add_tool(prefixes_by_locations_tool)
+server.add_tool(ip_lookup_tool)
+server.add_tool(prefix_hierarchy_tool)
 
 
 # Add custom REST endpoints for chat UI compatibility
 @server.custom_route("/tools", methods=["GET"])
-async def get_tools(request: Request, _: bool = Depends(require_auth)) -> JSONResponse:
+async def get_tools(
+    request: Request, _: bool = Depends(require_auth)
+) -> FastJSONResponse:
     """Get list of available tools in REST format."""
     # Ensure auth applies regardless of transport wiring
     settings = get_settings()
     if settings.auth_mode == "api_key":
         api_key = request.headers.get("X-API-Key")
         if not api_key or api_key not in set(settings.api_keys):
-            return JSONResponse({"error": "Unauthorized"}, status_code=401)
+            return FastJSONResponse({"error": "Unauthorized"}, status_code=401)
     tools = []
     tools_dict = await server.get_tools()
     for tool in tools_dict.values():
@@ -186,13 +375,26 @@ async def get_tools(request: Request, _: bool = Depends(require_auth)) -> JSONRe
                 "output_schema": tool.output_schema,
             }
         )
-    return JSONResponse({"tools": tools})
+    return FastJSONResponse({"tools": tools})
+
+
+def _wants_stream(request: Request, body: dict[str, Any]) -> bool:
+    """Whether the caller asked for NDJSON via ``"stream": true`` or ``Accept``."""
+    return bool(body.get("stream")) or streaming.MEDIA_TYPE in request.headers.get(
+        "accept", ""
+    )
+
+
+def _busy_response(e: BusyError) -> FastJSONResponse:
+    return FastJSONResponse(
+        {"error": str(e), "reason": e.reason},
+        status_code=429,
+        headers={"Retry-After": str(round(e.retry_after))},
+    )
 
 
 @server.custom_route("/tools/invoke", methods=["POST"])
-async def invoke_tool(
-    request: Request, _: bool = Depends(require_auth)
-) -> JSONResponse:
+async def invoke_tool(request: Request, _: bool = Depends(require_auth)) -> Response:
     """Invoke a tool by name with arguments."""
     try:
         # Route-level auth guard
@@ -200,36 +402,322 @@ async def invoke_tool(
         if settings.auth_mode == "api_key":
             api_key = request.headers.get("X-API-Key")
             if not api_key or api_key not in set(settings.api_keys):
-                return JSONResponse({"error": "Unauthorized"}, status_code=401)
+                return FastJSONResponse({"error": "Unauthorized"}, status_code=401)
         # Parse request body
-        body = await request.json()
+        body = serialization.loads(await request.body())
         tool_name = body.get("tool_name")
         args = body.get("args", {})
 
         if not tool_name:
-            return JSONResponse({"error": "tool_name is required"}, status_code=400)
+            return FastJSONResponse({"error": "tool_name is required"}, status_code=400)
 
         # Get the tool
         tool = await server.get_tool(tool_name)
         if not tool:
-            return JSONResponse(
+            return FastJSONResponse(
                 {"error": f"Tool '{tool_name}' not found"}, status_code=404
             )
 
-        # Call the tool function
+        # Call the tool function in a scheduler slot; async tools are awaited so
+        # their upstream I/O overlaps, sync tools run on the tool thread pool.
         # Tool type from fastmcp lacks precise typing; ignore for mypy
-        result = tool.fn(**args)  # type: ignore[attr-defined]
-
-        return JSONResponse({"result": result})
+        fn = tool.fn  # type: ignore[attr-defined]
+        if _wants_stream(request, body):
+            lines = streaming.ndjson(tool_name, fn, args)
+            try:
+                # The header comes once the call has a slot, so BusyError is a 429
+                first = await anext(lines)
+            except BusyError as e:
+                return _busy_response(e)
+            return StreamingResponse(
+                streaming.prepend(first, lines), media_type=streaming.MEDIA_TYPE
+            )
+        # A privileged X-Profile header captures spans and stack samples
+        capture: tracing.Capture | None = None
+        scope: AbstractContextManager[Any] = nullcontext()
+        if tracing.profile_requested(request.headers):
+            capture = scope = tracing.Capture(tool_name)
+        if capture is not None and not inspect.iscoroutinefunction(fn):
+            fn = capture.wrap(fn)
+        timer = metrics.ToolTimer(tool_name, "rest")
+        try:
+            with scope:
+                with tracing.span("tool", tool=tool_name, transport="rest"):
+                    result = await scheduler.run(tool_name, fn, args)
+                with tracing.span("response.encode"):
+                    response = FastJSONResponse({"result": result})
+        except BusyError as e:
+            timer.done(outcome="busy")
+            return _busy_response(e)
+        except Exception:
+            timer.done(failed=True)
+            raise
+
+        timer.done(result, len(response.body))
+        if capture is not None:
+            response = FastJSONResponse({"result": result, "profile": capture.result()})
+        return response
     except Exception as e:
         logger.error("Error invoking tool", error=str(e))
-        return JSONResponse({"error": str(e)}, status_code=500)
+        return FastJSONResponse({"error": str(e)}, status_code=500)
+
+
+async def _batch_call(
+    tool_name: str, args: dict[str, Any], limit: asyncio.Semaphore
+) -> dict[str, Any]:
+    """Run one call of a batch; failures become an error entry."""
+    async with limit:
+        try:
+            tool = await server.get_tool(tool_name)
+        except NotFoundError:
+            return {"error": f"Tool '{tool_name}' not found", "status": 404}
+        fn = tool.fn  # type: ignore[attr-defined]
+        timer = metrics.ToolTimer(tool_name, "batch")
+        try:
+            with tracing.span("tool", tool=tool_name, transport="batch"):
+                result = await scheduler.run(tool_name, fn, args)
+        except BusyError as e:
+            timer.done(outcome="busy")
+            return {"error": str(e), "reason": e.reason, "status": 429}
+        except Exception as e:
+            timer.done(failed=True)
+            logger.error("Error invoking tool", tool=tool_name, error=str(e))
+            return {"error": str(e), "status": 500}
+        timer.done(result)
+        return {"result": result}
+
+
+# Calls of a batch keyed by tool and arguments -> (tool, args, request indexes)
+BatchGroups = dict[str, tuple[str, dict[str, Any], list[int]]]
+
+
+def _group_calls(calls: list[Any]) -> tuple[BatchGroups, list[dict[str, Any]]]:
+    """Group identical calls so each runs once; return the invalid ones as entries."""
+    groups: BatchGroups = {}
+    invalid = []
+    for index, call in enumerate(calls):
+        tool_name = call.get("tool_name") if isinstance(call, dict) else None
+        args = call.get("args", {}) if isinstance(call, dict) else None
+        if not tool_name or not isinstance(args, dict):
+            invalid.append(
+                {
+                    "index": index,
+                    "tool_name": tool_name,
+                    "error": "Each call needs a tool_name and an args object",
+                    "status": 400,
+                }
+            )
+            continue
+        key = json.dumps([tool_name, args], sort_keys=True, default=str)
+        groups.setdefault(key, (tool_name, args, []))[2].append(index)
+    return groups, invalid
+
+
+async def _batch_results(
+    groups: BatchGroups, invalid: list[dict[str, Any]], concurrency: int
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield one entry per call, in completion order."""
+    for entry in invalid:
+        yield entry
+    limit = asyncio.Semaphore(max(concurrency, 1))
+    tasks = {
+        asyncio.ensure_future(_batch_call(tool_name, args, limit)): (tool_name, indexes)
+        for tool_name, args, indexes in groups.values()
+    }
+    try:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                tool_name, indexes = tasks[task]
+                outcome = task.result()
+                for index in indexes:
+                    yield {"index": index, "tool_name": tool_name, **outcome}
+    finally:
+        # A client that disconnects mid-stream cancels the calls still running
+        for task in tasks:
+            task.cancel()
+
+
+@server.custom_route("/tools/invoke/batch", methods=["POST"])
+async def invoke_tools_batch(
+    request: Request, _: bool = Depends(require_auth)
+) -> Response:
+    """Invoke several tools concurrently in one request."""
+    settings = get_settings()
+    if settings.auth_mode == "api_key":
+        api_key = request.headers.get("X-API-Key")
+        if not api_key or api_key not in set(settings.api_keys):
+            return FastJSONResponse({"error": "Unauthorized"}, status_code=401)
+    try:
+        body = serialization.loads(await request.body())
+    except ValueError as e:
+        return FastJSONResponse({"error": f"Invalid JSON: {e}"}, status_code=400)
+    calls = body.get("calls") if isinstance(body, dict) else None
+    if not isinstance(calls, list) or not calls:
+        return FastJSONResponse(
+            {"error": "calls must be a non-empty list"}, status_code=400
+        )
+    if len(calls) > settings.tool_batch_max_calls:
+        return FastJSONResponse(
+            {"error": f"At most {settings.tool_batch_max_calls} calls per batch"},
+            status_code=400,
+        )
+
+    groups, invalid = _group_calls(calls)
+    entries = _batch_results(groups, invalid, settings.tool_batch_concurrency)
+    if _wants_stream(request, body):
+
+        async def lines() -> AsyncIterator[bytes]:
+            async for entry in entries:
+                yield serialization.dumps(entry) + b"\n"
+
+        return StreamingResponse(lines(), media_type=streaming.MEDIA_TYPE)
+
+    results: list[Any] = [None] * len(calls)
+    async for entry in entries:
+        results[entry["index"]] = entry
+    deduplicated = len(calls) - len(invalid) - len(groups)
+    return FastJSONResponse({"results": results, "deduplicated": deduplicated})
 
 
 @server.custom_route("/healthz", methods=["GET"])
-async def health_check(request: Request) -> JSONResponse:
+async def health_check(request: Request) -> FastJSONResponse:
     """Health check endpoint."""
-    return JSONResponse({"status": "ok", "service": "nautobot-mcp-server"})
+    body: dict[str, Any] = {"status": "ok", "service": "nautobot-mcp-server"}
+    # The server keeps answering (from cache) while Nautobot is unavailable,
+    # so an open breaker is reported without failing the health check
+    body["nautobot"] = {
+        "breaker": nb.breaker.stats(),
+        "request_limit": {
+            "sync": nb.client.limiter.stats(),
+            "async": nb.async_client.limiter.stats(),
+        },
+    }
+    if snapshot.manager.enabled:
+        body["snapshot_sync"] = snapshot.manager.stats.as_dict()
+    body["scheduler"] = scheduler.stats()
+    warming = nb.query_cache.warming or prefetcher.status == "warming"
+    body["cache"] = "warming" if warming else "ready"
+    if prefetcher.enabled:
+        body["prefetch"] = prefetcher.stats()
+    # Readiness probes pass ?ready=1 to hold traffic until the cache is warm
+    if warming and request.query_params.get("ready") in ("1", "true"):
+        return FastJSONResponse(body, status_code=503)
+    return FastJSONResponse(body)
+
+
+@server.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> Response:
+    """Prometheus metrics endpoint."""
+    if not metrics.enabled:
+        return FastJSONResponse({"error": "Metrics are disabled"}, status_code=404)
+    body, content_type = metrics.render()
+    return Response(body, media_type=content_type)
+
+
+def _snapshot_stats() -> dict[str, Any]:
+    stats = snapshot.manager.stats.as_dict()
+    current = snapshot.manager.snapshot
+    if current is not None:
+        stats.update(
+            devices=len(current.devices),
+            prefixes=len(current.prefixes),
+            age_seconds=current.age(),
+        )
+    return stats
+
+
+metrics.register_stats(
+    "cache",
+    nb.query_cache.stats,
+    counters=(
+        "hits",
+        "misses",
+        "evictions",
+        "expirations",
+        "stale_hits",
+        "shared_hits",
+    ),
+)
+if nb.query_cache.shared is not None:
+    metrics.register_stats(
+        "shared_cache",
+        nb.query_cache.shared.stats,
+        counters=("hits", "misses", "evictions", "errors"),
+    )
+metrics.register_stats(
+    "http_pool",
+    nb.client.pool_stats,
+    counters=("requests", "connections_opened", "connections_reused"),
+)
+for _label, _inflight_stats in (
+    ("sync", nb.client.inflight.stats),
+    ("async", nb.async_client.inflight.stats),
+):
+    metrics.register_stats(
+        "singleflight",
+        _inflight_stats,
+        counters=("calls", "deduplicated"),
+        labels={"client": _label},
+    )
+metrics.register_stats("breaker", nb.breaker.stats, counters=("opens", "rejected"))
+for _label, _limiter_stats in (
+    ("sync", nb.client.limiter.stats),
+    ("async", nb.async_client.limiter.stats),
+):
+    metrics.register_stats(
+        "upstream_limit",
+        _limiter_stats,
+        counters=("rejected", "decreases"),
+        labels={"client": _label},
+    )
+for _label, _retry_stats in (
+    ("sync", nb.client.retry.stats),
+    ("async", nb.async_client.retry.stats),
+):
+    metrics.register_stats(
+        "upstream_retry",
+        _retry_stats,
+        counters=("retries", "hedges", "hedge_wins", "deadline_exceeded"),
+        labels={"client": _label},
+    )
+metrics.register_stats(
+    "snapshot", _snapshot_stats, counters=("full_syncs", "delta_syncs", "failures")
+)
+metrics.register_stats(
+    "prefetch", prefetcher.stats, counters=("rounds", "fetches", "failures")
+)
+metrics.register_stats(
+    "scheduler",
+    scheduler.stats,
+    counters=("admitted", "rejected", "timeouts", "wait_seconds"),
+)
+
+
+def start_background_tasks() -> None:
+    """Start the enabled snapshot sync, cache warm-up and prefetch threads."""
+    settings = get_settings()
+    if settings.snapshot_enabled:
+        snapshot.manager.start()
+    if settings.cache_warm_start and nb.query_cache.shared is not None:
+        # Misses read through to the disk tier meanwhile, so serve right away
+        threading.Thread(
+            target=nb.query_cache.warm, name="cache-warm", daemon=True
+        ).start()
+    prefetcher.start()
+
+
+def create_app() -> Starlette:
+    """ASGI app for one worker process in multi-worker mode.
+
+    MCP runs in stateless HTTP mode, so any worker can answer any request and
+    no session affinity is needed.
+    """
+    start_background_tasks()
+    return server.http_app(stateless_http=True)
 
 
 def main() -> None:
@@ -239,6 +727,34 @@ def main() -> None:
     port = settings.port
     _log_level = settings.log_level
 
+    if settings.workers > 1:
+        shared_path = None
+        if settings.cache_enabled and not (
+            settings.cache_shared_path or settings.cache_dir
+        ):
+            # Workers read their settings from the environment they inherit
+            shared_path = os.path.join(
+                tempfile.gettempdir(), f"nautobot-mcp-cache-{os.getpid()}.sqlite"
+            )
+            os.environ["CACHE_SHARED_PATH"] = shared_path
+        try:
+            uvicorn.run(
+                "nautobot_mcp_server.server:create_app",
+                factory=True,
+                host=host,
+                port=port,
+                workers=settings.workers,
+                log_level=settings.log_level.lower(),
+            )
+        finally:
+            if shared_path is not None:
+                for suffix in ("", "-wal", "-shm"):
+                    with suppress(OSError):
+                        os.remove(shared_path + suffix)
+        return
+
+    start_background_tasks()
+
     # Run the FastMCP server
     server.run(transport="streamable-http", host=host, port=port)
 
@@ -16,6 +16,9 @@ class Settings(BaseSettings):
     host: str = Field(default="127.0.0.1", description="Bind address")
     port: int = Field(default=7001, description="HTTP port")
     log_level: str = Field(default="info", description="Log level")
+    workers: int = Field(
+        default=1, description="Server processes sharing the port (stateless HTTP)"
+    )
 
     # Nautobot
     nautobot_url: str = Field(
@@ -24,6 +27,237 @@ class Settings(BaseSettings):
     graphql_path: str = Field(default="/graphql/", description="GraphQL path")
     nautobot_token: str | None = Field(default=None, description="Nautobot token")
 
+    # Nautobot HTTP connection pool
+    http_pool_connections: int = Field(
+        default=10, description="Number of per-host connection pools to keep"
+    )
+    http_pool_maxsize: int = Field(
+        default=10, description="Max connections kept open per host"
+    )
+    http_pool_block: bool = Field(
+        default=False,
+        description="Block when the per-host limit is reached instead of opening extra connections",
+    )
+    http_keepalive: bool = Field(
+        default=True, description="Reuse connections to Nautobot (HTTP keep-alive)"
+    )
+
+    # GraphQL pagination
+    graphql_page_size: int = Field(
+        default=1000, description="Records per GraphQL page (0 disables paging)"
+    )
+    graphql_page_concurrency: int = Field(
+        default=4, description="Pages fetched concurrently by the async client"
+    )
+
+    graphql_max_aliases: int = Field(
+        default=10, description="Max aliased locations per batched GraphQL request"
+    )
+
+    # GraphQL result cache
+    cache_enabled: bool = Field(default=True, description="Cache query results")
+    cache_default_ttl: float = Field(
+        default=60.0, description="Default result TTL in seconds"
+    )
+    cache_ttls: dict[str, float] = Field(
+        default_factory=dict,
+        description="Per-query-file TTLs in seconds, e.g. {'devices_by_location': 300}",
+    )
+    cache_max_entries: int = Field(default=1024, description="Max cached results")
+    cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024, description="Approximate max cached bytes"
+    )
+    cache_stale_ttl: float = Field(
+        default=3600.0,
+        description="Seconds expired results are kept to serve while Nautobot is down",
+    )
+    cache_shared_path: str | None = Field(
+        default=None,
+        description="SQLite file for a result cache shared by worker processes",
+    )
+    cache_dir: str | None = Field(
+        default=None,
+        description="Directory for a persistent on-disk result cache (warm restarts)",
+    )
+    cache_disk_max_bytes: int = Field(
+        default=1024 * 1024 * 1024,
+        description="Approximate max bytes of the on-disk cache (0 = no limit)",
+    )
+    cache_warm_start: bool = Field(
+        default=True,
+        description="Preload the in-memory cache from the on-disk cache at startup",
+    )
+
+    # Nautobot load protection
+    upstream_concurrency_initial: int = Field(
+        default=8, description="Initial limit on concurrent Nautobot requests"
+    )
+    upstream_concurrency_min: int = Field(
+        default=1, description="Lowest the adaptive request limit may go"
+    )
+    upstream_concurrency_max: int = Field(
+        default=32, description="Highest the adaptive request limit may go"
+    )
+    upstream_latency_target: float = Field(
+        default=2.0,
+        description="Requests slower than this (seconds) shrink the request limit",
+    )
+    upstream_queue_timeout: float = Field(
+        default=5.0, description="Seconds a request may wait under the limit"
+    )
+    breaker_failure_threshold: int = Field(
+        default=5,
+        description="Consecutive Nautobot failures that open the breaker (0 = off)",
+    )
+    breaker_reset_timeout: float = Field(
+        default=30.0, description="Seconds the breaker stays open before a probe"
+    )
+
+    # Nautobot retries and hedging
+    upstream_attempt_timeout: float = Field(
+        default=10.0, description="Timeout (seconds) for one Nautobot request"
+    )
+    upstream_deadline: float = Field(
+        default=30.0,
+        description="Total seconds for a query, including retries and queueing",
+    )
+    upstream_retries: int = Field(
+        default=2, description="Extra attempts after an upstream failure (0 = off)"
+    )
+    upstream_backoff_base: float = Field(
+        default=0.1, description="Backoff (seconds) before the first retry"
+    )
+    upstream_backoff_max: float = Field(
+        default=2.0, description="Upper bound (seconds) on the backoff between retries"
+    )
+    upstream_hedge: bool = Field(
+        default=False,
+        description="Send a duplicate request when one is slower than its p95",
+    )
+    upstream_hedge_min_delay: float = Field(
+        default=0.05, description="Seconds to wait at least before hedging"
+    )
+
+    # Inventory snapshot mode
+    snapshot_enabled: bool = Field(
+        default=False, description="Serve read tools from an in-memory snapshot"
+    )
+    snapshot_refresh_interval: float = Field(
+        default=300.0, description="Seconds between snapshot reloads"
+    )
+    snapshot_max_age: float = Field(
+        default=900.0,
+        description="Snapshots older than this fall back to live Nautobot queries",
+    )
+    snapshot_delta_sync: bool = Field(
+        default=True, description="Refresh snapshots incrementally from change data"
+    )
+    snapshot_full_resync_interval: float = Field(
+        default=6 * 3600.0, description="Seconds between forced full reloads"
+    )
+    snapshot_delta_max_objects: int = Field(
+        default=5000, description="Deltas larger than this trigger a full reload"
+    )
+    snapshot_clock_skew: float = Field(
+        default=5.0, description="Seconds of overlap when querying changes since"
+    )
+
+    # Hot location prefetch
+    prefetch_locations: list[str] = Field(
+        default_factory=list,
+        description="Locations whose devices and prefixes are kept in the cache",
+    )
+    prefetch_roles: list[str] = Field(
+        default_factory=list,
+        description="Device roles also prefetched for each prefetch location",
+    )
+    prefetch_interval: float = Field(
+        default=45.0,
+        description="Seconds between prefetch rounds (keep below the cache TTL)",
+    )
+    prefetch_concurrency: int = Field(
+        default=4, description="Prefetch queries running at once"
+    )
+    prefetch_jitter: float = Field(
+        default=2.0, description="Max random delay in seconds before each prefetch"
+    )
+
+    # JSON encoding
+    json_backend: str = Field(
+        default="auto", description="JSON backend: auto, orjson or json"
+    )
+
+    # Prefix lookup index
+    prefix_index_ttl: float = Field(
+        default=300.0,
+        description="Seconds a prefix trie built from live Nautobot data is reused",
+    )
+
+    # Location and role name resolution
+    name_resolution: bool = Field(
+        default=True,
+        description="Resolve location/role names and aliases locally and reject unknown names",
+    )
+    name_index_ttl: float = Field(
+        default=600.0, description="Seconds between reloads of Nautobot name lists"
+    )
+    location_aliases: dict[str, str] = Field(
+        default_factory=dict,
+        description="Extra location aliases, e.g. {'New York Data Center': 'NYDC'}",
+    )
+    role_aliases: dict[str, str] = Field(
+        default_factory=dict,
+        description="Extra device role aliases, e.g. {'WAN Routers': 'WAN'}",
+    )
+
+    # Tool execution
+    tool_max_concurrency: int = Field(
+        default=32,
+        description="Tool calls running at once across all tools (0 = no limit)",
+    )
+    tool_max_concurrency_per_tool: int = Field(
+        default=16, description="Calls of any one tool running at once (0 = no limit)"
+    )
+    tool_concurrency_limits: dict[str, int] = Field(
+        default_factory=dict,
+        description="Per-tool overrides, e.g. {'lookup_ip_addresses': 4}",
+    )
+    tool_queue_size: int = Field(
+        default=64, description="Calls that may wait for a slot before 429s"
+    )
+    tool_queue_timeout: float = Field(
+        default=5.0, description="Seconds a call may wait for a slot (0 = no limit)"
+    )
+    tool_threads: int = Field(
+        default=8, description="Worker threads for synchronous tools"
+    )
+    tool_batch_max_calls: int = Field(
+        default=100, description="Most calls accepted in one batch request"
+    )
+    tool_batch_concurrency: int = Field(
+        default=8, description="Calls of one batch request running at once"
+    )
+
+    # Observability
+    metrics_enabled: bool = Field(
+        default=True, description="Record Prometheus metrics and serve /metrics"
+    )
+    tracing_enabled: bool = Field(
+        default=False,
+        description="Export request phase spans through OpenTelemetry (needs opentelemetry-api)",
+    )
+    profile_token: str | None = Field(
+        default=None,
+        description="Secret that enables per-request profiles via the X-Profile header",
+    )
+    profile_interval: float = Field(
+        default=0.005, description="Seconds between stack samples while profiling"
+    )
+    profile_dir: str | None = Field(
+        default=None,
+        description="Write profiles here instead of returning them in the response",
+    )
+
     # Auth
     auth_mode: str = Field(
         default="none", description="Auth mode: none|api_key|basic|bearer|oidc"
@@ -100,9 +334,72 @@ def get_settings() -> Settings:
             "host": "HOST",
             "port": "PORT",
             "log_level": "LOG_LEVEL",
+            "workers": "WORKERS",
             "nautobot_url": "NAUTOBOT_URL",
             "graphql_path": "GRAPHQL_PATH",
             "nautobot_token": "NAUTOBOT_TOKEN",
+            "http_pool_connections": "HTTP_POOL_CONNECTIONS",
+            "http_pool_maxsize": "HTTP_POOL_MAXSIZE",
+            "http_pool_block": "HTTP_POOL_BLOCK",
+            "http_keepalive": "HTTP_KEEPALIVE",
+            "graphql_page_size": "GRAPHQL_PAGE_SIZE",
+            "graphql_page_concurrency": "GRAPHQL_PAGE_CONCURRENCY",
+            "graphql_max_aliases": "GRAPHQL_MAX_ALIASES",
+            "cache_enabled": "CACHE_ENABLED",
+            "cache_default_ttl": "CACHE_DEFAULT_TTL",
+            "cache_ttls": "CACHE_TTLS",
+            "cache_max_entries": "CACHE_MAX_ENTRIES",
+            "cache_max_bytes": "CACHE_MAX_BYTES",
+            "cache_stale_ttl": "CACHE_STALE_TTL",
+            "cache_shared_path": "CACHE_SHARED_PATH",
+            "cache_dir": "CACHE_DIR",
+            "cache_disk_max_bytes": "CACHE_DISK_MAX_BYTES",
+            "cache_warm_start": "CACHE_WARM_START",
+            "upstream_concurrency_initial": "UPSTREAM_CONCURRENCY_INITIAL",
+            "upstream_concurrency_min": "UPSTREAM_CONCURRENCY_MIN",
+            "upstream_concurrency_max": "UPSTREAM_CONCURRENCY_MAX",
+            "upstream_latency_target": "UPSTREAM_LATENCY_TARGET",
+            "upstream_queue_timeout": "UPSTREAM_QUEUE_TIMEOUT",
+            "breaker_failure_threshold": "BREAKER_FAILURE_THRESHOLD",
+            "breaker_reset_timeout": "BREAKER_RESET_TIMEOUT",
+            "upstream_attempt_timeout": "UPSTREAM_ATTEMPT_TIMEOUT",
+            "upstream_deadline": "UPSTREAM_DEADLINE",
+            "upstream_retries": "UPSTREAM_RETRIES",
+            "upstream_backoff_base": "UPSTREAM_BACKOFF_BASE",
+            "upstream_backoff_max": "UPSTREAM_BACKOFF_MAX",
+            "upstream_hedge": "UPSTREAM_HEDGE",
+            "upstream_hedge_min_delay": "UPSTREAM_HEDGE_MIN_DELAY",
+            "snapshot_enabled": "SNAPSHOT_ENABLED",
+            "snapshot_refresh_interval": "SNAPSHOT_REFRESH_INTERVAL",
+            "snapshot_max_age": "SNAPSHOT_MAX_AGE",
+            "snapshot_delta_sync": "SNAPSHOT_DELTA_SYNC",
+            "snapshot_full_resync_interval": "SNAPSHOT_FULL_RESYNC_INTERVAL",
+            "snapshot_delta_max_objects": "SNAPSHOT_DELTA_MAX_OBJECTS",
+            "snapshot_clock_skew": "SNAPSHOT_CLOCK_SKEW",
+            "prefetch_locations": "PREFETCH_LOCATIONS",
+            "prefetch_roles": "PREFETCH_ROLES",
+            "prefetch_interval": "PREFETCH_INTERVAL",
+            "prefetch_concurrency": "PREFETCH_CONCURRENCY",
+            "prefetch_jitter": "PREFETCH_JITTER",
+            "prefix_index_ttl": "PREFIX_INDEX_TTL",
+            "json_backend": "JSON_BACKEND",
+            "name_resolution": "NAME_RESOLUTION",
+            "name_index_ttl": "NAME_INDEX_TTL",
+            "location_aliases": "LOCATION_ALIASES",
+            "role_aliases": "ROLE_ALIASES",
+            "tool_max_concurrency": "TOOL_MAX_CONCURRENCY",
+            "tool_max_concurrency_per_tool": "TOOL_MAX_CONCURRENCY_PER_TOOL",
+            "tool_concurrency_limits": "TOOL_CONCURRENCY_LIMITS",
+            "tool_queue_size": "TOOL_QUEUE_SIZE",
+            "tool_queue_timeout": "TOOL_QUEUE_TIMEOUT",
+            "tool_threads": "TOOL_THREADS",
+            "tool_batch_max_calls": "TOOL_BATCH_MAX_CALLS",
+            "tool_batch_concurrency": "TOOL_BATCH_CONCURRENCY",
+            "metrics_enabled": "METRICS_ENABLED",
+            "tracing_enabled": "TRACING_ENABLED",
+            "profile_token": "PROFILE_TOKEN",
+            "profile_interval": "PROFILE_INTERVAL",
+            "profile_dir": "PROFILE_DIR",
             "auth_mode": "AUTH_MODE",
             "api_keys": "API_KEYS",
             "enable_chainlit": "ENABLE_CHAINLIT",
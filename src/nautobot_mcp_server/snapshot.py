@@ -0,0 +1,363 @@
+"""Optional in-memory inventory snapshot with secondary indexes for read tools."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from typing import Any
+
+import structlog
+
+from .clients import nautobot_graphql as nb
+from .clients.cache import QueryCache
+from .clients.nautobot_graphql import NautobotGraphQLClient
+from .clients.nautobot_sync import (
+    InventoryDelta,
+    SyncStats,
+    fetch_inventory,
+    fetch_inventory_delta,
+)
+from .clients.shared_cache import SharedCache
+from .settings import get_settings
+
+logger = structlog.get_logger(__name__)
+
+Record = dict[str, Any]
+
+# Workers sharing a cache tier take turns at full syncs under this lease
+FULL_SYNC_LEASE = "snapshot-full-sync"
+_FULL_SYNC_TURN_TIMEOUT = 300.0
+# Full sync pages stay in the shared tier this long for the other workers
+_SHARED_PAGE_TTL = 60.0
+Extractor = Callable[[Record], Iterable[Any]]
+
+DEVICE_INDEXES: dict[str, Extractor] = {
+    "location": lambda d: (d.get("location"),),
+    "role": lambda d: (d.get("role"),),
+    "platform": lambda d: (d.get("platform"),),
+    "status": lambda d: (d.get("status"),),
+    "manufacturer": lambda d: ((d.get("device_type") or {}).get("manufacturer"),),
+}
+
+PREFIX_INDEXES: dict[str, Extractor] = {
+    "location": lambda p: p.get("locations") or (),
+    "role": lambda p: (p.get("role"),),
+    "status": lambda p: (p.get("status"),),
+}
+
+
+class IndexedTable:
+    """Records keyed by a stable key with one inverted index per attribute.
+
+    Posting lists are dicts used as ordered sets, so records can be added or
+    removed in constant time while delta syncs update the table in place.
+    """
+
+    def __init__(self, extractors: dict[str, Extractor]):
+        self.extractors = extractors
+        self.rows: dict[Hashable, Record] = {}
+        self.indexes: dict[str, dict[Any, dict[Hashable, None]]] = {
+            name: {} for name in extractors
+        }
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def add(self, key: Hashable, record: Record) -> None:
+        with self._lock:
+            if key in self.rows:
+                self.remove(key)
+            self.rows[key] = record
+            for name, extract in self.extractors.items():
+                index = self.indexes[name]
+                for value in extract(record):
+                    index.setdefault(value, {})[key] = None
+
+    def remove(self, key: Hashable) -> Record | None:
+        with self._lock:
+            record = self.rows.pop(key, None)
+            if record is None:
+                return None
+            for name, extract in self.extractors.items():
+                index = self.indexes[name]
+                for value in extract(record):
+                    postings = index.get(value)
+                    if postings is not None:
+                        postings.pop(key, None)
+                        if not postings:
+                            del index[value]
+            return record
+
+    def select(self, **filters: Any) -> list[Record]:
+        """Return records matching every filter.
+
+        A filter value may be a single value or a list of accepted values.
+        """
+        with self._lock:
+            return self._select(filters)
+
+    def _select(self, filters: dict[str, Any]) -> list[Record]:
+        if not filters:
+            return list(self.rows.values())
+
+        candidates: list[dict[Hashable, None]] = []
+        for name, wanted in filters.items():
+            index = self.indexes[name]
+            values = (
+                list(wanted) if isinstance(wanted, list | tuple | set) else [wanted]
+            )
+            if len(values) == 1:
+                candidates.append(index.get(values[0], {}))
+            else:
+                merged: dict[Hashable, None] = {}
+                for value in values:
+                    merged.update(index.get(value, {}))
+                candidates.append(merged)
+
+        # Walk the shortest posting list and probe the others
+        candidates.sort(key=len)
+        smallest, rest = candidates[0], candidates[1:]
+        return [self.rows[k] for k in smallest if all(k in other for other in rest)]
+
+
+def _keyed(records: Mapping[Any, Record] | Iterable[Record]) -> Iterable[Any]:
+    if isinstance(records, Mapping):
+        return records.items()
+    return enumerate(records)
+
+
+class InventorySnapshot:
+    """A copy of devices and prefixes as of ``loaded_at``.
+
+    Records are keyed by Nautobot object id (or load position when ids are not
+    known) so incremental changes can be applied in place.
+    """
+
+    def __init__(
+        self,
+        devices: Mapping[Any, Record] | Iterable[Record],
+        prefixes: Mapping[Any, Record] | Iterable[Record],
+        loaded_at: float | None = None,
+    ):
+        self.devices = IndexedTable(DEVICE_INDEXES)
+        self.prefixes = IndexedTable(PREFIX_INDEXES)
+        for key, device in _keyed(devices):
+            self.devices.add(key, device)
+        for key, prefix in _keyed(prefixes):
+            self.prefixes.add(key, prefix)
+        self.loaded_at = time.time() if loaded_at is None else loaded_at
+
+    def age(self) -> float:
+        return max(time.time() - self.loaded_at, 0.0)
+
+    def apply(self, delta: InventoryDelta, synced_at: float) -> None:
+        """Apply created, updated and deleted objects and advance ``loaded_at``."""
+        for key, device in delta.devices.items():
+            self.devices.add(key, device)
+        for key, prefix in delta.prefixes.items():
+            self.prefixes.add(key, prefix)
+        for key in delta.deleted:
+            self.devices.remove(key)
+            self.prefixes.remove(key)
+        self.loaded_at = synced_at
+
+
+class SnapshotManager:
+    """Loads snapshots periodically and decides whether they may serve reads."""
+
+    def __init__(
+        self,
+        client: NautobotGraphQLClient | None = None,
+        enabled: bool | None = None,
+        refresh_interval: float | None = None,
+        max_age: float | None = None,
+        delta_sync: bool | None = None,
+        shared: SharedCache | None = None,
+    ):
+        settings = get_settings()
+        self.enabled = settings.snapshot_enabled if enabled is None else enabled
+        self.refresh_interval = (
+            settings.snapshot_refresh_interval
+            if refresh_interval is None
+            else refresh_interval
+        )
+        self.max_age = settings.snapshot_max_age if max_age is None else max_age
+        self.delta_sync = (
+            settings.snapshot_delta_sync if delta_sync is None else delta_sync
+        )
+        self.full_resync_interval = settings.snapshot_full_resync_interval
+        self.delta_max_objects = settings.snapshot_delta_max_objects
+        self.clock_skew = settings.snapshot_clock_skew
+        self._client = client
+        self.shared = nb.query_cache.shared if shared is None else shared
+        self.snapshot: InventorySnapshot | None = None
+        self.stats = SyncStats()
+        self._last_full_sync = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def client(self) -> NautobotGraphQLClient:
+        if self._client is None:
+            # Full loads bypass the in-memory result cache so they do not evict
+            # it; with a shared tier, pages go there alone (nothing fits in
+            # max_bytes=0) so other workers can read them
+            cache = (
+                QueryCache(
+                    max_entries=1,
+                    max_bytes=0,
+                    default_ttl=_SHARED_PAGE_TTL,
+                    shared=self.shared,
+                )
+                if self.shared is not None
+                else QueryCache(max_entries=0)
+            )
+            self._client = NautobotGraphQLClient(cache=cache)
+        return self._client
+
+    def refresh(self) -> InventorySnapshot | None:
+        """Bring the snapshot up to date, incrementally when possible.
+
+        Falls back to a full reload when there is no snapshot yet, the periodic
+        full resync is due, the delta is too large, or the delta fetch fails.
+        """
+        snapshot = self.snapshot
+        if not self.delta_sync or snapshot is None:
+            return self.full_sync()
+        if time.time() - self._last_full_sync >= self.full_resync_interval:
+            self.stats.record_fallback("scheduled")
+            return self.full_sync()
+
+        started = time.time()
+        try:
+            # Overlap the window a little to tolerate clock skew with Nautobot
+            delta = fetch_inventory_delta(
+                self.client, snapshot.loaded_at - self.clock_skew
+            )
+        except Exception as e:
+            logger.warning("Delta sync failed, falling back to full sync", error=str(e))
+            self.stats.failures += 1
+            self.stats.record_fallback("error")
+            return self.full_sync()
+        if delta.size > self.delta_max_objects:
+            self.stats.record_fallback("delta_too_large")
+            return self.full_sync()
+
+        snapshot.apply(delta, synced_at=started)
+        if delta.size:
+            _invalidate_cached_results(bool(delta.devices), bool(delta.prefixes))
+        self.stats.delta_syncs += 1
+        self.stats.last_delta_size = delta.size
+        self.stats.last_sync_at = started
+        return snapshot
+
+    def full_sync(self) -> InventorySnapshot | None:
+        """Load a complete snapshot and swap it in atomically.
+
+        Returns ``None`` and keeps the current snapshot when the manager is
+        stopped while waiting for its turn.
+        """
+        started = time.time()
+        with self._full_sync_turn() as turn:
+            if not turn:
+                return None
+            devices, prefixes = fetch_inventory(self.client, fresh=self.shared is None)
+        self.snapshot = InventorySnapshot(devices, prefixes, loaded_at=started)
+        self._last_full_sync = started
+        self.stats.full_syncs += 1
+        self.stats.last_sync_at = started
+        logger.info(
+            "Loaded inventory snapshot",
+            devices=len(devices),
+            prefixes=len(prefixes),
+            seconds=round(time.time() - started, 3),
+        )
+        return self.snapshot
+
+    @contextmanager
+    def _full_sync_turn(self) -> Iterator[bool]:
+        """Wait for other workers' full syncs to finish before this one.
+
+        The first worker loads pages from Nautobot into the shared tier and
+        those syncing after it within ``_SHARED_PAGE_TTL`` read them from
+        there. After ``_FULL_SYNC_TURN_TIMEOUT`` the sync goes ahead anyway,
+        without the lease. Yields ``False`` if the manager is stopped while
+        waiting, in which case the sync must be skipped.
+        """
+        if self.shared is None:
+            yield True
+            return
+        owner = str(os.getpid())
+        deadline = time.monotonic() + _FULL_SYNC_TURN_TIMEOUT
+        acquired = self.shared.acquire(FULL_SYNC_LEASE, owner, _FULL_SYNC_TURN_TIMEOUT)
+        while not acquired and time.monotonic() < deadline:
+            if self._stop.wait(0.5):
+                yield False
+                return
+            acquired = self.shared.acquire(
+                FULL_SYNC_LEASE, owner, _FULL_SYNC_TURN_TIMEOUT
+            )
+        try:
+            yield True
+        finally:
+            if acquired:
+                self.shared.release(FULL_SYNC_LEASE, owner)
+
+    def current(self) -> InventorySnapshot | None:
+        """Return the snapshot if snapshot mode is on and it is within ``max_age``."""
+        snapshot = self.snapshot
+        if not self.enabled or snapshot is None or snapshot.age() > self.max_age:
+            return None
+        return snapshot
+
+    def annotate(
+        self, result: dict[str, Any], served: InventorySnapshot | None
+    ) -> dict[str, Any]:
+        """Add snapshot source and age to a tool response when snapshot mode is on."""
+        if not self.enabled:
+            return result
+        result["source"] = "snapshot" if served is not None else "nautobot"
+        snapshot = self.snapshot
+        result["snapshot_age"] = round(snapshot.age(), 3) if snapshot else None
+        return result
+
+    def start(self) -> None:
+        """Start the background refresh thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="inventory-snapshot", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                self.stats.failures += 1
+                logger.error("Inventory snapshot refresh failed", error=str(e))
+            self._stop.wait(self.refresh_interval)
+
+
+def _invalidate_cached_results(devices: bool, prefixes: bool) -> None:
+    """Drop cached query results that may contain changed objects."""
+    fields = [
+        f for f, changed in (("devices(", devices), ("prefixes(", prefixes)) if changed
+    ]
+    removed = nb.query_cache.invalidate(lambda key: any(f in key for f in fields))
+    logger.info("Invalidated cached results after delta sync", entries=removed)
+
+
+manager = SnapshotManager()
@@ -0,0 +1,126 @@
+"""NDJSON encoding of tool results for streamed ``/tools/invoke`` responses.
+
+A stream is a header line, one line per device or prefix, and an end line::
+
+    {"type": "header", "tool_name": "get_prefixes_by_location_enhanced"}
+    {"prefix": "10.0.0.0/24", ...}
+    {"type": "end", "success": true, "count": 1}
+
+Tools listed in :data:`SOURCES` produce their records from the async client's
+page iterators while holding their scheduler slot, so memory stays at about
+one page however large the result is. Other tools run as usual and their
+``data`` list is written out record by record. A failure after the header is
+reported on the end line (``success: false`` with an ``error``).
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Callable, Iterable
+from contextlib import AsyncExitStack
+from typing import Any
+
+import structlog
+
+from . import aliases, metrics, serialization
+from .scheduler import BusyError, scheduler
+from .tools.devices import (
+    stream_devices_by_location,
+    stream_devices_by_location_and_role,
+)
+from .tools.prefixes import stream_prefixes_by_location
+
+logger = structlog.get_logger(__name__)
+
+MEDIA_TYPE = "application/x-ndjson"
+
+# Lines are sent in chunks of about this many bytes rather than one by one
+CHUNK_SIZE = 64 * 1024
+
+# Tool name -> record generator taking the tool's arguments
+SOURCES: dict[str, Callable[..., AsyncIterator[dict[str, Any]]]] = {
+    "get_devices_by_location": stream_devices_by_location,
+    "get_devices_by_location_and_role": stream_devices_by_location_and_role,
+    "get_prefixes_by_location_enhanced": stream_prefixes_by_location,
+}
+
+
+async def _records(items: Iterable[dict[str, Any]]) -> AsyncIterator[dict[str, Any]]:
+    for item in items:
+        yield item
+
+
+async def ndjson(
+    tool_name: str, fn: Callable[..., Any], args: dict[str, Any]
+) -> AsyncIterator[bytes]:
+    """Run a tool and yield its result as NDJSON chunks.
+
+    The first chunk is the header alone, produced once the call has its
+    scheduler slot: awaiting it raises :class:`~.scheduler.BusyError` before any
+    response has started.
+    """
+    timer = metrics.ToolTimer(tool_name, "stream")
+    end: dict[str, Any] = {"type": "end", "success": True, "count": 0}
+    size = 0
+    outcome: str | None = None
+    try:
+        async with AsyncExitStack() as stack:
+            header: dict[str, Any] = {"type": "header", "tool_name": tool_name}
+            source = SOURCES.get(tool_name)
+            if source is not None:
+                await stack.enter_async_context(scheduler.slot(tool_name))
+                records = source(**args)
+            else:
+                result = await scheduler.run(tool_name, fn, args)
+                data = result.get("data") if isinstance(result, dict) else None
+                if isinstance(data, list):
+                    header.update((k, v) for k, v in result.items() if k != "data")
+                    end["success"] = result.get("success", True)
+                    records = _records(data)
+                else:
+                    header["result"] = result
+                    records = _records(())
+
+            line = serialization.dumps(header) + b"\n"
+            size += len(line)
+            yield line
+
+            buffer: list[bytes] = []
+            buffered = 0
+            try:
+                async for record in records:
+                    line = serialization.dumps(record)
+                    buffer.append(line)
+                    buffered += len(line) + 1
+                    end["count"] += 1
+                    if buffered >= CHUNK_SIZE:
+                        buffer.append(b"")
+                        chunk = b"\n".join(buffer)
+                        buffer, buffered = [], 0
+                        size += len(chunk)
+                        yield chunk
+            except Exception as e:
+                logger.error("Streamed tool call failed", tool=tool_name, error=str(e))
+                end.update(success=False, error=str(e), **aliases.error_details(e))
+            buffer.append(serialization.dumps(end))
+            buffer.append(b"")
+            chunk = b"\n".join(buffer)
+            size += len(chunk)
+            yield chunk
+    except BusyError:
+        outcome = "busy"
+        raise
+    except BaseException:
+        # Includes a client disconnecting mid-stream
+        outcome = "exception"
+        raise
+    finally:
+        timer.done(
+            {"success": end["success"], "count": end["count"]}, size, outcome=outcome
+        )
+
+
+async def prepend(first: bytes, rest: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """``first`` followed by the remaining chunks of ``rest``."""
+    yield first
+    async for chunk in rest:
+        yield chunk
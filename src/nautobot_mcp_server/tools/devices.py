@@ -1,118 +1,478 @@
 """Device tools that return raw JSON data only (formatting/analysis handled by the LLM)."""
 
+from collections.abc import AsyncIterator
 from typing import Any
 
 import structlog
 
+from .. import aliases, formats, snapshot
 from ..clients import nautobot_graphql as nb
 
 logger = structlog.get_logger(__name__)
 
 
-def get_devices_by_location(location_name: str) -> dict[str, Any]:
+def _devices_by_location_result(
+    location_name: str,
+    devices: list[dict[str, Any]],
+    served: snapshot.InventorySnapshot | None = None,
+) -> dict[str, Any]:
+    if not devices:
+        return snapshot.manager.annotate(
+            {
+                "success": True,
+                "message": f"No devices found at location '{location_name}'",
+                "data": [],
+                "count": 0,
+            },
+            served,
+        )
+
+    result = {
+        "success": True,
+        "message": f"Found {len(devices)} devices at location '{location_name}'",
+        "count": len(devices),
+        "data": devices,
+    }
+
+    logger.info(
+        "Successfully retrieved devices", location=location_name, count=len(devices)
+    )
+
+    return snapshot.manager.annotate(result, served)
+
+
+def _devices_by_location_error(
+    location_name: str,
+    e: Exception,
+    served: snapshot.InventorySnapshot | None = None,
+) -> dict[str, Any]:
+    logger.error(
+        "Failed to get devices for location", location=location_name, error=str(e)
+    )
+    return snapshot.manager.annotate(
+        {
+            "success": False,
+            "error": f"Failed to get devices for location '{location_name}': {str(e)}",
+            "data": [],
+            "count": 0,
+            **aliases.error_details(e),
+        },
+        served,
+    )
+
+
+def _devices_by_location_and_role_result(
+    location_name: str,
+    role_name: str,
+    devices: list[dict[str, Any]],
+    served: snapshot.InventorySnapshot | None = None,
+) -> dict[str, Any]:
+    if not devices:
+        return snapshot.manager.annotate(
+            {
+                "success": True,
+                "message": f"No devices with role '{role_name}' found at location '{location_name}'",
+                "data": [],
+                "count": 0,
+            },
+            served,
+        )
+
+    result = {
+        "success": True,
+        "message": f"Found {len(devices)} devices with role '{role_name}' at location '{location_name}'",
+        "count": len(devices),
+        "data": devices,
+    }
+
+    logger.info(
+        "Successfully retrieved devices",
+        location=location_name,
+        role=role_name,
+        count=len(devices),
+    )
+
+    return snapshot.manager.annotate(result, served)
+
+
+def _devices_by_location_and_role_error(
+    location_name: str,
+    role_name: str,
+    e: Exception,
+    served: snapshot.InventorySnapshot | None = None,
+) -> dict[str, Any]:
+    logger.error(
+        "Failed to get devices for location and role",
+        location=location_name,
+        role=role_name,
+        error=str(e),
+    )
+    return snapshot.manager.annotate(
+        {
+            "success": False,
+            "error": f"Failed to get devices with role '{role_name}' at location '{location_name}': {str(e)}",
+            "data": [],
+            "count": 0,
+            **aliases.error_details(e),
+        },
+        served,
+    )
+
+
+def get_devices_by_location(
+    location_name: str,
+    fresh: bool = False,
+    fields: list[str] | None = None,
+    format: str = "json",
+) -> dict[str, Any]:
     """Get devices by location name and return raw JSON data.
 
     Args:
         location_name: The name of the location (e.g., "NY Data Center", "Campus A")
+        fresh: Bypass the result cache and read from Nautobot
+        fields: Optional device fields to return (``name`` is always included)
+        format: ``"columnar"`` for column names plus row arrays, else JSON records
 
     Returns:
         Dictionary containing device data in JSON format
     """
+    served = None if fresh else snapshot.manager.current()
     try:
         logger.info("Getting devices by location", location=location_name)
+        location_name = aliases.resolver.resolve_name("location", location_name)
 
-        # Get devices from Nautobot
-        devices = nb.client.get_devices_by_location(location_name)
+        if served is not None:
+            devices = nb.project_records(
+                "devices", served.devices.select(location=location_name), fields
+            )
+        else:
+            # Get devices from Nautobot
+            devices = nb.client.get_devices_by_location(
+                location_name, fresh=fresh, fields=fields
+            )
 
-        if not devices:
-            return {
-                "success": True,
-                "message": f"No devices found at location '{location_name}'",
-                "data": [],
-                "count": 0,
-            }
+        return formats.encode_result(
+            _devices_by_location_result(location_name, devices, served), format
+        )
 
-        result = {
-            "success": True,
-            "message": f"Found {len(devices)} devices at location '{location_name}'",
-            "count": len(devices),
-            "data": devices,
-        }
+    except Exception as e:
+        return _devices_by_location_error(location_name, e, served)
 
-        logger.info(
-            "Successfully retrieved devices", location=location_name, count=len(devices)
+
+async def get_devices_by_location_async(
+    location_name: str,
+    fresh: bool = False,
+    fields: list[str] | None = None,
+    format: str = "json",
+) -> dict[str, Any]:
+    """Async variant of :func:`get_devices_by_location` using the async client."""
+    served = None if fresh else snapshot.manager.current()
+    try:
+        logger.info("Getting devices by location", location=location_name)
+        location_name = await aliases.resolver.resolve_name_async(
+            "location", location_name
         )
 
-        return result
+        if served is not None:
+            devices = nb.project_records(
+                "devices", served.devices.select(location=location_name), fields
+            )
+        else:
+            devices = await nb.async_client.get_devices_by_location(
+                location_name, fresh=fresh, fields=fields
+            )
 
-    except Exception as e:
-        logger.error(
-            "Failed to get devices for location", location=location_name, error=str(e)
+        return formats.encode_result(
+            _devices_by_location_result(location_name, devices, served), format
         )
-        return {
-            "success": False,
-            "error": f"Failed to get devices for location '{location_name}': {str(e)}",
-            "data": [],
-            "count": 0,
-        }
+
+    except Exception as e:
+        return _devices_by_location_error(location_name, e, served)
 
 
 def get_devices_by_location_and_role(
-    location_name: str, role_name: str
+    location_name: str,
+    role_name: str,
+    fresh: bool = False,
+    fields: list[str] | None = None,
+    format: str = "json",
 ) -> dict[str, Any]:
     """Get devices by location and role, returning raw JSON data.
 
     Args:
         location_name: The name of the location (e.g., "NY Data Center", "Campus A")
         role_name: The name of the device role (e.g., "WAN Router", "Access Switch")
+        fresh: Bypass the result cache and read from Nautobot
+        fields: Optional device fields to return (``name`` is always included)
+        format: ``"columnar"`` for column names plus row arrays, else JSON records
 
     Returns:
         Dictionary containing device data in JSON format
     """
+    served = None if fresh else snapshot.manager.current()
     try:
         logger.info(
             "Getting devices by location and role",
             location=location_name,
             role=role_name,
         )
+        location_name = aliases.resolver.resolve_name("location", location_name)
+        role_name = aliases.resolver.resolve_name("role", role_name)
 
-        # Get devices from Nautobot
-        devices = nb.client.get_devices_by_location_and_role(location_name, role_name)
+        if served is not None:
+            devices = nb.project_records(
+                "devices",
+                served.devices.select(location=location_name, role=role_name),
+                fields,
+            )
+        else:
+            # Get devices from Nautobot
+            devices = nb.client.get_devices_by_location_and_role(
+                location_name, role_name, fresh=fresh, fields=fields
+            )
 
-        if not devices:
-            return {
-                "success": True,
-                "message": f"No devices with role '{role_name}' found at location '{location_name}'",
-                "data": [],
-                "count": 0,
-            }
+        return formats.encode_result(
+            _devices_by_location_and_role_result(
+                location_name, role_name, devices, served
+            ),
+            format,
+        )
 
-        result = {
-            "success": True,
-            "message": f"Found {len(devices)} devices with role '{role_name}' at location '{location_name}'",
-            "count": len(devices),
-            "data": devices,
-        }
+    except Exception as e:
+        return _devices_by_location_and_role_error(location_name, role_name, e, served)
 
+
+async def get_devices_by_location_and_role_async(
+    location_name: str,
+    role_name: str,
+    fresh: bool = False,
+    fields: list[str] | None = None,
+    format: str = "json",
+) -> dict[str, Any]:
+    """Async variant of :func:`get_devices_by_location_and_role`."""
+    served = None if fresh else snapshot.manager.current()
+    try:
         logger.info(
-            "Successfully retrieved devices",
+            "Getting devices by location and role",
             location=location_name,
             role=role_name,
-            count=len(devices),
         )
+        location_name = await aliases.resolver.resolve_name_async(
+            "location", location_name
+        )
+        role_name = await aliases.resolver.resolve_name_async("role", role_name)
+
+        if served is not None:
+            devices = nb.project_records(
+                "devices",
+                served.devices.select(location=location_name, role=role_name),
+                fields,
+            )
+        else:
+            devices = await nb.async_client.get_devices_by_location_and_role(
+                location_name, role_name, fresh=fresh, fields=fields
+            )
 
-        return result
+        return formats.encode_result(
+            _devices_by_location_and_role_result(
+                location_name, role_name, devices, served
+            ),
+            format,
+        )
 
     except Exception as e:
-        logger.error(
-            "Failed to get devices for location and role",
-            location=location_name,
-            role=role_name,
-            error=str(e),
+        return _devices_by_location_and_role_error(location_name, role_name, e, served)
+
+
+async def stream_devices_by_location(
+    location_name: str,
+    fresh: bool = False,
+    fields: list[str] | None = None,
+    format: str = "json",
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield the devices at a location one by one for streamed responses.
+
+    Records come from the client's page iterator, so only one page is held at
+    a time. ``format`` is accepted for signature parity; records are JSON.
+    """
+    served = None if fresh else snapshot.manager.current()
+    location_name = await aliases.resolver.resolve_name_async("location", location_name)
+    if served is not None:
+        for record in nb.project_records(
+            "devices", served.devices.select(location=location_name), fields
+        ):
+            yield record
+        return
+    async for record in nb.async_client.iter_devices_by_location(
+        location_name, fresh=fresh, fields=fields
+    ):
+        yield record
+
+
+async def stream_devices_by_location_and_role(
+    location_name: str,
+    role_name: str,
+    fresh: bool = False,
+    fields: list[str] | None = None,
+    format: str = "json",
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield the devices with a role at a location one by one."""
+    served = None if fresh else snapshot.manager.current()
+    location_name = await aliases.resolver.resolve_name_async("location", location_name)
+    role_name = await aliases.resolver.resolve_name_async("role", role_name)
+    if served is not None:
+        for record in nb.project_records(
+            "devices",
+            served.devices.select(location=location_name, role=role_name),
+            fields,
+        ):
+            yield record
+        return
+    async for record in nb.async_client.iter_devices_by_location_and_role(
+        location_name, role_name, fresh=fresh, fields=fields
+    ):
+        yield record
+
+
+def _select_devices_by_locations(
+    served: snapshot.InventorySnapshot,
+    location_names: list[str],
+    role_names: list[str] | None,
+    fields: list[str] | None,
+) -> dict[str, list[dict[str, Any]]]:
+    filters: dict[str, Any] = {"role": role_names} if role_names else {}
+    return {
+        name: nb.project_records(
+            "devices", served.devices.select(location=name, **filters), fields
         )
-        return {
+        for name in dict.fromkeys(location_names)
+    }
+
+
+def _devices_by_locations_result(
+    devices_by_location: dict[str, list[dict[str, Any]]],
+    role_names: list[str] | None,
+    served: snapshot.InventorySnapshot | None = None,
+) -> dict[str, Any]:
+    count = sum(len(devices) for devices in devices_by_location.values())
+    roles = f" with roles {role_names}" if role_names else ""
+    logger.info(
+        "Successfully retrieved devices",
+        locations=len(devices_by_location),
+        roles=role_names,
+        count=count,
+    )
+    return snapshot.manager.annotate(
+        {
+            "success": True,
+            "message": f"Found {count} devices{roles} across {len(devices_by_location)} locations",
+            "count": count,
+            "data": devices_by_location,
+        },
+        served,
+    )
+
+
+def _devices_by_locations_error(
+    location_names: list[str],
+    role_names: list[str] | None,
+    e: Exception,
+    served: snapshot.InventorySnapshot | None = None,
+) -> dict[str, Any]:
+    logger.error(
+        "Failed to get devices for locations",
+        locations=location_names,
+        roles=role_names,
+        error=str(e),
+    )
+    return snapshot.manager.annotate(
+        {
             "success": False,
-            "error": f"Failed to get devices with role '{role_name}' at location '{location_name}': {str(e)}",
-            "data": [],
+            "error": f"Failed to get devices for locations {location_names}: {str(e)}",
+            "data": {},
             "count": 0,
-        }
+            **aliases.error_details(e),
+        },
+        served,
+    )
+
+
+def get_devices_by_locations(
+    location_names: list[str],
+    role_names: list[str] | None = None,
+    fresh: bool = False,
+    fields: list[str] | None = None,
+    format: str = "json",
+) -> dict[str, Any]:
+    """Get devices for several locations (optionally limited to roles) in one call.
+
+    Args:
+        location_names: Names of the locations to compare
+        role_names: Optional device role names to filter on
+        fresh: Bypass the result cache and read from Nautobot
+        fields: Optional device fields to return (``name`` is always included)
+        format: ``"columnar"`` for column names plus row arrays, else JSON records
+
+    Returns:
+        Dictionary whose ``data`` maps each location name to its devices
+    """
+    served = None if fresh else snapshot.manager.current()
+    try:
+        logger.info(
+            "Getting devices by locations", locations=location_names, roles=role_names
+        )
+        location_names = aliases.resolver.resolve("location", location_names)
+        if role_names:
+            role_names = aliases.resolver.resolve("role", role_names)
+
+        if served is not None:
+            devices = _select_devices_by_locations(
+                served, location_names, role_names, fields
+            )
+        else:
+            devices = nb.client.get_devices_by_locations(
+                location_names, role_names, fresh=fresh, fields=fields
+            )
+
+        return formats.encode_result(
+            _devices_by_locations_result(devices, role_names, served), format
+        )
+
+    except Exception as e:
+        return _devices_by_locations_error(location_names, role_names, e, served)
+
+
+async def get_devices_by_locations_async(
+    location_names: list[str],
+    role_names: list[str] | None = None,
+    fresh: bool = False,
+    fields: list[str] | None = None,
+    format: str = "json",
+) -> dict[str, Any]:
+    """Async variant of :func:`get_devices_by_locations`."""
+    served = None if fresh else snapshot.manager.current()
+    try:
+        logger.info(
+            "Getting devices by locations", locations=location_names, roles=role_names
+        )
+        location_names = await aliases.resolver.resolve_async(
+            "location", location_names
+        )
+        if role_names:
+            role_names = await aliases.resolver.resolve_async("role", role_names)
+
+        if served is not None:
+            devices = _select_devices_by_locations(
+                served, location_names, role_names, fields
+            )
+        else:
+            devices = await nb.async_client.get_devices_by_locations(
+                location_names, role_names, fresh=fresh, fields=fields
+            )
+
+        return formats.encode_result(
+            _devices_by_locations_result(devices, role_names, served), format
+        )
+
+    except Exception as e:
+        return _devices_by_locations_error(location_names, role_names, e, served)
@@ -1,57 +1,461 @@
 """Prefix tools that return raw JSON data only (formatting/analysis handled by the LLM)."""
 
+import asyncio
+from collections.abc import AsyncIterator
 from typing import Any
 
 import structlog
 
+from .. import aliases, formats, prefix_index, snapshot
 from ..clients import nautobot_graphql as nb
 
 logger = structlog.get_logger(__name__)
 
 
+def _prefixes_by_location_result(
+    location_name: str,
+    prefixes: list[dict[str, Any]],
+    served: snapshot.InventorySnapshot | None = None,
+) -> dict[str, Any]:
+    if not prefixes:
+        return snapshot.manager.annotate(
+            {
+                "success": True,
+                "message": f"No prefixes found at location '{location_name}'",
+                "data": [],
+                "count": 0,
+            },
+            served,
+        )
+    result = {
+        "success": True,
+        "message": f"Found {len(prefixes)} prefixes at location '{location_name}'",
+        "count": len(prefixes),
+        "data": prefixes,
+    }
+
+    logger.info(
+        "Successfully retrieved prefixes",
+        location=location_name,
+        count=len(prefixes),
+    )
+
+    return snapshot.manager.annotate(result, served)
+
+
+def _prefixes_by_location_error(
+    location_name: str,
+    e: Exception,
+    served: snapshot.InventorySnapshot | None = None,
+) -> dict[str, Any]:
+    logger.error(
+        "Failed to get prefixes for location", location=location_name, error=str(e)
+    )
+    return snapshot.manager.annotate(
+        {
+            "success": False,
+            "error": f"Failed to get prefixes for location '{location_name}': {str(e)}",
+            "data": [],
+            "count": 0,
+            **aliases.error_details(e),
+        },
+        served,
+    )
+
+
 def get_prefixes_by_location(
-    location_name: str, format: str = "json"
+    location_name: str,
+    format: str = "json",
+    fresh: bool = False,
+    fields: list[str] | None = None,
 ) -> dict[str, Any]:
     """Get prefixes by location name and return raw JSON data.
 
-    Note: The 'format' argument is accepted for backward compatibility but ignored. The
-    MCP server always returns JSON, leaving all formatting/analysis to the caller/LLM.
+    Note: ``format="columnar"`` returns column names plus row arrays with repeated
+    strings dictionary-encoded; other values ('table', 'csv', ...) are accepted for
+    backward compatibility and return JSON records, leaving formatting to the LLM.
+    Set ``fresh`` to bypass the result cache and read from Nautobot, and
+    ``fields`` to limit the returned prefix fields (``prefix`` is always included).
     """
+    served = None if fresh else snapshot.manager.current()
     try:
         logger.info("Getting prefixes by location", location=location_name)
+        location_name = aliases.resolver.resolve_name("location", location_name)
 
-        # Get prefixes from Nautobot
-        prefixes = nb.client.get_prefixes_by_location(location_name)
+        if served is not None:
+            prefixes = nb.project_records(
+                "prefixes", served.prefixes.select(location=location_name), fields
+            )
+        else:
+            # Get prefixes from Nautobot
+            prefixes = nb.client.get_prefixes_by_location(
+                location_name, fresh=fresh, fields=fields
+            )
 
-        if not prefixes:
-            return {
-                "success": True,
-                "message": f"No prefixes found at location '{location_name}'",
-                "data": [],
-                "count": 0,
-            }
-        result = {
+        return formats.encode_result(
+            _prefixes_by_location_result(location_name, prefixes, served), format
+        )
+
+    except Exception as e:
+        return _prefixes_by_location_error(location_name, e, served)
+
+
+async def get_prefixes_by_location_async(
+    location_name: str,
+    format: str = "json",
+    fresh: bool = False,
+    fields: list[str] | None = None,
+) -> dict[str, Any]:
+    """Async variant of :func:`get_prefixes_by_location` using the async client."""
+    served = None if fresh else snapshot.manager.current()
+    try:
+        logger.info("Getting prefixes by location", location=location_name)
+        location_name = await aliases.resolver.resolve_name_async(
+            "location", location_name
+        )
+
+        if served is not None:
+            prefixes = nb.project_records(
+                "prefixes", served.prefixes.select(location=location_name), fields
+            )
+        else:
+            prefixes = await nb.async_client.get_prefixes_by_location(
+                location_name, fresh=fresh, fields=fields
+            )
+
+        return formats.encode_result(
+            _prefixes_by_location_result(location_name, prefixes, served), format
+        )
+
+    except Exception as e:
+        return _prefixes_by_location_error(location_name, e, served)
+
+
+async def stream_prefixes_by_location(
+    location_name: str,
+    format: str = "json",
+    fresh: bool = False,
+    fields: list[str] | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield the prefixes at a location one by one for streamed responses.
+
+    Records come from the client's page iterator, so only one page is held at
+    a time. ``format`` is accepted for signature parity; records are JSON.
+    """
+    served = None if fresh else snapshot.manager.current()
+    location_name = await aliases.resolver.resolve_name_async("location", location_name)
+    if served is not None:
+        for record in nb.project_records(
+            "prefixes", served.prefixes.select(location=location_name), fields
+        ):
+            yield record
+        return
+    async for record in nb.async_client.iter_prefixes_by_location(
+        location_name, fresh=fresh, fields=fields
+    ):
+        yield record
+
+
+def _prefixes_by_locations_result(
+    prefixes_by_location: dict[str, list[dict[str, Any]]],
+    served: snapshot.InventorySnapshot | None = None,
+) -> dict[str, Any]:
+    count = sum(len(prefixes) for prefixes in prefixes_by_location.values())
+    logger.info(
+        "Successfully retrieved prefixes",
+        locations=len(prefixes_by_location),
+        count=count,
+    )
+    return snapshot.manager.annotate(
+        {
             "success": True,
-            "message": f"Found {len(prefixes)} prefixes at location '{location_name}'",
-            "count": len(prefixes),
-            "data": prefixes,
-        }
+            "message": f"Found {count} prefixes across {len(prefixes_by_location)} locations",
+            "count": count,
+            "data": prefixes_by_location,
+        },
+        served,
+    )
+
 
-        logger.info(
-            "Successfully retrieved prefixes",
-            location=location_name,
-            count=len(prefixes),
+def _prefixes_by_locations_error(
+    location_names: list[str],
+    e: Exception,
+    served: snapshot.InventorySnapshot | None = None,
+) -> dict[str, Any]:
+    logger.error(
+        "Failed to get prefixes for locations", locations=location_names, error=str(e)
+    )
+    return snapshot.manager.annotate(
+        {
+            "success": False,
+            "error": f"Failed to get prefixes for locations {location_names}: {str(e)}",
+            "data": {},
+            "count": 0,
+            **aliases.error_details(e),
+        },
+        served,
+    )
+
+
+def get_prefixes_by_locations(
+    location_names: list[str],
+    fresh: bool = False,
+    fields: list[str] | None = None,
+    format: str = "json",
+) -> dict[str, Any]:
+    """Get prefixes for several locations in one call.
+
+    The ``data`` field maps each location name to its prefixes. Set ``fresh`` to
+    bypass the result cache and read from Nautobot, ``fields`` to limit the
+    returned prefix fields, and ``format="columnar"`` for column/row tables.
+    """
+    served = None if fresh else snapshot.manager.current()
+    try:
+        logger.info("Getting prefixes by locations", locations=location_names)
+        location_names = aliases.resolver.resolve("location", location_names)
+
+        if served is not None:
+            prefixes = {
+                name: nb.project_records(
+                    "prefixes", served.prefixes.select(location=name), fields
+                )
+                for name in dict.fromkeys(location_names)
+            }
+        else:
+            prefixes = nb.client.get_prefixes_by_locations(
+                location_names, fresh=fresh, fields=fields
+            )
+
+        return formats.encode_result(
+            _prefixes_by_locations_result(prefixes, served), format
         )
 
-        return result
+    except Exception as e:
+        return _prefixes_by_locations_error(location_names, e, served)
+
+
+async def get_prefixes_by_locations_async(
+    location_names: list[str],
+    fresh: bool = False,
+    fields: list[str] | None = None,
+    format: str = "json",
+) -> dict[str, Any]:
+    """Async variant of :func:`get_prefixes_by_locations`."""
+    served = None if fresh else snapshot.manager.current()
+    try:
+        logger.info("Getting prefixes by locations", locations=location_names)
+        location_names = await aliases.resolver.resolve_async(
+            "location", location_names
+        )
+
+        if served is not None:
+            prefixes = {
+                name: nb.project_records(
+                    "prefixes", served.prefixes.select(location=name), fields
+                )
+                for name in dict.fromkeys(location_names)
+            }
+        else:
+            prefixes = await nb.async_client.get_prefixes_by_locations(
+                location_names, fresh=fresh, fields=fields
+            )
+
+        return formats.encode_result(
+            _prefixes_by_locations_result(prefixes, served), format
+        )
 
     except Exception as e:
-        logger.error(
-            "Failed to get prefixes for location", location=location_name, error=str(e)
+        return _prefixes_by_locations_error(location_names, e, served)
+
+
+def _snapshot_prefix_index(
+    served: snapshot.InventorySnapshot,
+) -> prefix_index.PrefixIndex:
+    # Delta syncs update the snapshot in place and advance loaded_at
+    source = (id(served), served.loaded_at)
+    index = prefix_index.index_cache.get(source)
+    if index is None:
+        index = prefix_index.PrefixIndex(served.prefixes.select())
+        prefix_index.index_cache.put(source, index)
+    return index
+
+
+def _load_prefix_index(
+    fresh: bool,
+) -> tuple[prefix_index.PrefixIndex, snapshot.InventorySnapshot | None]:
+    served = None if fresh else snapshot.manager.current()
+    if served is not None:
+        return _snapshot_prefix_index(served), served
+    index = None if fresh else prefix_index.index_cache.get("nautobot")
+    if index is None:
+        prefixes = nb.client.get_all_prefixes(fresh=fresh)
+        index = prefix_index.index_cache.put(
+            "nautobot", prefix_index.PrefixIndex(prefixes)
         )
-        return {
+    return index, None
+
+
+async def _load_prefix_index_async(
+    fresh: bool,
+) -> tuple[prefix_index.PrefixIndex, snapshot.InventorySnapshot | None]:
+    served = None if fresh else snapshot.manager.current()
+    if served is not None:
+        return await asyncio.to_thread(_snapshot_prefix_index, served), served
+    index = None if fresh else prefix_index.index_cache.get("nautobot")
+    if index is None:
+        prefixes = await nb.async_client.get_all_prefixes(fresh=fresh)
+        # Building the trie for a large table takes a while; keep the loop free
+        built = await asyncio.to_thread(prefix_index.PrefixIndex, prefixes)
+        index = prefix_index.index_cache.put("nautobot", built)
+    return index, None
+
+
+def _ip_lookup_result(
+    ip_addresses: list[str],
+    index: prefix_index.PrefixIndex,
+    served: snapshot.InventorySnapshot | None = None,
+) -> dict[str, Any]:
+    matches = index.lookup_many(ip_addresses)
+    invalid = [ip for ip, match in matches.items() if match is None]
+    data = {ip: match for ip, match in matches.items() if match is not None}
+    count = sum(1 for match in data.values() if match)
+    logger.info(
+        "Looked up IP addresses",
+        addresses=len(ip_addresses),
+        matched=count,
+        invalid=len(invalid),
+    )
+    result = {
+        "success": True,
+        "message": f"Matched {count} of {len(data)} IP addresses to prefixes",
+        "count": count,
+        "data": data,
+    }
+    if invalid:
+        result["invalid"] = invalid
+    return snapshot.manager.annotate(result, served)
+
+
+def _ip_lookup_error(
+    ip_addresses: list[str],
+    e: Exception,
+    served: snapshot.InventorySnapshot | None = None,
+) -> dict[str, Any]:
+    logger.error("Failed to look up IP addresses", addresses=ip_addresses, error=str(e))
+    return snapshot.manager.annotate(
+        {
             "success": False,
-            "error": f"Failed to get prefixes for location '{location_name}': {str(e)}",
-            "data": [],
+            "error": f"Failed to look up IP addresses {ip_addresses}: {str(e)}",
+            "data": {},
             "count": 0,
-        }
+        },
+        served,
+    )
+
+
+def lookup_ip_addresses(ip_addresses: list[str], fresh: bool = False) -> dict[str, Any]:
+    """Find the most specific prefix containing each IP address.
+
+    The ``data`` field maps each address to the records of its longest matching
+    prefix (empty when nothing matches). Invalid addresses are listed under
+    ``invalid``. Set ``fresh`` to rebuild the prefix index from Nautobot.
+    """
+    served = None
+    try:
+        logger.info("Looking up IP addresses", addresses=len(ip_addresses))
+        index, served = _load_prefix_index(fresh)
+        return _ip_lookup_result(ip_addresses, index, served)
+
+    except Exception as e:
+        return _ip_lookup_error(ip_addresses, e, served)
+
+
+async def lookup_ip_addresses_async(
+    ip_addresses: list[str], fresh: bool = False
+) -> dict[str, Any]:
+    """Async variant of :func:`lookup_ip_addresses`."""
+    served = None
+    try:
+        logger.info("Looking up IP addresses", addresses=len(ip_addresses))
+        index, served = await _load_prefix_index_async(fresh)
+        return _ip_lookup_result(ip_addresses, index, served)
+
+    except Exception as e:
+        return _ip_lookup_error(ip_addresses, e, served)
+
+
+def _prefix_hierarchy_result(
+    prefix: str,
+    limit: int,
+    index: prefix_index.PrefixIndex,
+    served: snapshot.InventorySnapshot | None = None,
+) -> dict[str, Any]:
+    covered = index.covered(prefix, limit=limit + 1, include_self=False)
+    data = {
+        "prefix": index.get(prefix),
+        "covering": index.covering(prefix, include_self=False),
+        "covered": covered[:limit],
+    }
+    count = sum(len(records) for records in data.values())
+    logger.info("Retrieved prefix hierarchy", prefix=prefix, count=count)
+    result = {
+        "success": True,
+        "message": (
+            f"Found {len(data['covering'])} covering and "
+            f"{len(data['covered'])} covered prefixes for '{prefix}'"
+        ),
+        "count": count,
+        "data": data,
+    }
+    if len(covered) > limit:
+        result["truncated"] = True
+    return snapshot.manager.annotate(result, served)
+
+
+def _prefix_hierarchy_error(
+    prefix: str,
+    e: Exception,
+    served: snapshot.InventorySnapshot | None = None,
+) -> dict[str, Any]:
+    logger.error("Failed to get prefix hierarchy", prefix=prefix, error=str(e))
+    return snapshot.manager.annotate(
+        {
+            "success": False,
+            "error": f"Failed to get prefix hierarchy for '{prefix}': {str(e)}",
+            "data": {},
+            "count": 0,
+        },
+        served,
+    )
+
+
+def get_prefix_hierarchy(
+    prefix: str, limit: int = 1000, fresh: bool = False
+) -> dict[str, Any]:
+    """Get the prefixes containing and contained in ``prefix``.
+
+    ``data`` holds the exact match under ``prefix``, the covering prefixes
+    (shortest first) and up to ``limit`` covered prefixes in address order.
+    """
+    served = None
+    try:
+        logger.info("Getting prefix hierarchy", prefix=prefix)
+        index, served = _load_prefix_index(fresh)
+        return _prefix_hierarchy_result(prefix, limit, index, served)
+
+    except Exception as e:
+        return _prefix_hierarchy_error(prefix, e, served)
+
+
+async def get_prefix_hierarchy_async(
+    prefix: str, limit: int = 1000, fresh: bool = False
+) -> dict[str, Any]:
+    """Async variant of :func:`get_prefix_hierarchy`."""
+    served = None
+    try:
+        logger.info("Getting prefix hierarchy", prefix=prefix)
+        index, served = await _load_prefix_index_async(fresh)
+        return _prefix_hierarchy_result(prefix, limit, index, served)
+
+    except Exception as e:
+        return _prefix_hierarchy_error(prefix, e, served)
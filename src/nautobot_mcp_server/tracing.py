@@ -0,0 +1,298 @@
+"""Opt-in tracing spans and per-request sampling profiles.
+
+:func:`span` marks a phase of a request (Nautobot POST, JSON decode,
+normalization, log rendering, response encoding, ...). With tracing off and
+no profile being captured it returns a shared no-op object, so instrumented
+code pays one context variable lookup per span.
+
+Spans are exported through OpenTelemetry when ``tracing_enabled`` is set and
+``opentelemetry-api`` is installed (``pip install mcp-nautobot[tracing]`` also
+installs the SDK and OTLP exporter, configured by the standard ``OTEL_*``
+environment variables). Independently, a request carrying the
+``X-Profile`` header with the configured ``profile_token`` is captured by a
+:class:`Capture`: its spans plus a stack-sampling profile are returned with
+the response or written to ``profile_dir``.
+"""
+
+from __future__ import annotations
+
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Mapping
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, TypeVar
+
+import mcp.types as mcp_types
+import structlog
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from fastmcp.tools.tool import ToolResult
+
+from .settings import get_settings
+
+try:
+    from opentelemetry import trace
+except ImportError:  # pragma: no cover - depends on the environment
+    trace = None  # type: ignore[assignment]
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+PROFILE_HEADER = "X-Profile"
+
+_tracer: Any = None
+_capture: ContextVar[Capture | None] = ContextVar("nautobot_mcp_capture", default=None)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+    def set(self, **attributes: Any) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    """A timed phase, recorded in the active capture and/or OpenTelemetry."""
+
+    __slots__ = ("name", "attributes", "capture", "started", "_otel", "_otel_cm")
+
+    def __init__(self, name: str, attributes: dict[str, Any], capture: Capture | None):
+        self.name = name
+        self.attributes = attributes
+        self.capture = capture
+        self._otel: Any = None
+        self._otel_cm: Any = None
+
+    def __enter__(self) -> Span:
+        if _tracer is not None:
+            self._otel_cm = _tracer.start_as_current_span(
+                self.name, attributes=self.attributes
+            )
+            self._otel = self._otel_cm.__enter__()
+        self.started = time.perf_counter()
+        return self
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+        if self._otel is not None:
+            self._otel.set_attributes(attributes)
+
+    def __exit__(self, *exc: Any) -> None:
+        ended = time.perf_counter()
+        if self.capture is not None:
+            self.capture.add_span(self, ended)
+        if self._otel_cm is not None:
+            self._otel_cm.__exit__(*exc)
+
+
+def span(name: str, **attributes: Any) -> Span | _NoopSpan:
+    """Context manager timing one phase; a no-op unless tracing or profiling."""
+    capture = _capture.get()
+    if _tracer is None and capture is None:
+        return _NOOP
+    return Span(name, attributes, capture)
+
+
+def traced_processor(
+    processor: Callable[[Any, str, Any], T], name: str
+) -> Callable[[Any, str, Any], T]:
+    """Wrap a structlog processor so its work shows up as a span."""
+
+    def wrapper(logger: Any, method: str, event_dict: Any) -> T:
+        with span(name):
+            return processor(logger, method, event_dict)
+
+    return wrapper
+
+
+class ToolTracingMiddleware(Middleware):
+    """Wraps tool calls made over the MCP transport in a ``tool`` span."""
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[mcp_types.CallToolRequestParams],
+        call_next: CallNext[mcp_types.CallToolRequestParams, ToolResult],
+    ) -> ToolResult:
+        with span("tool", tool=context.message.name, transport="mcp"):
+            return await call_next(context)
+
+
+def configure(enabled: bool) -> bool:
+    """Turn OpenTelemetry span export on or off; returns whether it is on."""
+    global _tracer
+    if not enabled:
+        _tracer = None
+        return False
+    if trace is None:
+        logger.warning("Tracing enabled but opentelemetry-api is not installed")
+        _tracer = None
+        return False
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (  # type: ignore[import-not-found]
+            OTLPSpanExporter,
+        )
+        from opentelemetry.sdk.resources import (  # type: ignore[import-not-found]
+            Resource,
+        )
+        from opentelemetry.sdk.trace import (  # type: ignore[import-not-found]
+            TracerProvider,
+        )
+        from opentelemetry.sdk.trace.export import (  # type: ignore[import-not-found]
+            BatchSpanProcessor,
+        )
+    except ImportError:
+        # Use whatever provider the host application or agent installed
+        pass
+    else:
+        if isinstance(trace.get_tracer_provider(), trace.ProxyTracerProvider):
+            provider = TracerProvider(
+                resource=Resource.create({"service.name": "nautobot-mcp-server"})
+            )
+            provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+            trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer("nautobot_mcp_server")
+    return True
+
+
+def _folded(frame: Any, limit: int = 128) -> str:
+    names: list[str] = []
+    while frame is not None and len(names) < limit:
+        code = frame.f_code
+        names.append(
+            f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+        )
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SamplingProfiler:
+    """Samples the stacks of selected threads every ``interval`` seconds.
+
+    Stacks are aggregated in the folded format used by flame graph tools
+    (``outer;inner;leaf`` -> sample count).
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._threads: set[int] = set()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add_current_thread(self) -> None:
+        self._threads.add(threading.get_ident())
+
+    def start(self) -> None:
+        self.add_current_thread()
+        self._thread = threading.Thread(
+            target=self._run, name="request-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for ident in list(self._threads):
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.stacks[_folded(frame)] += 1
+            self.samples += 1
+
+
+class Capture:
+    """Collects spans and a sampling profile for a single invocation."""
+
+    def __init__(self, label: str, interval: float | None = None):
+        settings = get_settings()
+        self.label = label
+        self.profiler = SamplingProfiler(
+            settings.profile_interval if interval is None else interval
+        )
+        self.spans: list[dict[str, Any]] = []
+        self.started = 0.0
+        self.duration = 0.0
+        self._token: Any = None
+
+    def __enter__(self) -> Capture:
+        self.started = time.perf_counter()
+        self._token = _capture.set(self)
+        self.profiler.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.profiler.stop()
+        _capture.reset(self._token)
+        self.duration = time.perf_counter() - self.started
+
+    def add_span(self, span: Span, ended: float) -> None:
+        self.spans.append(
+            {
+                "name": span.name,
+                "start_ms": round((span.started - self.started) * 1000, 3),
+                "duration_ms": round((ended - span.started) * 1000, 3),
+                **({"attributes": dict(span.attributes)} if span.attributes else {}),
+            }
+        )
+
+    def wrap(self, fn: Callable[..., T]) -> Callable[..., T]:
+        """Wrap ``fn`` so the worker thread running it is sampled too."""
+
+        def run(*args: Any, **kwargs: Any) -> T:
+            self.profiler.add_current_thread()
+            return fn(*args, **kwargs)
+
+        return run
+
+    def result(self) -> dict[str, Any]:
+        """The profile, or where it was stored when ``profile_dir`` is set."""
+        profile = {
+            "label": self.label,
+            "duration_ms": round(self.duration * 1000, 3),
+            "spans": sorted(self.spans, key=lambda s: s["start_ms"]),
+            "interval_ms": self.profiler.interval * 1000,
+            "samples": self.profiler.samples,
+            "stacks": dict(self.profiler.stacks.most_common()),
+        }
+        directory = get_settings().profile_dir
+        if directory is None:
+            return profile
+        path = Path(directory).expanduser()
+        path.mkdir(parents=True, exist_ok=True)
+        path = path / f"profile-{time.strftime('%Y%m%dT%H%M%S')}-{self.label}.json"
+        path.write_text(json.dumps(profile), encoding="utf-8")
+        return {"path": str(path), "duration_ms": profile["duration_ms"]}
+
+
+def profile_requested(headers: Mapping[str, str]) -> bool:
+    """True if the request asks for a profile with the configured token."""
+    token = get_settings().profile_token
+    value = headers.get(PROFILE_HEADER)
+    if not token or value is None:
+        return False
+    # Constant time, so response timing does not reveal the token
+    return hmac.compare_digest(value.encode(), token.encode())
+
+
+configure(get_settings().tracing_enabled)
@@ -0,0 +1,86 @@
+import pytest
+
+from nautobot_mcp_server import aliases
+from nautobot_mcp_server.aliases import NameIndex, NameResolver, UnknownNameError
+from nautobot_mcp_server.clients import nautobot_graphql
+
+LOCATIONS = ["NYDC", "LODC", "London Campus", "USBN1"]
+
+
+class NamesClient:
+    def __init__(self, names):
+        self.names = names
+        self.calls = 0
+
+    def iter_pages(self, query, variables, field, page_size=None, fresh=False):
+        self.calls += 1
+        yield [{"name": name} for name in self.names.get(field, [])]
+
+
+def test_index_resolves_case_spacing_and_aliases() -> None:
+    index = NameIndex("location", LOCATIONS, aliases.DEFAULT_LOCATION_ALIASES)
+    assert index.get("nydc") == "NYDC"
+    assert index.get("New York Data-Center") == "NYDC"
+    assert index.get(" usbn 1 ") == "USBN1"
+    # Nautobot uses the long form here, so the abbreviation maps onto it
+    assert index.get("LOCN") == "London Campus"
+    assert index.resolve(["NYDC", "new york data center", "LODC"]) == ["NYDC", "LODC"]
+
+
+def test_index_rejects_unknown_names_with_suggestions() -> None:
+    index = NameIndex("location", LOCATIONS, aliases.DEFAULT_LOCATION_ALIASES)
+    with pytest.raises(UnknownNameError) as excinfo:
+        index.resolve(["NYDC", "NYCD", "New York"])
+    assert excinfo.value.suggestions["NYCD"][0] == "NYDC"
+    assert excinfo.value.suggestions["New York"] == ["NYDC"]
+    assert "Unknown location 'NYCD'; did you mean 'NYDC'" in str(excinfo.value)
+    assert index.suggest("zzzz") == []
+
+
+def test_index_without_nautobot_names_passes_through() -> None:
+    index = NameIndex("location", None, {"New York Data Center": "NYDC"})
+    assert index.get("new york data center") == "NYDC"
+    assert index.get("HQ") == "HQ"
+
+
+def test_resolver_caches_and_reloads_on_stale_miss(monkeypatch) -> None:
+    client = NamesClient({"locations": ["NYDC"], "roles": ["WAN"]})
+    monkeypatch.setattr(nautobot_graphql, "client", client)
+    resolver = NameResolver(enabled=True, ttl=600)
+
+    assert resolver.resolve("location", ["nydc", "NYDC"]) == ["NYDC"]
+    assert resolver.resolve_name("role", "WAN Routers") == "WAN"
+    assert client.calls == 2
+
+    # A recent index is trusted; an older one is reloaded once before failing
+    client.names["locations"].append("CHDC")
+    with pytest.raises(UnknownNameError):
+        resolver.resolve("location", ["CHDC"])
+    resolver._indexes["location"].loaded_at -= 60
+    assert resolver.resolve_name("location", "chdc") == "CHDC"
+    assert client.calls == 3
+
+
+def test_resolver_disabled_or_unavailable(monkeypatch) -> None:
+    monkeypatch.setattr(nautobot_graphql, "client", object())
+    assert NameResolver(enabled=False).resolve("location", ["x", "x"]) == ["x"]
+    resolver = NameResolver(enabled=True)
+    assert resolver.resolve("location", ["HQ", "London Data Center"]) == [
+        "HQ",
+        "LODC",
+    ]
+
+
+@pytest.mark.anyio("asyncio")
+async def test_resolver_async(monkeypatch) -> None:
+    class AsyncNamesClient:
+        async def iter_pages(
+            self, query, variables, field, page_size=None, fresh=False
+        ):
+            yield [{"name": "NYDC"}]
+
+    monkeypatch.setattr(nautobot_graphql, "async_client", AsyncNamesClient())
+    resolver = NameResolver(enabled=True)
+    assert await resolver.resolve_name_async("location", "ny dc") == "NYDC"
+    with pytest.raises(UnknownNameError):
+        await resolver.resolve_async("location", ["LODX"])
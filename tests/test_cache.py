@@ -0,0 +1,193 @@
+import threading
+
+import pytest
+
+from nautobot_mcp_server.clients.cache import QueryCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_key_ignores_whitespace_and_variable_order() -> None:
+    k1 = QueryCache.make_key("query {\n  devices { name }\n}", {"a": 1, "b": 2})
+    k2 = QueryCache.make_key("query { devices { name } }", {"b": 2, "a": 1})
+    assert k1 == k2
+    assert k1 != QueryCache.make_key("query { devices { name } }", {"a": 2})
+
+
+def test_ttl_expiry_and_per_query_ttls() -> None:
+    clock = FakeClock()
+    cache = QueryCache(default_ttl=10, ttls={"devices_by_location": 100}, clock=clock)
+    assert cache.ttl_for("devices_by_location") == 100
+    assert cache.ttl_for("prefixes_by_location") == 10
+    cache.set("k", {"v": 1}, ttl=10, size=10)
+    assert cache.get("k") == {"v": 1}
+    clock.now = 11
+    assert cache.get("k") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["expirations"] == 1
+    assert stats["entries"] == 0
+
+
+def test_lru_eviction_by_entries_and_bytes() -> None:
+    cache = QueryCache(max_entries=2, max_bytes=100)
+    cache.set("a", 1, ttl=60, size=10)
+    cache.set("b", 2, ttl=60, size=10)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3, ttl=60, size=10)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    cache.set("d", 4, ttl=60, size=95)
+    assert cache.get("a") is None
+    assert cache.get("c") is None
+    assert cache.get("d") == 4
+    assert cache.stats()["evictions"] == 3
+    assert cache.stats()["bytes"] == 95
+
+
+def test_disabled_cache_stores_nothing() -> None:
+    cache = QueryCache(max_entries=0)
+    cache.set("a", 1, ttl=60, size=1)
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_shared_tier_serves_other_processes(tmp_path) -> None:
+    from nautobot_mcp_server.clients.shared_cache import SharedCache
+
+    wall = FakeClock()
+    path = tmp_path / "cache.sqlite"
+    first = QueryCache(stale_ttl=100, shared=SharedCache(path, clock=wall))
+    second = QueryCache(stale_ttl=100, shared=SharedCache(path, clock=wall))
+    first.set("devices(k", {"v": 1}, ttl=10, size=7, raw=b'{"v":1}')
+    assert second.get("devices(k") == {"v": 1}
+    assert second.stats()["shared_hits"] == 1
+    # Now held locally by the second cache as well
+    assert second.get("devices(k") == {"v": 1}
+    assert second.shared.stats()["hits"] == 1
+
+    wall.now = 11
+    third = QueryCache(stale_ttl=100, shared=SharedCache(path, clock=wall))
+    assert third.get("devices(k") is None
+    assert third.get_stale("devices(k") == {"v": 1}
+
+    first.set("prefixes(k", {"v": 2}, ttl=10, size=7)
+    assert first.invalidate(lambda key: "devices(" in key) == 1
+    assert third.get_stale("devices(k") is None
+    assert [key for key, _, _ in third.shared.entries()] == ["prefixes(k"]
+
+
+@pytest.mark.anyio("asyncio")
+async def test_async_methods_use_the_shared_tier_off_the_event_loop(
+    tmp_path,
+) -> None:
+    from nautobot_mcp_server.clients.shared_cache import SharedCache
+
+    class RecordingSharedCache(SharedCache):
+        threads: list[int] = []
+
+        def get(self, key, stale=False):
+            self.threads.append(threading.get_ident())
+            return super().get(key, stale)
+
+        def set(self, key, value, ttl, stale_ttl=0.0):
+            self.threads.append(threading.get_ident())
+            super().set(key, value, ttl, stale_ttl)
+
+    wall = FakeClock()
+    path = tmp_path / "cache.sqlite"
+    writer = QueryCache(stale_ttl=100, shared=RecordingSharedCache(path, clock=wall))
+    reader = QueryCache(stale_ttl=100, shared=RecordingSharedCache(path, clock=wall))
+    await writer.set_async("devices(k", {"v": 1}, ttl=10, size=7, raw=b'{"v":1}')
+    assert await reader.get_async("devices(k") == {"v": 1}
+    assert await reader.get_async("other") is None
+    wall.now = 11
+    late = QueryCache(stale_ttl=100, shared=RecordingSharedCache(path, clock=wall))
+    assert await late.get_stale_async("devices(k") == {"v": 1}
+    assert len(RecordingSharedCache.threads) == 4
+    assert threading.get_ident() not in RecordingSharedCache.threads
+
+
+def test_shared_tier_evicts_to_its_size_budget(tmp_path) -> None:
+    from nautobot_mcp_server.clients.shared_cache import SharedCache
+
+    wall = FakeClock()
+    shared = SharedCache(tmp_path / "cache.sqlite", clock=wall, max_bytes=25)
+    for n, ttl in enumerate((30, 10, 20)):
+        shared.set(f"k{n}", b"x" * 10, ttl=ttl)
+    # The entry closest to expiry went first
+    assert shared.get("k1") is None
+    assert shared.get("k0") is not None and shared.get("k2") is not None
+    assert shared.stats()["evictions"] == 1
+    assert shared.stats()["bytes"] == 20
+
+
+def test_restarted_cache_warms_from_disk(tmp_path) -> None:
+    from nautobot_mcp_server.clients.shared_cache import SharedCache
+
+    wall = FakeClock()
+    path = tmp_path / "results.sqlite"
+    before = QueryCache(shared=SharedCache(path, clock=wall))
+    before.set("devices(a", {"v": 1}, ttl=10, size=7, raw=b'{"v":1}')
+    before.set("devices(b", {"v": 2}, ttl=1, size=7, raw=b'{"v":2}')
+    before.shared.close()
+
+    wall.now = 5
+    after = QueryCache(shared=SharedCache(path, clock=wall))
+    assert after.warm() == 1
+    stats = after.stats()
+    assert (stats["warm_entries"], stats["warming"]) == (1, False)
+    assert after.get("devices(a") == {"v": 1}
+    assert after.stats()["shared_hits"] == 0
+    assert after.get("devices(b") is None
+
+
+def test_leases_elect_one_owner_until_they_lapse(tmp_path) -> None:
+    from nautobot_mcp_server.clients.shared_cache import SharedCache
+
+    wall = FakeClock()
+    first = SharedCache(tmp_path / "cache.sqlite", clock=wall)
+    second = SharedCache(tmp_path / "cache.sqlite", clock=wall)
+    assert first.acquire("job", "1", ttl=10)
+    assert not second.acquire("job", "2", ttl=10)
+    wall.now = 5
+    assert first.acquire("job", "1", ttl=10)  # renewed until 15
+    wall.now = 12
+    assert not second.acquire("job", "2", ttl=10)
+    wall.now = 15
+    assert second.acquire("job", "2", ttl=10)
+    first.release("job", "1")  # not the owner: no effect
+    assert not first.acquire("job", "1", ttl=10)
+    second.release("job", "2")
+    assert first.acquire("job", "1", ttl=10)
+
+
+def test_workers_opening_an_old_file_upgrade_it_once(tmp_path) -> None:
+    import sqlite3
+
+    from nautobot_mcp_server.clients.shared_cache import SharedCache
+
+    path = tmp_path / "cache.sqlite"
+    with sqlite3.connect(path) as db:
+        db.execute("CREATE TABLE results (key TEXT PRIMARY KEY, value BLOB)")
+    barrier = threading.Barrier(8)
+
+    def worker(n: int) -> None:
+        barrier.wait()
+        SharedCache(path).set(f"k{n}", b"v", ttl=60)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # No worker dropped the table after another had upgraded and written to it
+    keys = sorted(key for key, _, _ in SharedCache(path).entries())
+    assert keys == [f"k{n}" for n in range(8)]
@@ -1,6 +1,15 @@
+import asyncio
+import json
+
+import httpx
+import pytest
 import responses
 
-from nautobot_mcp_server.clients.nautobot_graphql import NautobotGraphQLClient
+from nautobot_mcp_server.clients.cache import QueryCache
+from nautobot_mcp_server.clients.nautobot_graphql import (
+    AsyncNautobotGraphQLClient,
+    NautobotGraphQLClient,
+)
 
 
 @responses.activate
@@ -47,3 +56,293 @@ def test_get_devices_by_location_graphql_error() -> None:
         assert "GraphQL errors" in str(e)
     else:
         assert False, "Expected RuntimeError"
+
+
+def test_session_reuses_pooled_connections() -> None:
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:  # noqa: N802
+            self.rfile.read(int(self.headers["Content-Length"]))
+            body = json.dumps({"data": {"prefixes": []}}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        client = NautobotGraphQLClient(
+            base_url=f"http://127.0.0.1:{httpd.server_address[1]}",
+            token=None,
+            cache=QueryCache(max_entries=0),
+        )
+        for _ in range(3):
+            assert client.get_prefixes_by_location("HQ") == []
+        stats = client.pool_stats()
+        assert stats["requests"] == 3
+        assert stats["connections_opened"] == 1
+        assert stats["connections_reused"] == 2
+        client.close()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+@pytest.mark.anyio("asyncio")
+async def test_async_client_get_devices_by_location() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        variables = json.loads(request.content)["variables"]
+        assert variables == {"name": "DC1", "limit": 1000, "offset": 0}
+        return httpx.Response(
+            200,
+            json={
+                "data": {
+                    "devices": [
+                        {
+                            "name": "r1",
+                            "status": {"name": "Active"},
+                            "role": {"name": "WAN"},
+                            "device_type": {
+                                "model": "ASR1001",
+                                "manufacturer": {"name": "Cisco"},
+                            },
+                            "platform": None,
+                            "primary_ip4": {"address": "10.0.0.1/32"},
+                            "location": {"name": "DC1"},
+                        }
+                    ]
+                }
+            },
+        )
+
+    client = AsyncNautobotGraphQLClient(
+        base_url="http://nautobot:8080",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    result = await client.get_devices_by_location("DC1")
+    assert result[0]["device_type"] == {"model": "ASR1001", "manufacturer": "Cisco"}
+    assert result[0]["platform"] is None
+
+
+@pytest.mark.anyio("asyncio")
+async def test_async_client_overlaps_concurrent_queries() -> None:
+    in_flight = 0
+    both_in_flight = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight
+        in_flight += 1
+        if in_flight == 2:
+            both_in_flight.set()
+        # Only returns once the second request is in flight at the same time.
+        await asyncio.wait_for(both_in_flight.wait(), timeout=2)
+        return httpx.Response(200, json={"data": {"prefixes": []}})
+
+    client = AsyncNautobotGraphQLClient(
+        base_url="http://nautobot:8080",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    results = await asyncio.gather(
+        client.get_prefixes_by_location("HQ"), client.get_prefixes_by_location("LAB")
+    )
+    assert results == [[], []]
+
+
+@responses.activate
+def test_query_results_are_cached_unless_fresh() -> None:
+    client = NautobotGraphQLClient(
+        base_url="http://nautobot:8080", token=None, cache=QueryCache()
+    )
+    responses.add(
+        responses.POST,
+        "http://nautobot:8080/graphql/",
+        json={"data": {"prefixes": []}},
+        status=200,
+    )
+
+    client.get_prefixes_by_location("HQ")
+    client.get_prefixes_by_location("HQ")
+    assert len(responses.calls) == 1
+    client.get_prefixes_by_location("LAB")
+    assert len(responses.calls) == 2
+    client.get_prefixes_by_location("HQ", fresh=True)
+    assert len(responses.calls) == 3
+    assert client.cache.stats()["hits"] == 1
+
+
+@pytest.mark.anyio("asyncio")
+async def test_async_client_coalesces_identical_queries() -> None:
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"data": {"prefixes": []}})
+
+    client = AsyncNautobotGraphQLClient(
+        base_url="http://nautobot:8080",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        cache=QueryCache(max_entries=0),
+    )
+    await asyncio.gather(*(client.get_prefixes_by_location("HQ") for _ in range(4)))
+    assert calls == 1
+    assert client.inflight.stats()["deduplicated"] == 3
+
+
+def _prefix_rows(count: int) -> list[dict]:
+    return [
+        {
+            "prefix": f"10.{i // 256}.{i % 256}.0/24",
+            "status": {"name": "Active"},
+            "role": None,
+            "description": "",
+            "locations": [{"name": "HQ"}],
+        }
+        for i in range(count)
+    ]
+
+
+@responses.activate
+def test_iter_pages_follows_limit_offset() -> None:
+    rows = _prefix_rows(25)
+
+    def callback(request):
+        variables = json.loads(request.body)["variables"]
+        page = rows[variables["offset"] : variables["offset"] + variables["limit"]]
+        return 200, {}, json.dumps({"data": {"prefixes": page}})
+
+    responses.add_callback(
+        responses.POST, "http://nautobot:8080/graphql/", callback=callback
+    )
+    client = NautobotGraphQLClient(
+        base_url="http://nautobot:8080", cache=QueryCache(max_entries=0)
+    )
+
+    records = client.iter_prefixes_by_location("HQ", page_size=10)
+    assert next(records)["prefix"] == "10.0.0.0/24"
+    assert len(responses.calls) == 1  # lazily fetched
+    assert len(list(records)) == 24
+    assert len(responses.calls) == 3
+
+
+@pytest.mark.anyio("asyncio")
+async def test_async_pages_fetched_concurrently_in_order() -> None:
+    rows = _prefix_rows(45)
+    offsets: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        variables = json.loads(request.content)["variables"]
+        offsets.append(variables["offset"])
+        page = rows[variables["offset"] : variables["offset"] + variables["limit"]]
+        return httpx.Response(200, json={"data": {"prefixes": page}})
+
+    client = AsyncNautobotGraphQLClient(
+        base_url="http://nautobot:8080",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        cache=QueryCache(max_entries=0),
+    )
+    client.page_size = 10
+    client.page_concurrency = 2
+
+    result = await client.get_prefixes_by_location("HQ")
+    assert [r["prefix"] for r in result] == [
+        f"10.{i // 256}.{i % 256}.0/24" for i in range(45)
+    ]
+    # First page alone, then windows of two pages
+    assert offsets == [0, 10, 20, 30, 40]
+
+
+@responses.activate
+def test_devices_by_locations_batches_aliases() -> None:
+    sent: list[dict] = []
+
+    def callback(request):
+        payload = json.loads(request.body)
+        sent.append(payload)
+        aliases = [k for k in payload["variables"] if k.startswith("l")]
+        data = {
+            alias: [
+                {
+                    "name": f"{payload['variables'][alias]}-wan1",
+                    "status": {"name": "Active"},
+                    "role": {"name": "WAN"},
+                    "device_type": None,
+                    "platform": None,
+                    "primary_ip4": None,
+                    "location": {"name": payload["variables"][alias]},
+                }
+            ]
+            for alias in aliases
+        }
+        return 200, {}, json.dumps({"data": data})
+
+    responses.add_callback(
+        responses.POST, "http://nautobot:8080/graphql/", callback=callback
+    )
+    client = NautobotGraphQLClient(
+        base_url="http://nautobot:8080", cache=QueryCache(max_entries=0)
+    )
+    client.max_aliases = 2
+
+    result = client.get_devices_by_locations(["A", "B", "C", "A"], ["WAN"])
+    assert list(result) == ["A", "B", "C"]
+    assert result["C"][0]["name"] == "C-wan1"
+    assert len(sent) == 2
+    assert sent[0]["variables"] == {"l0": "A", "l1": "B", "roles": ["WAN"]}
+    assert "l1: devices(location: [$l1], role: $roles)" in sent[0]["query"]
+    assert sent[1]["variables"] == {"l0": "C", "roles": ["WAN"]}
+
+
+@responses.activate
+def test_field_projection_sends_minimal_selection() -> None:
+    sent: list[str] = []
+
+    def callback(request):
+        sent.append(json.loads(request.body)["query"])
+        return (
+            200,
+            {},
+            json.dumps({"data": {"devices": [{"name": "r1", "platform": None}]}}),
+        )
+
+    responses.add_callback(
+        responses.POST, "http://nautobot:8080/graphql/", callback=callback
+    )
+    client = NautobotGraphQLClient(
+        base_url="http://nautobot:8080", cache=QueryCache(max_entries=0)
+    )
+
+    result = client.get_devices_by_location("DC1", fields=["platform"])
+    assert result == [{"name": "r1", "platform": None}]
+    client.get_devices_by_location("DC2", fields=["platform", "name"])
+    assert "device_type" not in sent[0] and "platform" in sent[0]
+    # Field order and the always-included name do not change the document
+    assert sent[0] == sent[1]
+
+    with pytest.raises(RuntimeError, match="Unknown devices fields"):
+        client.get_devices_by_location("DC1", fields=["serial"])
+
+
+@responses.activate
+def test_invalid_json_response_raises_runtime_error() -> None:
+    responses.add(
+        responses.POST, "http://nautobot:8080/graphql/", body=b"<html>", status=200
+    )
+    client = NautobotGraphQLClient(
+        base_url="http://nautobot:8080", cache=QueryCache(max_entries=0)
+    )
+
+    with pytest.raises(RuntimeError, match="invalid JSON"):
+        client.query("{ devices { name } }")
+    assert responses.calls[0].request.headers["Content-Type"] == "application/json"
@@ -0,0 +1,58 @@
+import pytest
+
+from nautobot_mcp_server.clients.documents import (
+    aliased_query,
+    project,
+    root_selection,
+    selection_fields,
+)
+from nautobot_mcp_server.clients.nautobot_graphql import DEVICES_QUERY, PREFIXES_QUERY
+
+
+def test_root_selection_from_template() -> None:
+    field, selection = root_selection(PREFIXES_QUERY)
+    assert field == "prefixes"
+    assert selection.startswith("{") and selection.endswith("}")
+    assert "locations {" in selection
+    assert "limit" not in selection
+
+
+def test_aliased_query() -> None:
+    doc = aliased_query(
+        "Q",
+        ["$a: String!", "$b: String!"],
+        [("a", "devices", "location: [$a]"), ("b", "devices", "location: [$b]")],
+        "{ name }",
+    )
+    assert doc == (
+        "query Q($a: String!, $b: String!) {\n"
+        "  a: devices(location: [$a]) { name }\n"
+        "  b: devices(location: [$b]) { name }\n"
+        "}"
+    )
+
+
+def test_selection_fields_keep_nested_selections() -> None:
+    _, selection = root_selection(DEVICES_QUERY)
+    fields = selection_fields(selection)
+    assert list(fields) == [
+        "name",
+        "status",
+        "role",
+        "device_type",
+        "platform",
+        "primary_ip4",
+        "location",
+    ]
+    assert "manufacturer" in fields["device_type"]
+
+
+def test_project_limits_root_selection() -> None:
+    doc = project(DEVICES_QUERY, ["platform", "name"])
+    assert doc.startswith("query DevicesByLocation(")
+    _, selection = root_selection(doc)
+    assert list(selection_fields(selection)) == ["name", "platform"]
+    assert "limit: $limit" in doc
+
+    with pytest.raises(ValueError):
+        project(DEVICES_QUERY, ["serial"])
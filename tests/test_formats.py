@@ -0,0 +1,71 @@
+import json
+import time
+
+from nautobot_mcp_server.formats import encode_result, from_columnar, to_columnar
+
+
+def _devices(count: int) -> list[dict]:
+    roles = ["WAN", "Core", "Leaf", "Spine"]
+    return [
+        {
+            "name": f"site{i % 50}-dev{i}",
+            "status": "Active" if i % 10 else "Planned",
+            "role": roles[i % len(roles)],
+            "device_type": {"model": "7050", "manufacturer": "Arista"},
+            "platform": "eos" if i % 3 else None,
+            "primary_ip4": f"10.{i // 65536}.{i // 256 % 256}.{i % 256}/32",
+            "location": f"SITE{i % 50}",
+        }
+        for i in range(count)
+    ]
+
+
+def test_columnar_round_trip() -> None:
+    rows = _devices(20)
+    table = to_columnar(rows)
+    assert table["columns"][:4] == ["name", "status", "role", "device_type.model"]
+    assert table["dictionaries"]["status"] == ["Planned", "Active"]
+    assert "name" not in table["dictionaries"]  # unique values are left inline
+    assert table["rows"][0][1] == 0
+    assert from_columnar(json.loads(json.dumps(table))) == rows
+    assert to_columnar([])["rows"] == []
+
+
+def test_columnar_list_columns_and_missing_keys() -> None:
+    rows = [
+        {"prefix": "10.0.0.0/8", "locations": ["A", "B"]},
+        {"prefix": "10.1.0.0/16", "locations": ["A"]},
+        {"prefix": "10.2.0.0/16", "locations": ["B", "A"], "role": "Site"},
+    ]
+    table = to_columnar(rows)
+    assert table["dictionaries"]["locations"] == ["A", "B"]
+    decoded = from_columnar(table)
+    assert [r["locations"] for r in decoded] == [["A", "B"], ["A"], ["B", "A"]]
+    assert decoded[0]["role"] is None
+
+
+def test_encode_result_handles_lists_mappings_and_errors() -> None:
+    rows = _devices(4)
+    res = encode_result({"success": True, "data": list(rows)}, "columnar")
+    assert from_columnar(res["data"]) == rows
+    res = encode_result({"success": True, "data": {"A": list(rows)}}, "columnar")
+    assert from_columnar(res["data"]["A"]) == rows
+    error = {"success": False, "data": []}
+    assert encode_result(error, "columnar")["data"] == []
+    assert encode_result({"success": True, "data": rows}, "json")["data"] is rows
+
+
+def test_columnar_is_smaller_and_faster_to_serialize() -> None:
+    rows = _devices(10_000)
+
+    started = time.perf_counter()
+    plain = json.dumps({"data": rows})
+    plain_time = time.perf_counter() - started
+
+    table = to_columnar(rows)
+    started = time.perf_counter()
+    compact = json.dumps({"data": table})
+    compact_time = time.perf_counter() - started
+
+    assert len(compact) < len(plain) * 0.4
+    assert compact_time < plain_time
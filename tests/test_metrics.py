@@ -0,0 +1,110 @@
+import httpx
+import pytest
+import responses
+
+from nautobot_mcp_server import metrics
+from nautobot_mcp_server.clients.cache import QueryCache
+from nautobot_mcp_server.clients.nautobot_graphql import NautobotGraphQLClient
+from nautobot_mcp_server.server import server
+
+
+def _sample(name: str, labels: dict[str, str]) -> float:
+    return metrics.registry.get_sample_value(name, labels) or 0.0
+
+
+@responses.activate
+def test_upstream_requests_are_timed_by_query_name() -> None:
+    client = NautobotGraphQLClient(
+        base_url="http://nautobot:8080", cache=QueryCache(max_entries=0)
+    )
+    url = "http://nautobot:8080/graphql/"
+    responses.add(responses.POST, url, json={"data": {"devices": []}})
+    responses.add(responses.POST, url, json={"errors": [{"message": "bad"}]})
+    labels = {"query": "devices_by_location", "client": "sync"}
+    ok = _sample("nautobot_mcp_upstream_requests_total", {**labels, "outcome": "ok"})
+    errors = _sample(
+        "nautobot_mcp_upstream_requests_total", {**labels, "outcome": "error"}
+    )
+    timed = _sample("nautobot_mcp_upstream_duration_seconds_count", labels)
+
+    client.get_devices_by_location("DC1")
+    with pytest.raises(RuntimeError):
+        client.get_devices_by_location("DC2")
+
+    assert (
+        _sample("nautobot_mcp_upstream_requests_total", {**labels, "outcome": "ok"})
+        == ok + 1
+    )
+    assert (
+        _sample("nautobot_mcp_upstream_requests_total", {**labels, "outcome": "error"})
+        == errors + 1
+    )
+    assert _sample("nautobot_mcp_upstream_duration_seconds_count", labels) == timed + 2
+    assert _sample("nautobot_mcp_upstream_in_flight", {"client": "sync"}) == 0
+
+
+def test_stats_collector_exports_gauges_and_counters() -> None:
+    collector = metrics.StatsCollector()
+    collector.register(
+        "widget", lambda: {"size": 3, "hits": 7, "state": "x"}, counters=("hits",)
+    )
+    collector.register("widget", lambda: 1 / 0, labels={"client": "async"})
+    families = {f.name: f for f in collector.collect()}
+    assert families["nautobot_mcp_widget_size"].type == "gauge"
+    assert families["nautobot_mcp_widget_hits"].type == "counter"
+    assert families["nautobot_mcp_widget_hits"].samples[0].value == 7
+    assert "nautobot_mcp_widget_state" not in families
+
+
+@pytest.mark.anyio("asyncio")
+async def test_metrics_endpoint_reports_tool_calls(monkeypatch) -> None:
+    from fastmcp import Client
+
+    from nautobot_mcp_server.clients import nautobot_graphql
+
+    class DummyAsyncClient:
+        async def get_devices_by_location(
+            self, name: str, fresh: bool = False, fields=None
+        ):
+            return [{"name": "r1", "location": name}, {"name": "r2", "location": name}]
+
+        async def get_prefixes_by_location(
+            self, name: str, fresh: bool = False, fields=None
+        ):
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(nautobot_graphql, "async_client", DummyAsyncClient())
+    labels = {"tool": "get_devices_by_location", "transport": "rest"}
+    before = _sample("nautobot_mcp_tool_result_rows_sum", labels)
+
+    app = server.streamable_http_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.post(
+            "/tools/invoke",
+            json={
+                "tool_name": "get_devices_by_location",
+                "args": {"location_name": "DC1"},
+            },
+        )
+        async with Client(server) as mcp:
+            await mcp.call_tool(
+                "get_prefixes_by_location_enhanced", {"location_name": "DC1"}
+            )
+        resp = await client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    text = resp.text
+    assert (
+        'nautobot_mcp_tool_calls_total{outcome="ok",'
+        'tool="get_devices_by_location",transport="rest"}' in text
+    )
+    assert (
+        'nautobot_mcp_tool_calls_total{outcome="error",'
+        'tool="get_prefixes_by_location_enhanced",transport="mcp"}' in text
+    )
+    assert "nautobot_mcp_cache_hits_total" in text
+    assert 'nautobot_mcp_singleflight_in_flight{client="async"}' in text
+    assert _sample("nautobot_mcp_tool_result_rows_sum", labels) == before + 2
+    assert _sample("nautobot_mcp_tool_response_bytes_count", labels) >= 1
@@ -0,0 +1,68 @@
+import json
+
+from nautobot_mcp_server.clients.normalizers import normalizer
+
+RAW_DEVICE = {
+    "name": "r1",
+    "status": {"name": "Active"},
+    "role": {"name": "edge"},
+    "device_type": {"model": "MX204", "manufacturer": {"name": "Juniper"}},
+    "platform": None,
+    "primary_ip4": {"address": "10.0.0.1/32"},
+    "location": {"name": "NYDC"},
+}
+
+
+def test_device_normalizer_handles_nulls() -> None:
+    raw = dict(RAW_DEVICE, device_type={"model": "X", "manufacturer": None})
+    assert normalizer("devices")(raw) == {
+        "name": "r1",
+        "status": "Active",
+        "role": "edge",
+        "device_type": {"model": "X", "manufacturer": None},
+        "platform": None,
+        "primary_ip4": "10.0.0.1/32",
+        "location": "NYDC",
+    }
+    assert normalizer("devices")(dict(raw, device_type=None))["device_type"] == {
+        "model": None,
+        "manufacturer": None,
+    }
+
+
+def test_normalizers_are_built_once_per_shape() -> None:
+    assert normalizer("devices", ("name", "role")) is normalizer(
+        "devices", ("name", "role")
+    )
+    projected = normalizer("devices", ("name", "role"))
+    assert projected.many([RAW_DEVICE]) == [{"name": "r1", "role": "edge"}]
+
+
+def test_prefix_normalizer_locations() -> None:
+    rows = normalizer("prefixes").many(
+        [
+            {
+                "prefix": "10.0.0.0/24",
+                "status": None,
+                "role": {"name": "p2p"},
+                "locations": [{"name": "A"}, {"name": "B"}],
+            },
+            {"prefix": "10.0.1.0/24", "status": None, "role": None},
+        ]
+    )
+    assert rows[0] == {
+        "prefix": "10.0.0.0/24",
+        "status": None,
+        "role": "p2p",
+        "description": None,
+        "locations": ["A", "B"],
+    }
+    assert rows[1]["locations"] == []
+
+
+def test_repeated_values_share_one_string() -> None:
+    raws = json.loads(json.dumps([RAW_DEVICE, RAW_DEVICE]))
+    assert raws[0]["location"]["name"] is not raws[1]["location"]["name"]
+    first, second = normalizer("devices").many(raws)
+    assert first["location"] is second["location"]
+    assert first["device_type"]["manufacturer"] is second["device_type"]["manufacturer"]
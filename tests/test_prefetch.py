@@ -0,0 +1,112 @@
+import threading
+import time
+
+import httpx
+import pytest
+
+from nautobot_mcp_server import aliases
+from nautobot_mcp_server import server as server_module
+from nautobot_mcp_server.aliases import NameResolver
+from nautobot_mcp_server.clients import nautobot_graphql
+from nautobot_mcp_server.prefetch import Prefetcher
+
+
+class PrefetchClient:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, ...]] = []
+        self.fresh: list[bool] = []
+        self.active = self.max_active = 0
+        self._lock = threading.Lock()
+
+    def iter_pages(self, query, variables, field, page_size=None, fresh=False):
+        names = {"locations": ["NYDC", "LODC"], "roles": ["WAN"]}
+        yield [{"name": name} for name in names[field]]
+
+    def _call(self, fresh: bool, *args: str) -> list:
+        with self._lock:
+            self.calls.append(args)
+            self.fresh.append(fresh)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.02)
+        with self._lock:
+            self.active -= 1
+        if args[1] == "LODC" and args[0] == "prefixes":
+            raise RuntimeError("GraphQL request failed: 503")
+        return []
+
+    def get_devices_by_location(self, location, fresh=False):
+        return self._call(fresh, "devices", location)
+
+    def get_prefixes_by_location(self, location, fresh=False):
+        return self._call(fresh, "prefixes", location)
+
+    def get_devices_by_location_and_role(self, location, role, fresh=False):
+        return self._call(fresh, "devices", location, role)
+
+
+def test_round_fetches_hot_locations_with_bounded_parallelism(monkeypatch) -> None:
+    client = PrefetchClient()
+    monkeypatch.setattr(nautobot_graphql, "client", client)
+    monkeypatch.setattr(aliases, "resolver", NameResolver(enabled=True))
+    prefetcher = Prefetcher(
+        locations=["New York Data Center", "nydc", "LODC", "Atlantis"],
+        roles=["WAN Routers"],
+        concurrency=2,
+        jitter=0.01,
+    )
+    assert prefetcher.status == "warming"
+
+    assert prefetcher.run_once() == 5
+    # Aliases resolved, duplicates and unknown names dropped
+    assert sorted(client.calls) == [
+        ("devices", "LODC"),
+        ("devices", "LODC", "WAN"),
+        ("devices", "NYDC"),
+        ("devices", "NYDC", "WAN"),
+        ("prefixes", "LODC"),
+        ("prefixes", "NYDC"),
+    ]
+    assert client.max_active == 2
+    stats = prefetcher.stats()
+    assert (stats["status"], stats["fetches"], stats["failures"]) == ("ready", 5, 1)
+
+    prefetcher.run_once(fresh=True)
+    assert client.fresh == [False] * 6 + [True] * 6
+
+
+def test_only_the_lease_holder_prefetches(tmp_path) -> None:
+    from nautobot_mcp_server.clients.shared_cache import SharedCache
+    from nautobot_mcp_server.prefetch import LEASE
+
+    shared = SharedCache(tmp_path / "cache.sqlite")
+    prefetcher = Prefetcher(locations=["NYDC"], jitter=0, shared=shared)
+    assert prefetcher.lead()
+    assert prefetcher.stats()["leader"] == 1
+    prefetcher.stop()  # hands the lease back
+
+    assert shared.acquire(LEASE, "another worker", ttl=60)
+    follower = Prefetcher(locations=["NYDC"], jitter=0, shared=shared)
+    assert follower.status == "warming"
+    assert not follower.lead()
+    # Followers serve the leader's results from the shared tier
+    assert follower.status == "ready"
+
+
+@pytest.mark.anyio("asyncio")
+async def test_healthz_reports_warming_until_first_round(monkeypatch) -> None:
+    prefetcher = Prefetcher(locations=["NYDC"], jitter=0)
+    monkeypatch.setattr(server_module, "prefetcher", prefetcher)
+    app = server_module.server.streamable_http_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/healthz")
+        assert resp.status_code == 200
+        assert resp.json()["cache"] == "warming"
+        assert (await client.get("/healthz?ready=1")).status_code == 503
+
+        prefetcher.rounds = 1
+        resp = await client.get("/healthz?ready=1")
+    assert resp.status_code == 200
+    assert resp.json()["cache"] == "ready"
+    assert resp.json()["prefetch"]["rounds"] == 1
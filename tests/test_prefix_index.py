@@ -0,0 +1,105 @@
+import ipaddress
+import random
+import time
+
+from nautobot_mcp_server.prefix_index import IndexCache, PrefixIndex
+
+PREFIXES = [
+    {"prefix": "10.0.0.0/8", "role": "Aggregate", "locations": []},
+    {"prefix": "10.42.0.0/16", "role": "Site", "locations": ["NYDC"]},
+    {"prefix": "10.42.7.0/24", "role": "Servers", "locations": ["NYDC"]},
+    {"prefix": "10.42.8.0/24", "role": "Users", "locations": ["NYDC"]},
+    {"prefix": "192.168.1.0/24", "role": None, "locations": ["LODC"]},
+    {"prefix": "2001:db8::/32", "role": "Aggregate", "locations": []},
+    {"prefix": "2001:db8:42::/48", "role": "Site", "locations": ["LODC"]},
+    {"prefix": "not-a-prefix"},
+]
+
+
+def _names(records):
+    return [r["prefix"] for r in records]
+
+
+def test_longest_prefix_match() -> None:
+    index = PrefixIndex(PREFIXES)
+    assert len(index) == 7
+    assert index.skipped == 1
+    assert _names(index.lookup("10.42.7.19")) == ["10.42.7.0/24"]
+    assert _names(index.lookup("10.42.9.1")) == ["10.42.0.0/16"]
+    assert _names(index.lookup("10.1.1.1")) == ["10.0.0.0/8"]
+    assert index.lookup("172.16.0.1") == []
+    assert _names(index.lookup("2001:db8:42::1")) == ["2001:db8:42::/48"]
+    assert _names(index.lookup("2001:db8:ffff::1")) == ["2001:db8::/32"]
+
+    results = index.lookup_many(["10.42.8.5", "bogus", "192.168.1.1"])
+    assert _names(results["10.42.8.5"]) == ["10.42.8.0/24"]
+    assert results["bogus"] is None
+    assert _names(results["192.168.1.1"]) == ["192.168.1.0/24"]
+
+
+def test_covering_and_covered() -> None:
+    index = PrefixIndex(PREFIXES)
+    assert _names(index.covering("10.42.7.0/24")) == [
+        "10.0.0.0/8",
+        "10.42.0.0/16",
+        "10.42.7.0/24",
+    ]
+    assert _names(index.covering("10.42.7.0/24", include_self=False)) == [
+        "10.0.0.0/8",
+        "10.42.0.0/16",
+    ]
+    assert _names(index.covered("10.42.0.0/16", include_self=False)) == [
+        "10.42.7.0/24",
+        "10.42.8.0/24",
+    ]
+    assert _names(index.covered("10.0.0.0/8", limit=2)) == [
+        "10.0.0.0/8",
+        "10.42.0.0/16",
+    ]
+    assert _names(index.covered("10.42.0.0/20")) == ["10.42.7.0/24", "10.42.8.0/24"]
+    assert _names(index.get("10.42.0.0/16")) == ["10.42.0.0/16"]
+    assert index.get("10.42.0.0/17") == []
+
+
+def test_matches_linear_scan_on_random_prefixes() -> None:
+    rng = random.Random(7)
+    prefixes = []
+    for _ in range(5000):
+        length = rng.randint(8, 30)
+        network = ipaddress.ip_network((rng.getrandbits(32), length), strict=False)
+        prefixes.append({"prefix": str(network)})
+    networks = [ipaddress.ip_network(p["prefix"]) for p in prefixes]
+    index = PrefixIndex(prefixes)
+
+    for _ in range(200):
+        ip = ipaddress.ip_address(rng.getrandbits(32))
+        containing = [n for n in networks if ip in n]
+        expected = (
+            {str(max(containing, key=lambda n: n.prefixlen))} if containing else set()
+        )
+        assert set(_names(index.lookup(str(ip)))) == expected
+
+
+def test_lookup_is_fast_on_large_tables() -> None:
+    rng = random.Random(1)
+    prefixes = [
+        {"prefix": str(ipaddress.ip_network((rng.getrandbits(32), 24), strict=False))}
+        for _ in range(50_000)
+    ]
+    index = PrefixIndex(prefixes)
+    addresses = [str(ipaddress.ip_address(rng.getrandbits(32))) for _ in range(2000)]
+
+    started = time.perf_counter()
+    index.lookup_many(addresses)
+    per_lookup = (time.perf_counter() - started) / len(addresses)
+    assert per_lookup < 0.001
+
+
+def test_index_cache_tracks_source() -> None:
+    cache = IndexCache(ttl=60)
+    index = PrefixIndex(PREFIXES)
+    cache.put("a", index)
+    assert cache.get("a") is index
+    assert cache.get("b") is None
+    cache.ttl = 0
+    assert cache.get("a") is None
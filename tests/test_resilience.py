@@ -0,0 +1,210 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+import responses
+
+from nautobot_mcp_server.clients.cache import QueryCache
+from nautobot_mcp_server.clients.nautobot_graphql import (
+    AsyncNautobotGraphQLClient,
+    NautobotGraphQLClient,
+)
+from nautobot_mcp_server.clients.resilience import (
+    AdaptiveLimiter,
+    AsyncAdaptiveLimiter,
+    CircuitBreaker,
+    CircuitOpenError,
+    OverloadedError,
+    RetryPolicy,
+    UpstreamUnavailableError,
+)
+from nautobot_mcp_server.server import server
+
+URL = "http://nautobot:8080/graphql/"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_opens_probes_and_closes() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.retry_after() == 30
+
+    clock.now = 31
+    assert breaker.allow()  # the probe
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now = 62
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+    assert breaker.stats()["opens"] == 2
+    assert breaker.stats()["rejected"] == 2
+
+
+def test_aimd_grows_when_saturated_and_halves_on_failure() -> None:
+    clock = FakeClock()
+    limiter = AdaptiveLimiter(4, 1, 6, latency_target=1.0, clock=clock)
+    for _ in range(4):
+        assert limiter.acquire(timeout=0)
+    assert not limiter.acquire(timeout=0)
+    limiter.release(0.1, ok=True)
+    assert limiter.limit == 4.25
+    limiter.release(0.1, ok=True)  # no longer saturated: no growth
+    assert limiter.limit == 4.25
+
+    limiter.release(0.1, ok=False)
+    limiter.release(5.0, ok=True)  # same window: only one decrease
+    assert limiter.limit == 2.125
+    clock.now = 2
+    assert limiter.acquire(timeout=0)
+    limiter.release(5.0, ok=True)
+    assert limiter.limit == 1.0625
+    assert limiter.stats()["decreases"] == 2
+    assert limiter.stats()["rejected"] == 1
+
+
+@pytest.mark.anyio("asyncio")
+async def test_async_limiter_hands_over_slots_and_times_out() -> None:
+    limiter = AsyncAdaptiveLimiter(1, 1, 1, latency_target=1.0)
+    assert await limiter.acquire(timeout=1)
+    assert not await limiter.acquire(timeout=0.01)
+    waiter = asyncio.create_task(limiter.acquire(timeout=1))
+    await asyncio.sleep(0)
+    limiter.release(None, ok=True)
+    assert await waiter
+    assert limiter.active == 1
+
+
+@responses.activate
+def test_client_serves_stale_results_then_fails_fast() -> None:
+    clock = FakeClock()
+    cache = QueryCache(default_ttl=10, stale_ttl=100, clock=clock)
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+    client = NautobotGraphQLClient(
+        base_url="http://nautobot:8080", cache=cache, breaker=breaker
+    )
+    query = "query { devices { name } }"
+    responses.add(responses.POST, URL, json={"data": {"devices": [{"name": "r1"}]}})
+    responses.add(responses.POST, URL, status=503)
+    responses.add(responses.POST, URL, status=503)
+    assert client.query(query)["data"]["devices"] == [{"name": "r1"}]
+
+    clock.now = 11
+    # Nautobot fails: the expired entry answers, and failures open the breaker
+    assert client.query(query)["data"]["devices"] == [{"name": "r1"}]
+    with pytest.raises(UpstreamUnavailableError):
+        client.query(query, fresh=True)
+    assert breaker.state == "open"
+    calls = len(responses.calls)
+
+    assert client.query(query)["data"]["devices"] == [{"name": "r1"}]
+    with pytest.raises(CircuitOpenError):
+        client.query("query { prefixes { prefix } }")
+    assert len(responses.calls) == calls
+    assert cache.stats()["stale_hits"] == 2
+
+
+@responses.activate
+def test_graphql_errors_do_not_trip_the_breaker() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    client = NautobotGraphQLClient(
+        base_url="http://nautobot:8080",
+        cache=QueryCache(max_entries=0),
+        breaker=breaker,
+    )
+    responses.add(responses.POST, URL, json={"errors": [{"message": "bad"}]})
+    responses.add(responses.POST, URL, status=400)
+    for _ in range(2):
+        with pytest.raises(RuntimeError) as excinfo:
+            client.query("query { devices { name } }")
+        assert not isinstance(excinfo.value, UpstreamUnavailableError)
+    assert breaker.state == "closed"
+
+
+@pytest.mark.anyio("asyncio")
+async def test_healthz_reports_breaker_state() -> None:
+    app = server.streamable_http_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/healthz")
+    body = resp.json()
+    assert body["status"] == "ok"
+    assert body["nautobot"]["breaker"]["state"] == "closed"
+    assert "limit" in body["nautobot"]["request_limit"]["async"]
+
+
+@responses.activate
+def test_client_retries_upstream_failures() -> None:
+    retry = RetryPolicy(retries=2, backoff_base=0.001)
+    client = NautobotGraphQLClient(
+        base_url="http://nautobot:8080",
+        cache=QueryCache(max_entries=0),
+        breaker=CircuitBreaker(failure_threshold=0),
+        retry=retry,
+    )
+    responses.add(responses.POST, URL, status=503)
+    responses.add(responses.POST, URL, body="not json")
+    responses.add(responses.POST, URL, json={"data": {"devices": []}})
+    assert client.query("query { devices { name } }")["data"]["devices"] == []
+    assert retry.stats()["retries"] == 2
+    assert len(responses.calls) == 3
+
+
+def test_retries_stop_at_the_deadline() -> None:
+    clock = FakeClock()
+    retry = RetryPolicy(
+        retries=5, attempt_timeout=10, deadline=4, backoff_base=1, clock=clock
+    )
+    deadline = retry.start()
+    assert retry.timeout(deadline) == 4
+    assert retry.next_delay(1, UpstreamUnavailableError(), deadline) is not None
+    assert retry.next_delay(1, OverloadedError(), deadline) is None
+    clock.now = 3.99
+    assert retry.next_delay(2, UpstreamUnavailableError(), deadline) is None
+    clock.now = 4
+    with pytest.raises(UpstreamUnavailableError):
+        retry.timeout(deadline)
+    assert retry.stats()["deadline_exceeded"] == 2
+
+
+@pytest.mark.anyio("asyncio")
+async def test_slow_request_is_hedged() -> None:
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            await asyncio.sleep(5)
+        return httpx.Response(200, json={"data": {"devices": [{"name": "r1"}]}})
+
+    retry = RetryPolicy(hedge=True, hedge_min_delay=0.01, min_samples=1)
+    retry.observe("other", 0.01)
+    client = AsyncNautobotGraphQLClient(
+        base_url="http://nautobot:8080",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        cache=QueryCache(max_entries=0),
+        retry=retry,
+    )
+    started = time.perf_counter()
+    data = await client.query("query { devices { name } }")
+    assert time.perf_counter() - started < 1
+    assert data["data"]["devices"] == [{"name": "r1"}]
+    assert len(calls) == 2
+    assert (retry.hedges, retry.hedge_wins) == (1, 1)
+    await asyncio.sleep(0)
+    assert client.limiter.active == 0
@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from nautobot_mcp_server import server as server_module
+from nautobot_mcp_server.scheduler import BusyError, ToolScheduler
+
+
+def _scheduler(**kwargs) -> ToolScheduler:
+    options = dict(
+        max_concurrency=1, per_tool=0, limits={}, queue_size=1, queue_timeout=1.0
+    )
+    options.update(kwargs)
+    return ToolScheduler(**options)
+
+
+@pytest.mark.anyio("asyncio")
+async def test_calls_queue_then_fail_fast_when_queue_is_full() -> None:
+    scheduler = _scheduler()
+    release = asyncio.Event()
+    order = []
+
+    async def tool(n: int):
+        order.append(n)
+        await release.wait()
+        return n
+
+    first = asyncio.create_task(scheduler.run("t", tool, {"n": 1}))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(scheduler.run("t", tool, {"n": 2}))
+    await asyncio.sleep(0)
+    assert scheduler.stats()["waiting"] == 1
+
+    with pytest.raises(BusyError) as excinfo:
+        await scheduler.run("t", tool, {"n": 3})
+    assert excinfo.value.reason == "queue full"
+
+    release.set()
+    assert await asyncio.gather(first, second) == [1, 2]
+    assert order == [1, 2]
+    stats = scheduler.stats()
+    assert (stats["admitted"], stats["rejected"], stats["active"]) == (2, 1, 0)
+    assert stats["max_waiting"] == 1 and stats["wait_seconds"] > 0
+
+
+@pytest.mark.anyio("asyncio")
+async def test_queued_call_times_out_and_frees_its_place() -> None:
+    scheduler = _scheduler(queue_timeout=0.05)
+    async with scheduler.slot("t"):
+        with pytest.raises(BusyError) as excinfo:
+            async with scheduler.slot("t"):
+                pass
+    assert excinfo.value.reason == "timeout"
+    assert scheduler.stats()["timeouts"] == 1
+    assert scheduler.stats()["waiting"] == 0
+    # Slots were all returned
+    async with scheduler.slot("t"):
+        assert scheduler.stats()["active"] == 1
+
+
+@pytest.mark.anyio("asyncio")
+async def test_timeout_racing_a_release_still_rejects_with_busy() -> None:
+    scheduler = _scheduler(queue_timeout=0.05)
+
+    async def hold() -> None:
+        await asyncio.sleep(0.01)
+
+    async def tool() -> None:
+        pass
+
+    first = asyncio.create_task(scheduler.run("t", hold, {}))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(scheduler.run("t", tool, {}))
+    await asyncio.sleep(0)
+    # Block the loop past both deadlines: the timeout cancels the queued
+    # waiter, then the holder finishes and release() drops that waiter
+    # before its task gets to run
+    time.sleep(0.1)
+    await first
+    with pytest.raises(BusyError) as excinfo:
+        await second
+    assert excinfo.value.reason == "timeout"
+    assert scheduler.stats()["active"] == 0
+
+
+@pytest.mark.anyio("asyncio")
+async def test_per_tool_limits_leave_other_tools_running() -> None:
+    scheduler = _scheduler(
+        max_concurrency=0, per_tool=2, limits={"slow": 1}, queue_size=0
+    )
+    async with scheduler.slot("slow"):
+        with pytest.raises(BusyError):
+            async with scheduler.slot("slow"):
+                pass
+        async with scheduler.slot("fast"), scheduler.slot("fast"):
+            with pytest.raises(BusyError):
+                async with scheduler.slot("fast"):
+                    pass
+
+
+@pytest.mark.anyio("asyncio")
+async def test_sync_tools_run_on_the_tool_thread_pool() -> None:
+    scheduler = _scheduler(threads=2)
+
+    def tool(x: int) -> tuple[int, str]:
+        return x * 2, threading.current_thread().name
+
+    try:
+        value, thread = await scheduler.run("t", tool, {"x": 21})
+    finally:
+        scheduler.shutdown()
+    assert value == 42
+    assert thread.startswith("tool")
+
+
+@pytest.mark.anyio("asyncio")
+async def test_invoke_returns_429_when_saturated(monkeypatch) -> None:
+    scheduler = _scheduler(queue_size=0)
+    monkeypatch.setattr(server_module, "scheduler", scheduler)
+    app = server_module.server.streamable_http_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        async with scheduler.slot("other"):
+            resp = await client.post(
+                "/tools/invoke",
+                json={
+                    "tool_name": "get_devices_by_location",
+                    "args": {"location_name": "DC1"},
+                },
+            )
+    assert resp.status_code == 429
+    assert resp.headers["retry-after"] == "1"
+    assert resp.json()["reason"] == "queue full"
@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+from nautobot_mcp_server import serialization
+
+
+@pytest.fixture(params=sorted(serialization.BACKENDS))
+def backend(request):
+    previous = serialization.backend
+    serialization.use(request.param)
+    yield request.param
+    serialization.use(previous)
+
+
+def test_round_trip_bytes(backend) -> None:
+    payload = {"data": {"devices": [{"name": "zürich-wan1", "primary_ip4": None}]}}
+    encoded = serialization.dumps(payload)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == payload
+    assert serialization.loads(encoded) == payload
+    assert "zürich".encode() in encoded  # not ASCII-escaped
+
+
+def test_response_renders_with_selected_backend(backend) -> None:
+    response = serialization.FastJSONResponse({"result": [1, "a"]})
+    assert response.body == b'{"result":[1,"a"]}'
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_unknown_backend_rejected() -> None:
+    with pytest.raises(ValueError):
+        serialization.use("simdjson")
+    assert serialization.use("auto") in serialization.BACKENDS
@@ -26,3 +26,246 @@ async def test_tools_endpoint_lists_tools() -> None:
         payload = resp.json()
         assert "tools" in payload
         assert isinstance(payload["tools"], list)
+
+
+@pytest.mark.anyio("asyncio")
+async def test_invoke_awaits_async_tool(monkeypatch) -> None:
+    from nautobot_mcp_server.clients import nautobot_graphql
+
+    class DummyAsyncClient:
+        async def get_devices_by_location(
+            self, name: str, fresh: bool = False, fields=None
+        ):
+            return [{"name": "r1", "location": name}]
+
+    monkeypatch.setattr(nautobot_graphql, "async_client", DummyAsyncClient())
+    app = server.streamable_http_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.post(
+            "/tools/invoke",
+            json={
+                "tool_name": "get_devices_by_location",
+                "args": {"location_name": "DC1"},
+            },
+        )
+        assert resp.status_code == 200
+        assert resp.json()["result"]["data"] == [{"name": "r1", "location": "DC1"}]
+
+
+@pytest.mark.anyio("asyncio")
+async def test_columnar_format_over_invoke_and_mcp(monkeypatch) -> None:
+    from fastmcp import Client
+
+    from nautobot_mcp_server.clients import nautobot_graphql
+    from nautobot_mcp_server.formats import from_columnar
+
+    rows = [{"name": f"r{i}", "role": "WAN", "location": "DC1"} for i in range(3)]
+
+    class DummyAsyncClient:
+        async def get_devices_by_location(
+            self, name: str, fresh: bool = False, fields=None
+        ):
+            return [dict(r) for r in rows]
+
+    monkeypatch.setattr(nautobot_graphql, "async_client", DummyAsyncClient())
+    app = server.streamable_http_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.post(
+            "/tools/invoke",
+            json={
+                "tool_name": "get_devices_by_location",
+                "args": {"location_name": "DC1", "format": "columnar"},
+            },
+        )
+        table = resp.json()["result"]["data"]
+        assert table["columns"] == ["name", "role", "location"]
+        assert from_columnar(table) == rows
+
+    async with Client(server) as mcp:
+        result = await mcp.call_tool(
+            "get_devices_by_location", {"location_name": "DC1", "format": "columnar"}
+        )
+        assert from_columnar(result.structured_content["data"]) == rows
+
+
+@pytest.mark.anyio("asyncio")
+async def test_batch_invoke_deduplicates_and_keeps_order(monkeypatch) -> None:
+    from nautobot_mcp_server.clients import nautobot_graphql
+
+    calls = []
+
+    class DummyAsyncClient:
+        async def get_devices_by_location(
+            self, name: str, fresh: bool = False, fields=None
+        ):
+            calls.append(name)
+            return [{"name": "r1", "location": name}]
+
+    monkeypatch.setattr(nautobot_graphql, "async_client", DummyAsyncClient())
+    device_call = {
+        "tool_name": "get_devices_by_location",
+        "args": {"location_name": "DC1"},
+    }
+    app = server.streamable_http_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.post(
+            "/tools/invoke/batch",
+            json={
+                "calls": [
+                    device_call,
+                    {"tool_name": "no_such_tool", "args": {}},
+                    device_call,
+                    {"args": {}},
+                ]
+            },
+        )
+    assert resp.status_code == 200
+    body = resp.json()
+    results = body["results"]
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert results[0]["result"]["data"] == [{"name": "r1", "location": "DC1"}]
+    assert results[2]["result"] == results[0]["result"]
+    assert (results[1]["status"], results[3]["status"]) == (404, 400)
+    assert body["deduplicated"] == 1
+    assert calls == ["DC1"]
+
+
+@pytest.mark.anyio("asyncio")
+async def test_batch_invoke_streams_ndjson(monkeypatch) -> None:
+    import json
+
+    from nautobot_mcp_server.clients import nautobot_graphql
+
+    class DummyAsyncClient:
+        async def get_devices_by_location(
+            self, name: str, fresh: bool = False, fields=None
+        ):
+            return [{"name": "r1", "location": name}]
+
+    monkeypatch.setattr(nautobot_graphql, "async_client", DummyAsyncClient())
+    app = server.streamable_http_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.post(
+            "/tools/invoke/batch",
+            headers={"Accept": "application/x-ndjson"},
+            json={
+                "calls": [
+                    {
+                        "tool_name": "get_devices_by_location",
+                        "args": {"location_name": name},
+                    }
+                    for name in ("DC1", "DC2")
+                ]
+            },
+        )
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    entries = [json.loads(line) for line in resp.text.splitlines()]
+    by_index = {e["index"]: e["result"]["data"][0]["location"] for e in entries}
+    assert by_index == {0: "DC1", 1: "DC2"}
+
+
+@pytest.mark.anyio("asyncio")
+async def test_invoke_streams_records_from_page_iterator(monkeypatch) -> None:
+    import json
+
+    from nautobot_mcp_server.clients import nautobot_graphql
+
+    class DummyAsyncClient:
+        async def iter_devices_by_location(
+            self, name: str, fresh: bool = False, fields=None
+        ):
+            for i in range(3):
+                yield {"name": f"r{i}", "location": name}
+            if name == "BROKEN":
+                raise RuntimeError("GraphQL request failed: boom")
+
+    monkeypatch.setattr(nautobot_graphql, "async_client", DummyAsyncClient())
+    app = server.streamable_http_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.post(
+            "/tools/invoke",
+            json={
+                "tool_name": "get_devices_by_location",
+                "args": {"location_name": "DC1"},
+                "stream": True,
+            },
+        )
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        assert resp.headers["content-type"] == "application/x-ndjson"
+        assert lines[0] == {"type": "header", "tool_name": "get_devices_by_location"}
+        assert [r["name"] for r in lines[1:-1]] == ["r0", "r1", "r2"]
+        assert lines[-1] == {"type": "end", "success": True, "count": 3}
+
+        resp = await client.post(
+            "/tools/invoke",
+            headers={"Accept": "application/x-ndjson"},
+            json={
+                "tool_name": "get_devices_by_location",
+                "args": {"location_name": "BROKEN"},
+            },
+        )
+        end = json.loads(resp.text.splitlines()[-1])
+        assert end["success"] is False and end["count"] == 3
+        assert "boom" in end["error"]
+
+
+@pytest.mark.anyio("asyncio")
+async def test_prefixes_tool_streams_from_page_iterator(monkeypatch) -> None:
+    import json
+
+    from nautobot_mcp_server.clients import nautobot_graphql
+
+    class DummyAsyncClient:
+        async def iter_prefixes_by_location(
+            self, name: str, fresh: bool = False, fields=None
+        ):
+            for i in range(2):
+                yield {"prefix": f"10.0.{i}.0/24", "location": name}
+
+        async def get_prefixes_by_location(self, *args, **kwargs):
+            raise AssertionError("streamed calls must not buffer the result")
+
+    monkeypatch.setattr(nautobot_graphql, "async_client", DummyAsyncClient())
+    app = server.streamable_http_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.post(
+            "/tools/invoke",
+            json={
+                "tool_name": "get_prefixes_by_location_enhanced",
+                "args": {"location_name": "DC1"},
+                "stream": True,
+            },
+        )
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert lines[0] == {
+        "type": "header",
+        "tool_name": "get_prefixes_by_location_enhanced",
+    }
+    assert [r["prefix"] for r in lines[1:-1]] == ["10.0.0.0/24", "10.0.1.0/24"]
+    assert lines[-1] == {"type": "end", "success": True, "count": 2}
+
+
+@pytest.mark.anyio("asyncio")
+async def test_worker_app_serves_stateless_mcp() -> None:
+    from fastmcp import Client
+    from fastmcp.client.transports import StreamableHttpTransport
+
+    from nautobot_mcp_server.server import create_app
+
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        transport = StreamableHttpTransport(
+            "http://test/mcp",
+            httpx_client_factory=lambda **kwargs: httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), **kwargs
+            ),
+        )
+        async with Client(transport) as mcp:
+            tools = await mcp.list_tools()
+    assert "get_devices_by_location" in {tool.name for tool in tools}
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from nautobot_mcp_server.clients.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def test_threaded_callers_share_one_call() -> None:
+    group = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = 0
+
+    def fetch() -> str:
+        nonlocal calls
+        calls += 1
+        started.set()
+        release.wait(timeout=2)
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        leader = pool.submit(group.do, "k", fetch)
+        started.wait(timeout=2)
+        followers = [pool.submit(group.do, "k", fetch) for _ in range(3)]
+        while group.stats()["deduplicated"] < 3:
+            pass
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert results == ["result"] * 4
+    assert calls == 1
+    assert group.stats() == {"calls": 4, "deduplicated": 3, "in_flight": 0}
+
+
+def test_threaded_errors_propagate_and_are_not_retained() -> None:
+    group = SingleFlight()
+
+    def fail() -> None:
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        group.do("k", fail)
+    assert group.do("k", lambda: "ok") == "ok"
+
+
+@pytest.mark.anyio("asyncio")
+async def test_async_callers_share_one_call() -> None:
+    group = AsyncSingleFlight()
+    calls = 0
+
+    async def fetch() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(group.do("k", fetch) for _ in range(5)))
+    assert results == ["result"] * 5
+    assert calls == 1
+    assert group.stats() == {"calls": 5, "deduplicated": 4, "in_flight": 0}
+    assert await group.do("other", fetch) == "result"
+    assert calls == 2
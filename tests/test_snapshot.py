@@ -0,0 +1,295 @@
+import json
+import re
+
+import pytest
+import responses
+
+from nautobot_mcp_server.snapshot import InventorySnapshot, SnapshotManager
+from nautobot_mcp_server.tools.devices import (
+    get_devices_by_location,
+    get_devices_by_location_and_role_async,
+)
+from nautobot_mcp_server.tools.prefixes import get_prefixes_by_location
+
+DEVICES = [
+    {
+        "name": "nydc-wan1",
+        "status": "Active",
+        "role": "WAN",
+        "device_type": {"model": "ASR1001", "manufacturer": "Cisco"},
+        "platform": "ios",
+        "primary_ip4": None,
+        "location": "NYDC",
+    },
+    {
+        "name": "nydc-leaf1",
+        "status": "Active",
+        "role": "Leaf",
+        "device_type": {"model": "7050", "manufacturer": "Arista"},
+        "platform": "eos",
+        "primary_ip4": None,
+        "location": "NYDC",
+    },
+    {
+        "name": "lodc-wan1",
+        "status": "Planned",
+        "role": "WAN",
+        "device_type": {"model": "ASR1001", "manufacturer": "Cisco"},
+        "platform": "ios",
+        "primary_ip4": None,
+        "location": "LODC",
+    },
+]
+PREFIXES = [
+    {"prefix": "10.1.0.0/16", "status": "Active", "role": None, "locations": ["NYDC"]},
+    {
+        "prefix": "10.2.0.0/16",
+        "status": "Active",
+        "role": None,
+        "locations": ["NYDC", "LODC"],
+    },
+]
+
+
+def _raw_device(device: dict, id: str) -> dict:
+    named = {k: {"name": device[k]} for k in ("status", "role", "platform", "location")}
+    return {
+        "id": id,
+        "name": device["name"],
+        **named,
+        "device_type": {
+            "model": device["device_type"]["model"],
+            "manufacturer": {"name": device["device_type"]["manufacturer"]},
+        },
+        "primary_ip4": None,
+    }
+
+
+def _raw_prefix(prefix: dict, id: str) -> dict:
+    return {
+        "id": id,
+        "prefix": prefix["prefix"],
+        "status": {"name": prefix["status"]},
+        "role": None,
+        "locations": [{"name": name} for name in prefix["locations"]],
+    }
+
+
+class FakeClient:
+    """Serves GraphQL pages for full loads and ``since`` deltas."""
+
+    def __init__(self) -> None:
+        self.loads = 0
+        self.devices = {f"d{i}": _raw_device(d, f"d{i}") for i, d in enumerate(DEVICES)}
+        self.prefixes = {
+            f"p{i}": _raw_prefix(p, f"p{i}") for i, p in enumerate(PREFIXES)
+        }
+        self.changed: dict[str, set[str]] = {"devices": set(), "prefixes": set()}
+        self.deleted: list[dict] = []
+        self.fail_delta = False
+
+    def iter_pages(self, query, variables, field, page_size=None, fresh=False):
+        if "since" not in variables:
+            if field == "devices":
+                self.loads += 1
+            return iter([list(getattr(self, field).values())])
+        if self.fail_delta:
+            raise RuntimeError("GraphQL request failed: boom")
+        if field == "object_changes":
+            return iter([self.deleted])
+        rows = getattr(self, field)
+        return iter([[rows[i] for i in self.changed[field] if i in rows]])
+
+
+class FailingClient:
+    def get_devices_by_location(self, name: str, fresh: bool = False, fields=None):
+        raise AssertionError("snapshot should have answered")
+
+    get_prefixes_by_location = get_devices_by_location
+
+
+def test_indexed_select() -> None:
+    snap = InventorySnapshot(DEVICES, PREFIXES)
+    assert [d["name"] for d in snap.devices.select(location="NYDC")] == [
+        "nydc-wan1",
+        "nydc-leaf1",
+    ]
+    assert [d["name"] for d in snap.devices.select(role="WAN", status="Active")] == [
+        "nydc-wan1"
+    ]
+    assert len(snap.devices.select(manufacturer="Cisco")) == 2
+    assert len(snap.devices.select(platform=["ios", "eos"], location="NYDC")) == 2
+    assert snap.devices.select(location="Nowhere") == []
+    assert len(snap.devices.select(location={"NYDC"})) == 2
+    assert len(snap.prefixes.select(location="LODC")) == 1
+
+
+def test_tools_answer_from_snapshot(monkeypatch) -> None:
+    from nautobot_mcp_server import snapshot
+    from nautobot_mcp_server.clients import nautobot_graphql
+
+    manager = SnapshotManager(client=FakeClient(), enabled=True, max_age=60)
+    manager.refresh()
+    monkeypatch.setattr(snapshot, "manager", manager)
+    monkeypatch.setattr(nautobot_graphql, "client", FailingClient())
+
+    res = get_devices_by_location("NYDC")
+    assert res["count"] == 2
+    assert res["source"] == "snapshot"
+    assert 0 <= res["snapshot_age"] < 60
+    assert get_prefixes_by_location("NYDC")["count"] == 2
+
+
+@pytest.mark.anyio("asyncio")
+async def test_async_tool_answers_from_snapshot(monkeypatch) -> None:
+    from nautobot_mcp_server import snapshot
+
+    manager = SnapshotManager(client=FakeClient(), enabled=True, max_age=60)
+    manager.refresh()
+    monkeypatch.setattr(snapshot, "manager", manager)
+
+    res = await get_devices_by_location_and_role_async("LODC", "WAN")
+    assert [d["name"] for d in res["data"]] == ["lodc-wan1"]
+
+
+def test_stale_snapshot_falls_back_to_nautobot(monkeypatch) -> None:
+    from nautobot_mcp_server import snapshot
+    from nautobot_mcp_server.clients import nautobot_graphql
+
+    class LiveClient:
+        def get_devices_by_location(self, name: str, fresh: bool = False, fields=None):
+            return [{"name": "live"}]
+
+    manager = SnapshotManager(client=FakeClient(), enabled=True, max_age=60)
+    manager.refresh()
+    assert manager.snapshot is not None
+    manager.snapshot.loaded_at -= 120
+    monkeypatch.setattr(snapshot, "manager", manager)
+    monkeypatch.setattr(nautobot_graphql, "client", LiveClient())
+
+    res = get_devices_by_location("NYDC")
+    assert res["data"] == [{"name": "live"}]
+    assert res["source"] == "nautobot"
+    assert res["snapshot_age"] >= 120
+
+
+def test_delta_sync_applies_changes_in_place(monkeypatch) -> None:
+    from nautobot_mcp_server.clients import nautobot_graphql
+    from nautobot_mcp_server.clients.cache import QueryCache
+
+    cache = QueryCache(max_entries=10)
+    cache.set(
+        QueryCache.make_key("query { devices(location: [$n]) { name } }"), [1], 60, 1
+    )
+    cache.set(QueryCache.make_key("query { locations { name } }"), [2], 60, 1)
+    monkeypatch.setattr(nautobot_graphql, "query_cache", cache)
+
+    client = FakeClient()
+    manager = SnapshotManager(client=client, enabled=True, max_age=60)
+    manager.refresh()
+    snap = manager.snapshot
+
+    # Move one device, delete another and add a new one
+    client.devices["d0"]["location"] = {"name": "LODC"}
+    client.devices["d9"] = _raw_device(
+        {**DEVICES[1], "name": "lodc-leaf1", "location": "LODC"}, "d9"
+    )
+    client.changed["devices"] = {"d0", "d9"}
+    del client.devices["d1"]
+    client.deleted = [
+        {
+            "changed_object_id": "d1",
+            "changed_object_type": {"app_label": "dcim", "model": "device"},
+        },
+        {
+            "changed_object_id": "x1",
+            "changed_object_type": {"app_label": "dcim", "model": "cable"},
+        },
+    ]
+    manager.refresh()
+
+    assert manager.snapshot is snap
+    assert client.loads == 1
+    assert snap.devices.select(location="NYDC") == []
+    assert sorted(d["name"] for d in snap.devices.select(location="LODC")) == [
+        "lodc-leaf1",
+        "lodc-wan1",
+        "nydc-wan1",
+    ]
+    stats = manager.stats.as_dict()
+    assert stats["delta_syncs"] == 1
+    assert stats["last_delta_size"] == 3
+    # Only cached device results are dropped
+    assert cache.stats()["entries"] == 1
+
+
+def test_delta_sync_falls_back_to_full_resync() -> None:
+    client = FakeClient()
+    manager = SnapshotManager(client=client, enabled=True, max_age=60)
+    manager.refresh()
+
+    client.fail_delta = True
+    manager.refresh()
+    assert client.loads == 2
+
+    client.fail_delta = False
+    manager.delta_max_objects = 1
+    client.changed["devices"] = {"d0", "d1"}
+    manager.refresh()
+    assert client.loads == 3
+
+    manager.full_resync_interval = 0
+    manager.refresh()
+    assert client.loads == 4
+
+    stats = manager.stats.as_dict()
+    assert stats["full_resync_fallbacks"] == {
+        "error": 1,
+        "delta_too_large": 1,
+        "scheduled": 1,
+    }
+    assert stats["full_syncs"] == 4
+    assert stats["delta_syncs"] == 0
+
+
+@responses.activate
+def test_workers_share_full_sync_pages_through_the_shared_tier(tmp_path) -> None:
+    from nautobot_mcp_server.clients.shared_cache import SharedCache
+
+    rows = FakeClient()
+
+    def graphql(request):
+        query = json.loads(request.body)["query"]
+        field = "prefixes" if "prefixes" in query else "devices"
+        page = list(getattr(rows, field).values())
+        return 200, {}, json.dumps({"data": {field: page}})
+
+    responses.add_callback(responses.POST, re.compile(r".*/graphql/"), graphql)
+    path = tmp_path / "cache.sqlite"
+    first = SnapshotManager(enabled=True, delta_sync=False, shared=SharedCache(path))
+    second = SnapshotManager(enabled=True, delta_sync=False, shared=SharedCache(path))
+    first.full_sync()
+    calls = len(responses.calls)
+    assert calls == 2
+    assert len(second.full_sync().devices) == len(DEVICES)
+    assert len(responses.calls) == calls
+    # The turn is handed back after each sync
+    assert first.shared.acquire("snapshot-full-sync", "other", ttl=1)
+
+
+@responses.activate
+def test_stopping_while_waiting_for_the_full_sync_turn_skips_the_sync(
+    tmp_path,
+) -> None:
+    from nautobot_mcp_server.clients.shared_cache import SharedCache
+
+    shared = SharedCache(tmp_path / "cache.sqlite")
+    assert shared.acquire("snapshot-full-sync", "other", ttl=60)
+    manager = SnapshotManager(enabled=True, delta_sync=False, shared=shared)
+    manager.stop()
+
+    assert manager.full_sync() is None
+    assert manager.snapshot is None
+    assert len(responses.calls) == 0
+    # The other worker's lease was left alone
+    assert not shared.acquire("snapshot-full-sync", "third", ttl=60)
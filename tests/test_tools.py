@@ -1,20 +1,56 @@
+import pytest
+
 from nautobot_mcp_server.tools.devices import (
     get_devices_by_location,
     get_devices_by_location_and_role,
+    get_devices_by_location_and_role_async,
+    get_devices_by_location_async,
+    get_devices_by_locations,
+)
+from nautobot_mcp_server.tools.prefixes import (
+    get_prefixes_by_location,
+    get_prefixes_by_location_async,
+    get_prefixes_by_locations,
 )
-from nautobot_mcp_server.tools.prefixes import get_prefixes_by_location
 
 
 class DummyClient:
-    def get_prefixes_by_location(self, name: str):
+    def get_prefixes_by_location(self, name: str, fresh: bool = False, fields=None):
         return [{"prefix": "10.0.0.0/24", "status": "Active", "locations": [name]}]
 
-    def get_devices_by_location(self, name: str):
+    def get_devices_by_location(self, name: str, fresh: bool = False, fields=None):
         return [{"name": "r1", "location": name}]
 
-    def get_devices_by_location_and_role(self, name: str, role: str):
+    def get_devices_by_location_and_role(
+        self, name: str, role: str, fresh: bool = False, fields=None
+    ):
         return [{"name": "r1", "location": name, "role": role}]
 
+    def get_devices_by_locations(
+        self, names, roles=None, fresh: bool = False, fields=None
+    ):
+        return {n: [{"name": "r1", "location": n}] for n in names}
+
+    def get_prefixes_by_locations(self, names, fresh: bool = False, fields=None):
+        return {n: [] for n in names}
+
+
+class DummyAsyncClient:
+    async def get_prefixes_by_location(
+        self, name: str, fresh: bool = False, fields=None
+    ):
+        return [{"prefix": "10.0.0.0/24", "status": "Active", "locations": [name]}]
+
+    async def get_devices_by_location(
+        self, name: str, fresh: bool = False, fields=None
+    ):
+        return [{"name": "r1", "location": name}]
+
+    async def get_devices_by_location_and_role(
+        self, name: str, role: str, fresh: bool = False, fields=None
+    ):
+        raise RuntimeError("boom")
+
 
 def test_prefixes_tool(monkeypatch):
     from nautobot_mcp_server.clients import nautobot_graphql
@@ -33,3 +69,105 @@ def test_devices_tools(monkeypatch):
     assert r1["count"] == 1
     r2 = get_devices_by_location_and_role("DC1", "Core")
     assert r2["count"] == 1
+
+
+@pytest.mark.anyio("asyncio")
+async def test_async_tools(monkeypatch):
+    from nautobot_mcp_server.clients import nautobot_graphql
+
+    monkeypatch.setattr(nautobot_graphql, "async_client", DummyAsyncClient())
+    res = await get_prefixes_by_location_async("HQ")
+    assert res["count"] == 1
+    r1 = await get_devices_by_location_async("DC1")
+    assert r1["data"] == [{"name": "r1", "location": "DC1"}]
+    r2 = await get_devices_by_location_and_role_async("DC1", "Core")
+    assert r2["success"] is False
+    assert "boom" in r2["error"]
+
+
+def test_batch_tools(monkeypatch):
+    from nautobot_mcp_server.clients import nautobot_graphql
+
+    monkeypatch.setattr(nautobot_graphql, "client", DummyClient())
+    r1 = get_devices_by_locations(["DC1", "DC2"], ["WAN"])
+    assert r1["count"] == 2
+    assert set(r1["data"]) == {"DC1", "DC2"}
+    r2 = get_prefixes_by_locations(["DC1"])
+    assert r2["success"] is True
+    assert r2["data"] == {"DC1": []}
+
+
+def test_tools_resolve_names_before_querying(monkeypatch):
+    from nautobot_mcp_server import aliases
+    from nautobot_mcp_server.clients import nautobot_graphql
+
+    class NamesClient(DummyClient):
+        def iter_pages(self, query, variables, field, page_size=None, fresh=False):
+            yield [
+                {"name": n} for n in {"locations": ["NYDC"], "roles": ["WAN"]}[field]
+            ]
+
+        def get_devices_by_locations(self, *args, **kwargs):
+            raise AssertionError("unknown names must not reach Nautobot")
+
+    monkeypatch.setattr(nautobot_graphql, "client", NamesClient())
+    monkeypatch.setattr(aliases, "resolver", aliases.NameResolver(enabled=True))
+
+    res = get_devices_by_location_and_role("new york data center", "WAN Routers")
+    assert res["data"] == [{"name": "r1", "location": "NYDC", "role": "WAN"}]
+
+    res = get_devices_by_locations(["NYDC", "NYCD"])
+    assert res["success"] is False
+    assert res["data"] == {}
+    assert res["suggestions"] == {"NYCD": ["NYDC"]}
+
+
+def test_ip_lookup_tools(monkeypatch):
+    from nautobot_mcp_server import prefix_index
+    from nautobot_mcp_server.clients import nautobot_graphql
+    from nautobot_mcp_server.tools.prefixes import (
+        get_prefix_hierarchy,
+        lookup_ip_addresses,
+    )
+
+    class PrefixClient:
+        calls = 0
+
+        def get_all_prefixes(self, fresh: bool = False):
+            self.calls += 1
+            return [
+                {"prefix": "10.42.0.0/16", "locations": ["NYDC"]},
+                {"prefix": "10.42.7.0/24", "locations": ["NYDC"]},
+            ]
+
+    client = PrefixClient()
+    monkeypatch.setattr(nautobot_graphql, "client", client)
+    monkeypatch.setattr(prefix_index, "index_cache", prefix_index.IndexCache(60))
+
+    res = lookup_ip_addresses(["10.42.7.19", "8.8.8.8", "nope"])
+    assert res["count"] == 1
+    assert res["data"]["10.42.7.19"][0]["prefix"] == "10.42.7.0/24"
+    assert res["data"]["8.8.8.8"] == []
+    assert res["invalid"] == ["nope"]
+
+    res = get_prefix_hierarchy("10.42.0.0/16", limit=5)
+    assert [p["prefix"] for p in res["data"]["covered"]] == ["10.42.7.0/24"]
+    assert res["data"]["covering"] == []
+    assert client.calls == 1
+
+    assert get_prefix_hierarchy("bad")["success"] is False
+
+
+def test_tools_project_snapshot_records(monkeypatch):
+    from nautobot_mcp_server import snapshot
+    from nautobot_mcp_server.snapshot import InventorySnapshot, SnapshotManager
+
+    manager = SnapshotManager(enabled=True, max_age=60)
+    manager.snapshot = InventorySnapshot(
+        [{"name": "r1", "location": "DC1", "role": "WAN", "platform": "ios"}], []
+    )
+    monkeypatch.setattr(snapshot, "manager", manager)
+
+    res = get_devices_by_location("DC1", fields=["platform"])
+    assert res["data"] == [{"name": "r1", "platform": "ios"}]
+    assert get_devices_by_location("DC1", fields=["bogus"])["success"] is False
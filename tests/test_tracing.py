@@ -0,0 +1,106 @@
+import time
+
+import httpx
+import pytest
+import responses
+
+from nautobot_mcp_server import tracing
+from nautobot_mcp_server.clients.cache import QueryCache
+from nautobot_mcp_server.clients.nautobot_graphql import NautobotGraphQLClient
+from nautobot_mcp_server.server import server
+from nautobot_mcp_server.settings import get_settings
+
+RAW_DEVICE = {
+    "name": "r1",
+    "status": {"name": "Active"},
+    "role": {"name": "WAN"},
+    "device_type": {"model": "ASR1001", "manufacturer": {"name": "Cisco"}},
+    "platform": None,
+    "primary_ip4": None,
+    "location": {"name": "DC1"},
+}
+
+
+def test_spans_are_shared_noops_when_disabled() -> None:
+    first = tracing.span("a", x=1)
+    assert first is tracing.span("b")
+    with first as span:
+        span.set(y=2)
+
+
+@responses.activate
+def test_capture_records_query_phases_and_stack_samples() -> None:
+    client = NautobotGraphQLClient(
+        base_url="http://nautobot:8080", cache=QueryCache(max_entries=0)
+    )
+    responses.add(
+        responses.POST,
+        "http://nautobot:8080/graphql/",
+        json={"data": {"devices": [RAW_DEVICE]}},
+    )
+
+    with tracing.Capture("test", interval=0.001) as capture:
+        with tracing.span("work"):
+            devices = client.get_devices_by_location("DC1")
+            deadline = time.perf_counter() + 0.05
+            while time.perf_counter() < deadline:
+                pass
+    profile = capture.result()
+
+    assert devices[0]["name"] == "r1"
+    names = [span["name"] for span in profile["spans"]]
+    for name in ("work", "nautobot.query", "nautobot.post", "json.decode"):
+        assert name in names
+    normalize = next(s for s in profile["spans"] if s["name"] == "normalize")
+    assert normalize["attributes"] == {"kind": "devices", "rows": 1}
+    assert profile["samples"] > 0
+    assert any("test_capture_records" in stack for stack in profile["stacks"])
+    # Nothing is recorded once the capture has ended
+    assert tracing.span("after") is tracing.span("after")
+
+
+@pytest.mark.anyio("asyncio")
+async def test_invoke_returns_profile_only_with_token(monkeypatch, tmp_path) -> None:
+    from nautobot_mcp_server.clients import nautobot_graphql
+
+    class DummyAsyncClient:
+        async def get_devices_by_location(
+            self, name: str, fresh: bool = False, fields=None
+        ):
+            return [{"name": "r1", "location": name}]
+
+    monkeypatch.setattr(nautobot_graphql, "async_client", DummyAsyncClient())
+    monkeypatch.setenv("PROFILE_TOKEN", "s3cret")
+    get_settings.cache_clear()  # type: ignore[attr-defined]
+    body = {"tool_name": "get_devices_by_location", "args": {"location_name": "DC1"}}
+    try:
+        app = server.streamable_http_app()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            plain = await client.post("/tools/invoke", json=body)
+            wrong = await client.post(
+                "/tools/invoke", json=body, headers={"X-Profile": "nope"}
+            )
+            profiled = await client.post(
+                "/tools/invoke", json=body, headers={"X-Profile": "s3cret"}
+            )
+            monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+            get_settings.cache_clear()  # type: ignore[attr-defined]
+            stored = await client.post(
+                "/tools/invoke", json=body, headers={"X-Profile": "s3cret"}
+            )
+    finally:
+        monkeypatch.delenv("PROFILE_TOKEN")
+        monkeypatch.delenv("PROFILE_DIR")
+        get_settings.cache_clear()  # type: ignore[attr-defined]
+
+    assert "profile" not in plain.json()
+    assert "profile" not in wrong.json()
+    result = profiled.json()
+    assert result["result"]["count"] == 1
+    names = {span["name"] for span in result["profile"]["spans"]}
+    assert {"tool", "response.encode"} <= names
+    path = stored.json()["profile"]["path"]
+    assert path.startswith(str(tmp_path))